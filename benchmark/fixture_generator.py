@@ -0,0 +1,484 @@
+import argparse
+import hashlib
+import io
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from sqlalchemy import text
+from src.connector.db_connector import db_connect
+from src.entity.cardano import load_all
+from src.parameters import DB_URL
+
+GENESIS_TIME = datetime(2020, 7, 29, 21, 44, 51)
+EPOCH_SLOTS = 432000
+MIN_UTXO = 1000000
+COPY_ROWS = 1000000
+
+# cardano-db-sync defines these as views, not tables
+VIEWS = {
+    'utxo_view': '''
+        SELECT tx_out.* FROM tx_out
+        LEFT JOIN tx_in ON tx_out.tx_id = tx_in.tx_out_id AND tx_out.index = tx_in.tx_out_index
+        LEFT JOIN tx ON tx.id = tx_out.tx_id
+        LEFT JOIN block ON tx.block_id = block.id
+        WHERE tx_in.tx_in_id IS NULL AND block.epoch_no IS NOT NULL
+    ''',
+    'utxo_byron_view': '''
+        SELECT tx_out.* FROM tx_out
+        LEFT JOIN tx_in ON tx_out.tx_id = tx_in.tx_out_id AND tx_out.index = tx_in.tx_out_index
+        WHERE tx_in.tx_in_id IS NULL
+    ''',
+}
+
+
+def random_bytea(rng, count, size):
+    # bytea literals for COPY, \x followed by the hex digits
+    data = rng.bytes(count * size).hex()
+    step = size * 2
+
+    return np.array(['\\x' + data[start:start + step] for start in range(0, count * step, step)], dtype=object)
+
+
+def spans(counts):
+    # position of every row within its group, for groups of counts rows
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def heavy_tail(rng, count, alpha):
+    # normalized Pareto weights: a few large holders, a long tail
+    weights = rng.pareto(alpha, count) + 1
+
+    return weights / weights.sum()
+
+
+class FixtureGenerator():
+    # Fills an empty Postgres database with a synthetic chain in the
+    # cardano-db-sync schema. Stake, address use and asset popularity are
+    # heavy tailed, and outputs are spent after a log-normal number of txs,
+    # so the UTXO set has a realistic age profile. Tables are bulk loaded
+    # with COPY.
+    engine = None
+    rng = None
+
+    def __init__(
+            self, url=DB_URL['dev'], epochs=5, blocks_per_epoch=2000, txs_per_block=10, pools=200,
+            stake_addresses=20000, addresses=50000, assets=5000, seed=0
+    ):
+        self.engine = db_connect(url)
+        self.rng = np.random.default_rng(seed)
+        self.epochs = epochs
+        self.blocks_per_epoch = blocks_per_epoch
+        self.txs_per_block = txs_per_block
+        self.pools = pools
+        self.stake_addresses = stake_addresses
+        self.addresses = addresses
+        self.assets = assets
+
+    def run(self):
+        self.create_schema()
+
+        tables = self.generate()
+
+        with self.engine.begin() as connection:
+            cursor = connection.connection.dbapi_connection.cursor()
+
+            for name, df in tables.items():
+                self.copy(cursor, name, df)
+
+            for name, df in tables.items():
+                if not df.empty:
+                    connection.execute(text(f"SELECT setval('{name}_id_seq', :value)"), {'value': int(df['id'].max())})
+
+        with self.engine.connect() as connection:
+            connection.execution_options(isolation_level='AUTOCOMMIT').execute(text('ANALYZE'))
+
+        return {name: len(df) for name, df in tables.items()}
+
+    def create_schema(self):
+        metadata = load_all()
+        tables = [table for name, table in metadata.tables.items() if name not in VIEWS]
+
+        with self.engine.begin() as connection:
+            for table in tables:
+                connection.execute(text(f'CREATE SEQUENCE IF NOT EXISTS {table.name}_id_seq'))
+
+            metadata.create_all(connection, tables=tables)
+
+            for name, sql in VIEWS.items():
+                connection.execute(text(f'CREATE OR REPLACE VIEW {name} AS {sql}'))
+
+    def generate(self):
+        # ordered so that foreign keys always point at loaded rows
+        tables = {}
+
+        tables['pool_hash'], tables['slot_leader'], weights = self._pools()
+        tables['block'] = self._blocks(weights)
+        tables['tx'] = self._txs(tables['block'])
+        tables['stake_address'] = self._stake_addresses(tables['tx'])
+        tables['tx_out'] = self._tx_outs(tables['tx'])
+        tables['tx_in'] = self._tx_ins(tables['tx_out'], len(tables['tx']))
+        tables['delegation'] = self._delegations(tables['stake_address'], tables['tx'], tables['block'], weights)
+        tables['epoch_stake'] = self._epoch_stake(tables['delegation'])
+        tables['reward'] = self._rewards(tables['epoch_stake'])
+        tables['withdrawal'] = self._withdrawals(tables['reward'], tables['tx'], tables['block'])
+        tables['multi_asset'] = self._multi_assets()
+        tables['ma_tx_mint'], nft = self._mints(tables['multi_asset'], len(tables['tx']))
+        tables['ma_tx_out'] = self._asset_outputs(tables['tx_out'], tables['ma_tx_mint'], nft)
+        tables['epoch'] = self._epoch_totals(tables['block'], tables['tx'])
+
+        # sums only known once the txs and outputs exist
+        out_sum = np.zeros(len(tables['tx']), np.int64)
+        np.add.at(out_sum, tables['tx_out']['tx_id'].to_numpy() - 1, tables['tx_out']['value'].to_numpy())
+        tables['tx']['out_sum'] = out_sum
+
+        return tables
+
+    def copy(self, cursor, name, df):
+        columns = ', '.join(f'"{column}"' for column in df.columns)
+
+        for start in range(0, len(df), COPY_ROWS):
+            buffer = io.StringIO()
+            df.iloc[start:start + COPY_ROWS].to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+
+            cursor.copy_expert(f'COPY {name} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+
+    def _pools(self):
+        ids = np.arange(1, self.pools + 1)
+        hashes = random_bytea(self.rng, self.pools, 28)
+
+        pool_hash = pd.DataFrame({
+            'id': ids,
+            'hash_raw': hashes,
+            'view': ['pool1' + value[2:52] for value in hashes],
+        })
+        slot_leader = pd.DataFrame({
+            'id': ids,
+            'hash': random_bytea(self.rng, self.pools, 28),
+            'pool_hash_id': ids,
+            'description': [f'Pool-{value[2:18]}' for value in hashes],
+        })
+
+        return pool_hash, slot_leader, heavy_tail(self.rng, self.pools, 1.2)
+
+    def _blocks(self, weights):
+        count = self.epochs * self.blocks_per_epoch
+        epoch_no = np.repeat(np.arange(self.epochs), self.blocks_per_epoch)
+
+        epoch_slots = np.concatenate([
+            np.sort(self.rng.choice(EPOCH_SLOTS, self.blocks_per_epoch, replace=False))
+            for _ in range(self.epochs)
+        ])
+        slot_no = epoch_no * EPOCH_SLOTS + epoch_slots
+        ids = np.arange(1, count + 1)
+
+        return pd.DataFrame({
+            'id': ids,
+            'hash': random_bytea(self.rng, count, 32),
+            'epoch_no': epoch_no,
+            'slot_no': slot_no,
+            'epoch_slot_no': epoch_slots,
+            'block_no': ids,
+            'previous_id': pd.Series(ids - 1, dtype='Int64').where(ids > 1),
+            'slot_leader_id': self.rng.choice(np.arange(1, self.pools + 1), count, p=weights),
+            'size': 0,
+            'time': pd.Timestamp(GENESIS_TIME) + pd.to_timedelta(slot_no, unit='s'),
+            'tx_count': self.rng.poisson(self.txs_per_block, count),
+            'proto_major': 6,
+            'proto_minor': 0,
+        })
+
+    def _txs(self, blocks):
+        tx_count = blocks['tx_count'].to_numpy()
+        count = int(tx_count.sum())
+
+        size = np.clip(self.rng.lognormal(np.log(400), 0.6, count), 200, 16384).astype(np.int64)
+        block_ids = np.repeat(blocks['id'].to_numpy(), tx_count)
+
+        blocks['size'] = 1000 + np.bincount(block_ids - 1, weights=size, minlength=len(blocks)).astype(np.int64)
+
+        return pd.DataFrame({
+            'id': np.arange(1, count + 1),
+            'hash': random_bytea(self.rng, count, 32),
+            'block_id': block_ids,
+            'block_index': spans(tx_count),
+            'out_sum': 0,
+            'fee': 155381 + 44 * size,
+            'deposit': 0,
+            'size': size,
+            'invalid_hereafter': np.repeat(blocks['slot_no'].to_numpy(), tx_count) + 7200,
+            'valid_contract': True,
+            'script_size': 0,
+        })
+
+    def _stake_addresses(self, txs):
+        hashes = random_bytea(self.rng, self.stake_addresses, 29)
+
+        return pd.DataFrame({
+            'id': np.arange(1, self.stake_addresses + 1),
+            'hash_raw': hashes,
+            'view': ['stake1' + value[2:55] for value in hashes],
+            'registered_tx_id': np.sort(self.rng.integers(1, len(txs) + 1, self.stake_addresses)),
+        })
+
+    def _tx_outs(self, txs):
+        # mostly a payment and a change output per tx
+        outputs = 1 + self.rng.geometric(0.55, len(txs))
+        count = int(outputs.sum())
+
+        # a few addresses (exchanges, contracts) receive most outputs
+        address = (self.rng.zipf(1.3, count) - 1) % self.addresses
+        raw = random_bytea(self.rng, self.addresses, 57)
+        stake_address_id = pd.Series(address % self.stake_addresses + 1, dtype='Int64')
+
+        return pd.DataFrame({
+            'id': np.arange(1, count + 1),
+            'tx_id': np.repeat(txs['id'].to_numpy(), outputs),
+            'index': spans(outputs),
+            'address': np.array(['addr1' + value[2:100] for value in raw], dtype=object)[address],
+            'address_raw': raw[address],
+            'address_has_script': False,
+            'payment_cred': np.array([value[:58] for value in raw], dtype=object)[address],
+            # one in five addresses is an enterprise address without stake part
+            'stake_address_id': stake_address_id.where(address % 5 != 0),
+            'value': np.maximum(self.rng.lognormal(np.log(5e6), 2.5, count), MIN_UTXO).astype(np.int64),
+        })
+
+    def _tx_ins(self, tx_outs, tx_count):
+        # outputs are spent a log-normal number of txs after they were made,
+        # those spent past the last tx stay in the UTXO set
+        tx_ids = tx_outs['tx_id'].to_numpy()
+        delay = np.ceil(self.rng.lognormal(np.log(1 + tx_count * 0.01), 2.0, len(tx_ids))).astype(np.int64)
+
+        spending = tx_ids + delay
+        spent = spending <= tx_count
+
+        tx_in = pd.DataFrame({
+            'tx_in_id': spending[spent],
+            'tx_out_id': tx_ids[spent],
+            'tx_out_index': tx_outs['index'].to_numpy()[spent],
+        }).sort_values('tx_in_id', kind='stable', ignore_index=True)
+
+        tx_in.insert(0, 'id', np.arange(1, len(tx_in) + 1))
+
+        return tx_in
+
+    def _delegations(self, stake_addresses, txs, blocks, weights):
+        # every address delegates when registered, one in ten moves later
+        addr_ids = stake_addresses['id'].to_numpy()
+        moved = addr_ids[self.rng.random(len(addr_ids)) < 0.1]
+
+        tx_ids = np.concatenate([
+            stake_addresses['registered_tx_id'].to_numpy(),
+            self.rng.integers(1, len(txs) + 1, len(moved)),
+        ])
+        block_index = txs['block_id'].to_numpy()[tx_ids - 1] - 1
+
+        delegation = pd.DataFrame({
+            'addr_id': np.concatenate([addr_ids, moved]),
+            'cert_index': 0,
+            'pool_hash_id': self.rng.choice(np.arange(1, self.pools + 1), len(tx_ids), p=weights),
+            'active_epoch_no': blocks['epoch_no'].to_numpy()[block_index] + 2,
+            'tx_id': tx_ids,
+            'slot_no': blocks['slot_no'].to_numpy()[block_index],
+        }).drop_duplicates(['addr_id', 'pool_hash_id', 'tx_id']) \
+            .sort_values('tx_id', kind='stable', ignore_index=True)
+
+        delegation.insert(0, 'id', np.arange(1, len(delegation) + 1))
+
+        return delegation
+
+    def _epoch_stake(self, delegations):
+        balance = np.maximum(self.rng.lognormal(np.log(2e9), 1.8, self.stake_addresses), MIN_UTXO).astype(np.int64)
+        delegations = delegations.sort_values(['addr_id', 'active_epoch_no', 'tx_id'])
+        frames = []
+
+        for epoch_no in range(self.epochs):
+            active = delegations[delegations['active_epoch_no'] <= epoch_no] \
+                .drop_duplicates('addr_id', keep='last')
+
+            addr_ids = active['addr_id'].to_numpy()
+            drift = self.rng.normal(1, 0.02, len(addr_ids))
+
+            frames.append(pd.DataFrame({
+                'addr_id': addr_ids,
+                'pool_id': active['pool_hash_id'].to_numpy(),
+                'amount': (balance[addr_ids - 1] * drift).astype(np.int64),
+                'epoch_no': epoch_no,
+            }))
+
+        epoch_stake = pd.concat(frames, ignore_index=True)
+        epoch_stake.insert(0, 'id', np.arange(1, len(epoch_stake) + 1))
+
+        return epoch_stake
+
+    def _rewards(self, epoch_stake):
+        # members earn about 4.5% a year, pool operators a fixed cost share
+        performance = self.rng.beta(20, 2, self.pools)
+        member = epoch_stake.assign(
+            type='member',
+            amount=(epoch_stake['amount'] * 0.00062 * performance[epoch_stake['pool_id'] - 1]).astype(np.int64),
+        )
+
+        pools = epoch_stake[['pool_id', 'epoch_no']].drop_duplicates()
+        leader = pools.assign(
+            addr_id=(pools['pool_id'] - 1) % self.stake_addresses + 1,
+            type='leader',
+            amount=340000000 + self.rng.integers(0, 50000000, len(pools)),
+        )
+
+        reward = pd.concat([member, leader], ignore_index=True)
+        reward = reward[reward['amount'] > 0]
+
+        reward = pd.DataFrame({
+            'addr_id': reward['addr_id'].to_numpy(),
+            'type': reward['type'].to_numpy(),
+            'amount': reward['amount'].to_numpy(),
+            'earned_epoch': reward['epoch_no'].to_numpy(),
+            'spendable_epoch': reward['epoch_no'].to_numpy() + 2,
+            'pool_id': reward['pool_id'].to_numpy(),
+        })
+        reward.insert(0, 'id', np.arange(1, len(reward) + 1))
+
+        return reward
+
+    def _withdrawals(self, rewards, txs, blocks):
+        # one in twenty addresses withdraws its whole reward balance per epoch
+        balance = np.zeros(self.stake_addresses, np.int64)
+        tx_epochs = blocks['epoch_no'].to_numpy()[txs['block_id'].to_numpy() - 1]
+        frames = []
+
+        for epoch_no in range(self.epochs):
+            spendable = rewards[rewards['spendable_epoch'] == epoch_no]
+            np.add.at(balance, spendable['addr_id'].to_numpy() - 1, spendable['amount'].to_numpy())
+
+            withdrawing = np.flatnonzero((self.rng.random(self.stake_addresses) < 0.05) & (balance > 0))
+            epoch_tx_ids = np.flatnonzero(tx_epochs == epoch_no) + 1
+
+            if not len(withdrawing) or not len(epoch_tx_ids):
+                continue
+
+            frames.append(pd.DataFrame({
+                'addr_id': withdrawing + 1,
+                'amount': balance[withdrawing],
+                'tx_id': self.rng.choice(epoch_tx_ids, len(withdrawing)),
+            }))
+            balance[withdrawing] = 0
+
+        if not frames:
+            return pd.DataFrame(columns=['id', 'addr_id', 'amount', 'tx_id'])
+
+        withdrawal = pd.concat(frames, ignore_index=True).sort_values('tx_id', kind='stable', ignore_index=True)
+        withdrawal.insert(0, 'id', np.arange(1, len(withdrawal) + 1))
+
+        return withdrawal
+
+    def _multi_assets(self):
+        # assets per policy are Zipf distributed: NFT collections next to
+        # single fungible tokens
+        policy_count = max(1, self.assets // 10)
+        policies = random_bytea(self.rng, policy_count, 28)
+        policy = (self.rng.zipf(1.5, self.assets) - 1) % policy_count
+
+        multi_asset = pd.DataFrame({
+            'id': np.arange(1, self.assets + 1),
+            'policy': policies[policy],
+            'name': ['\\x' + f'Token{index}'.encode().hex() for index in range(self.assets)],
+        })
+        multi_asset['fingerprint'] = [
+            'asset1' + hashlib.blake2b(f'{policy}{name}'.encode(), digest_size=20).hexdigest()
+            for policy, name in zip(multi_asset['policy'], multi_asset['name'])
+        ]
+
+        return multi_asset
+
+    def _mints(self, multi_assets, tx_count):
+        # policies of five assets or more are NFT collections of quantity 1
+        policy_sizes = multi_assets.groupby('policy')['id'].transform('count').to_numpy()
+        nft = policy_sizes >= 5
+
+        quantity = np.where(nft, 1, self.rng.lognormal(np.log(1e9), 3, len(multi_assets)).astype(np.int64) + 1)
+        mint_tx_id = self.rng.integers(1, tx_count + 1, len(multi_assets))
+
+        mint = pd.DataFrame({
+            'quantity': quantity,
+            'tx_id': mint_tx_id,
+            'ident': multi_assets['id'].to_numpy(),
+        })
+
+        # a few fungible tokens burn part of their supply later on
+        burning = np.flatnonzero(~nft & (self.rng.random(len(multi_assets)) < 0.05) & (mint_tx_id < tx_count))
+        burn = pd.DataFrame({
+            'quantity': -(quantity[burning] // 10),
+            'tx_id': self.rng.integers(mint_tx_id[burning] + 1, tx_count + 1),
+            'ident': multi_assets['id'].to_numpy()[burning],
+        })
+
+        mint = pd.concat([mint, burn], ignore_index=True).sort_values('tx_id', kind='stable', ignore_index=True)
+        mint.insert(0, 'id', np.arange(1, len(mint) + 1))
+
+        return mint, nft
+
+    def _asset_outputs(self, tx_outs, mints, nft):
+        # one output in five carries a popular asset minted before it
+        carrying = np.flatnonzero(self.rng.random(len(tx_outs)) < 0.2)
+        ident = (self.rng.zipf(1.4, len(carrying)) - 1) % self.assets + 1
+
+        minted_at = mints[mints['quantity'] > 0].set_index('ident')['tx_id'].reindex(np.arange(1, self.assets + 1))
+        valid = tx_outs['tx_id'].to_numpy()[carrying] >= minted_at.to_numpy()[ident - 1]
+
+        carrying, ident = carrying[valid], ident[valid]
+        quantity = np.where(nft[ident - 1], 1, self.rng.lognormal(np.log(1e6), 2, len(ident)).astype(np.int64) + 1)
+
+        ma_tx_out = pd.DataFrame({
+            'quantity': quantity,
+            'tx_out_id': tx_outs['id'].to_numpy()[carrying],
+            'ident': ident,
+        }).drop_duplicates(['ident', 'tx_out_id'], ignore_index=True)
+
+        ma_tx_out.insert(0, 'id', np.arange(1, len(ma_tx_out) + 1))
+
+        return ma_tx_out
+
+    def _epoch_totals(self, blocks, txs):
+        tx_epochs = blocks['epoch_no'].to_numpy()[txs['block_id'].to_numpy() - 1]
+        epochs = blocks.groupby('epoch_no').agg(
+            blk_count=('id', 'count'),
+            start_time=('time', 'min'),
+            end_time=('time', 'max'),
+        )
+        totals = txs.assign(epoch_no=tx_epochs).groupby('epoch_no').agg(
+            tx_count=('id', 'count'),
+            fees=('fee', 'sum'),
+        )
+
+        epoch = epochs.join(totals).fillna(0).reset_index().rename(columns={'epoch_no': 'no'})
+        epoch['out_sum'] = 0
+        epoch.insert(0, 'id', np.arange(1, len(epoch) + 1))
+
+        return epoch[['id', 'out_sum', 'fees', 'tx_count', 'blk_count', 'no', 'start_time', 'end_time']]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='fill an empty database with a synthetic chain')
+    parser.add_argument('--url', default=DB_URL['dev'])
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--blocks-per-epoch', type=int, default=2000)
+    parser.add_argument('--txs-per-block', type=int, default=10)
+    parser.add_argument('--pools', type=int, default=200)
+    parser.add_argument('--stake-addresses', type=int, default=20000)
+    parser.add_argument('--addresses', type=int, default=50000)
+    parser.add_argument('--assets', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generator = FixtureGenerator(
+        args.url, args.epochs, args.blocks_per_epoch, args.txs_per_block, args.pools,
+        args.stake_addresses, args.addresses, args.assets, args.seed
+    )
+
+    for name, rows in generator.run().items():
+        print(f'{name:<16} {rows:>12,}')
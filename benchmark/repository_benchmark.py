@@ -0,0 +1,147 @@
+import argparse
+import json
+import tracemalloc
+
+from time import perf_counter
+
+import numpy as np
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from src.entity.cardano import Block, EpochStake, PoolHash, StakeAddres, TxOut
+from src.parameters import DB_URL
+from src.repository.block_repository import BlockRepository
+from src.repository.epoch_stake_repository import EpochStakeRepository
+from src.repository.reward_repository import RewardRepository
+from src.repository.tx_out_repository import TxOutRepository
+from src.repository.utxo_repository import UtxoRepository
+from src.repository.withdrawal_repository import WithdrawalRepository
+
+
+def percentile(timings, q):
+    return float(np.percentile(timings, q)) * 1000
+
+
+class RepositoryBenchmark():
+    # Times repository reads against a database, e.g. one filled by
+    # fixture_generator: full scans, keyset range scans, key lookups and
+    # aggregations. Each case reports latency percentiles, rows per second
+    # and the peak of Python allocations (numpy and pandas buffers
+    # included) of one extra traced run.
+    runs = None
+
+    def __init__(self, url=DB_URL['dev'], runs=10, seed=0):
+        self.runs = runs
+        self.rng = np.random.default_rng(seed)
+
+        self.blocks = BlockRepository(url)
+        self.tx_outs = TxOutRepository(url)
+        self.utxos = UtxoRepository(url)
+        self.rewards = RewardRepository(url)
+        self.withdrawals = WithdrawalRepository(url)
+        self.epoch_stake = EpochStakeRepository(url)
+
+        with Session(self.blocks.engine) as session:
+            self.max_block_id = session.query(func.max(Block.id)).scalar() or 0
+            self.max_tx_out_id = session.query(func.max(TxOut.id)).scalar() or 0
+            self.max_addr_id = session.query(func.max(StakeAddres.id)).scalar() or 0
+            self.max_pool_id = session.query(func.max(PoolHash.id)).scalar() or 0
+            self.last_epoch = session.query(func.max(EpochStake.epoch_no)).scalar() or 0
+
+        # sampled once, so the refs case only times the lookup itself
+        self.refs = self._refs(1000)
+
+    def cases(self):
+        # name -> callable returning the number of rows read
+        return {
+            'find_all block': lambda: len(self.blocks.find_all()),
+            'find_all_chunked tx_out': lambda: sum(
+                len(df) for df in self.tx_outs.find_all_chunked(columns=['id', 'tx_id', 'value'], lovelace=True)
+            ),
+            'range block 1000': lambda: self._range(self.blocks, self.max_block_id, 1000),
+            'range tx_out 10000': lambda: self._range(self.tx_outs, self.max_tx_out_id, 10000),
+            'ids tx_out 1000': lambda: len(self.tx_outs.find_by_ids(self._ids(self.max_tx_out_id, 1000))),
+            'refs tx_out 1000': lambda: len(self.tx_outs.find_by_refs(self.refs)),
+            'unspent stake address 100': lambda: len(
+                self.utxos.find_unspent('stake_address_id', self._ids(self.max_addr_id, 100), lovelace=True)
+            ),
+            'earned 1000 addresses': lambda: len(self.rewards.find_earned(self._ids(self.max_addr_id, 1000))),
+            'pool earned 100 pools': lambda: len(self.rewards.find_pool_earned(self._ids(self.max_pool_id, 100))),
+            'withdrawn 1000 addresses': lambda: len(self.withdrawals.find_withdrawn(self._ids(self.max_addr_id, 1000))),
+            'epoch stake arrays': lambda: len(self.epoch_stake.find_epoch_arrays(self.last_epoch).amounts),
+            'aggregate tx_out per epoch': lambda: len(self.tx_outs.find_aggregate(
+                {'value': ('sum', 'value'), 'outputs': ('count', 'id'), 'p99': ('percentile', 'value', 0.99)},
+                bucket='epoch',
+                lovelace=True
+            )),
+        }
+
+    def run(self, names=None):
+        results = []
+
+        for name, case in self.cases().items():
+            if names is not None and name not in names:
+                continue
+
+            results.append({'case': name, **self.measure(case)})
+
+        return results
+
+    def measure(self, case):
+        case()
+
+        timings, rows = [], 0
+
+        for _ in range(self.runs):
+            start = perf_counter()
+            rows += case()
+            timings.append(perf_counter() - start)
+
+        tracemalloc.start()
+        case()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'rows': rows // self.runs,
+            'p50_ms': percentile(timings, 50),
+            'p95_ms': percentile(timings, 95),
+            'p99_ms': percentile(timings, 99),
+            'rows_per_s': rows / sum(timings) if sum(timings) else 0.0,
+            'peak_mib': peak / (1 << 20),
+        }
+
+    def _range(self, repository, max_id, size):
+        start = int(self.rng.integers(0, max(1, max_id - size)))
+
+        return sum(len(df) for df in repository.find_pages(id=(start, start + size)))
+
+    def _ids(self, max_id, size):
+        return self.rng.integers(1, max_id + 1, size).tolist()
+
+    def _refs(self, size):
+        outputs = self.tx_outs.find_by_ids(self._ids(self.max_tx_out_id, size), columns=['tx_id', 'index'])
+
+        return list(zip(outputs['tx_id'].tolist(), outputs['index'].tolist()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmark repository reads')
+    parser.add_argument('--url', default=DB_URL['dev'])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--case', action='append', dest='cases')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    results = RepositoryBenchmark(args.url, args.runs).run(args.cases)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f'{"case":<28} {"rows":>10} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"rows/s":>12} {"peak MiB":>9}')
+
+        for result in results:
+            print(
+                f'{result["case"]:<28} {result["rows"]:>10,} {result["p50_ms"]:>9.1f} {result["p95_ms"]:>9.1f} '
+                f'{result["p99_ms"]:>9.1f} {result["rows_per_s"]:>12,.0f} {result["peak_mib"]:>9.1f}'
+            )
@@ -0,0 +1,39 @@
+import statistics
+import subprocess
+import sys
+
+RUNS = 7
+
+# each case runs in a fresh interpreter: import a repository, configure the
+# mappers and compile a query, as a short lived script would on startup
+SETUP = '''
+import time
+start = time.perf_counter()
+{load}
+from sqlalchemy.orm import configure_mappers
+from src.repository.tx_out_repository import TxOutRepository
+repository = TxOutRepository()
+configure_mappers()
+str(repository._page_statement(None, 10, ['id', 'value'], {{}}))
+print(time.perf_counter() - start)
+'''
+
+CASES = {
+    'all tables': 'from src.entity.cardano import load_all; load_all()',
+    'tx_out only': '',
+}
+
+
+def run(load):
+    output = subprocess.run(
+        [sys.executable, '-c', SETUP.format(load=load)],
+        capture_output=True, text=True, check=True
+    ).stdout
+
+    return float(output)
+
+
+for name, load in CASES.items():
+    timings = [run(load) for _ in range(RUNS)]
+
+    print(f'{name:<12} median {statistics.median(timings) * 1000:7.1f} ms  min {min(timings) * 1000:7.1f} ms')
@@ -1,7 +1,7 @@
+from src.parameters import CACHE_PATH
 from src.repository.tx_out_repository import TxOutRepository
 
-repo = TxOutRepository()
+repo = TxOutRepository(cache_path=CACHE_PATH)
 
-df = repo.find_all()
-
-print(df)
+for df in repo.find_all_chunked():
+    print(df)
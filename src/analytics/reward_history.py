@@ -0,0 +1,123 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+AddressHistory = namedtuple('AddressHistory', ['rewards', 'withdrawals', 'balances', 'pools'])
+
+
+def dense(keys, epochs, rows, columns, values, fill=0, dtype=np.int64):
+    # scatter (row key, epoch, value) triples into a keys x epochs matrix
+    matrix = np.full((len(keys), len(epochs)), fill, dtype=dtype)
+
+    if len(values):
+        np.add.at(matrix, (np.searchsorted(keys, rows), columns - epochs[0]), values)
+
+    return matrix
+
+
+class RewardHistory():
+    # Epoch indexed reward, withdrawal, balance and delegation series for many
+    # stake addresses or pools at once. Each input is one aggregated query
+    # per chunk of keys, the series are dense keys x epochs int64 matrices
+    # wrapped in DataFrames indexed by key with one column per epoch.
+    rewards = None
+    withdrawals = None
+    delegations = None
+
+    def __init__(self, rewards, withdrawals, delegations):
+        self.rewards = rewards
+        self.withdrawals = withdrawals
+        self.delegations = delegations
+
+    def addresses(self, addr_ids, epochs):
+        addr_ids = np.unique(np.asarray(addr_ids, dtype=np.int64))
+        epochs = np.arange(epochs[0], epochs[-1] + 1)
+        keys = addr_ids.tolist()
+
+        earned_all = self.rewards.find_earned(keys)
+        withdrawn_all = self.withdrawals.find_withdrawn(keys)
+
+        earned = self._in_epochs(earned_all, 'spendable_epoch', epochs)
+        withdrawn = self._in_epochs(withdrawn_all, 'epoch_no', epochs)
+
+        rewards = dense(
+            addr_ids, epochs,
+            earned['addr_id'].to_numpy(np.int64),
+            earned['spendable_epoch'].to_numpy(np.int64),
+            earned['amount'].to_numpy(np.int64)
+        )
+        withdrawals = dense(
+            addr_ids, epochs,
+            withdrawn['addr_id'].to_numpy(np.int64),
+            withdrawn['epoch_no'].to_numpy(np.int64),
+            withdrawn['amount'].to_numpy(np.int64)
+        )
+
+        # the reward account balance at the end of each epoch, starting from
+        # what was spendable and not withdrawn before the first epoch
+        opening = self._opening_balance(addr_ids, earned_all, withdrawn_all, epochs[0])
+        balances = opening[:, None] + np.cumsum(rewards - withdrawals, axis=1)
+
+        return AddressHistory(
+            self._frame(rewards, addr_ids, epochs, 'addr_id'),
+            self._frame(withdrawals, addr_ids, epochs, 'addr_id'),
+            self._frame(balances, addr_ids, epochs, 'addr_id'),
+            self._frame(self._delegated_pools(addr_ids, epochs), addr_ids, epochs, 'addr_id'),
+        )
+
+    def pools(self, pool_ids, epochs):
+        # rewards and rewarded addresses per pool and earned epoch
+        pool_ids = np.unique(np.asarray(pool_ids, dtype=np.int64))
+        epochs = np.arange(epochs[0], epochs[-1] + 1)
+
+        earned = self._in_epochs(self.rewards.find_pool_earned(pool_ids.tolist()), 'earned_epoch', epochs)
+
+        rows = earned['pool_id'].to_numpy(np.int64)
+        columns = earned['earned_epoch'].to_numpy(np.int64)
+
+        return (
+            self._frame(dense(pool_ids, epochs, rows, columns, earned['amount'].to_numpy(np.int64)), pool_ids, epochs, 'pool_id'),
+            self._frame(dense(pool_ids, epochs, rows, columns, earned['addresses'].to_numpy(np.int64)), pool_ids, epochs, 'pool_id'),
+        )
+
+    def _opening_balance(self, addr_ids, earned, withdrawn, first_epoch):
+        earned = earned[earned['spendable_epoch'] < first_epoch]
+        withdrawn = withdrawn[withdrawn['epoch_no'] < first_epoch]
+
+        balance = np.zeros(len(addr_ids), np.int64)
+        np.add.at(balance, np.searchsorted(addr_ids, earned['addr_id'].to_numpy(np.int64)), earned['amount'].to_numpy(np.int64))
+        np.subtract.at(balance, np.searchsorted(addr_ids, withdrawn['addr_id'].to_numpy(np.int64)), withdrawn['amount'].to_numpy(np.int64))
+
+        return balance
+
+    def _delegated_pools(self, addr_ids, epochs):
+        # pool each address delegates to per epoch, -1 when none yet: the
+        # latest certificate per active epoch, carried forward
+        delegations = self.delegations.find_delegations(addr_ids.tolist()) \
+            .sort_values(['addr_id', 'active_epoch_no', 'tx_id', 'cert_index'])
+        delegations = delegations[delegations['active_epoch_no'] <= epochs[-1]]
+
+        # certificates active before the first epoch count for it, only the
+        # last one per address and epoch is kept: fancy index assignment
+        # does not define which of repeated positions wins
+        delegations = delegations \
+            .assign(column=np.clip(delegations['active_epoch_no'].to_numpy(np.int64) - epochs[0], 0, len(epochs) - 1)) \
+            .drop_duplicates(['addr_id', 'column'], keep='last')
+
+        rows = np.searchsorted(addr_ids, delegations['addr_id'].to_numpy(np.int64))
+
+        pools = np.full((len(addr_ids), len(epochs)), -1, dtype=np.int64)
+        pools[rows, delegations['column'].to_numpy(np.int64)] = delegations['pool_hash_id'].to_numpy(np.int64)
+
+        # forward fill along epochs
+        index = np.where(pools >= 0, np.arange(len(epochs)), 0)
+        np.maximum.accumulate(index, axis=1, out=index)
+
+        return np.take_along_axis(pools, index, axis=1)
+
+    def _in_epochs(self, df, column, epochs):
+        return df[(df[column] >= epochs[0]) & (df[column] <= epochs[-1])]
+
+    def _frame(self, matrix, keys, epochs, name):
+        return pd.DataFrame(matrix, index=pd.Index(keys, name=name), columns=pd.Index(epochs, name='epoch_no'))
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+from src.parameters import OPTIMAL_POOL_COUNT
+
+
+def group_sum(keys, values):
+    # exact int64 sums per key: sort once, then reduce contiguous runs
+    if len(keys) == 0:
+        return np.empty(0, keys.dtype), np.empty(0, np.int64), np.empty(0, np.int64)
+
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+
+    return keys[starts], np.add.reduceat(values[order], starts), counts
+
+
+def gini(values):
+    if len(values) == 0 or values.sum() == 0:
+        return 0.0
+
+    values = np.sort(values).astype(np.float64)
+    ranks = np.arange(1, len(values) + 1)
+
+    return float((2 * (ranks * values).sum()) / (len(values) * values.sum()) - (len(values) + 1) / len(values))
+
+
+def nakamoto(values, threshold=0.5):
+    # smallest number of pools jointly holding more than the threshold
+    cumulative = np.cumsum(np.sort(values)[::-1])
+
+    # no stake at all is held by no pools
+    if len(values) == 0 or cumulative[-1] == 0:
+        return 0
+
+    return int(np.searchsorted(cumulative, cumulative[-1] * threshold, side='right') + 1)
+
+
+class StakeAnalytics():
+    repository = None
+    optimal_pool_count = None
+
+    def __init__(self, repository, optimal_pool_count=OPTIMAL_POOL_COUNT):
+        self.repository = repository
+        self.optimal_pool_count = optimal_pool_count
+
+    def pools(self, stake, supply=None):
+        # per pool stake, delegators and saturation, saturated at
+        # supply / k where supply defaults to the epoch's total active stake
+        pool_ids, totals, delegators = group_sum(stake.pool_ids, stake.amounts)
+        supply = int(stake.amounts.sum()) if supply is None else supply
+
+        return pd.DataFrame({
+            'pool_id': pool_ids,
+            'stake': totals,
+            'delegators': delegators,
+            'saturation': totals / (supply / self.optimal_pool_count) if supply else 0.0,
+        })
+
+    def summary(self, stake):
+        _, totals, _ = group_sum(stake.pool_ids, stake.amounts)
+
+        return {
+            'stake': int(stake.amounts.sum()),
+            'pools': len(totals),
+            'delegators': len(stake.addr_ids),
+            'gini': gini(totals),
+            'nakamoto': nakamoto(totals),
+        }
+
+    def migration(self, previous, current):
+        # delegators that moved pool between two epochs, aggregated per
+        # (from_pool_id, to_pool_id) with the stake they moved
+        _, previous_index, current_index = np.intersect1d(
+            previous.addr_ids, current.addr_ids, return_indices=True
+        )
+
+        from_pools = previous.pool_ids[previous_index]
+        to_pools = current.pool_ids[current_index]
+        moved = from_pools != to_pools
+
+        pairs = (from_pools[moved].astype(np.int64) << 32) | to_pools[moved].astype(np.int64)
+        pairs, amounts, delegators = group_sum(pairs, current.amounts[current_index][moved])
+
+        return pd.DataFrame({
+            'from_pool_id': (pairs >> 32).astype(np.int32),
+            'to_pool_id': (pairs & 0xFFFFFFFF).astype(np.int32),
+            'delegators': delegators,
+            'amount': amounts,
+        })
+
+    def epochs(self, epoch_nos):
+        # metrics over many epochs holding at most two epochs in memory
+        rows = []
+        previous = None
+
+        for epoch_no in epoch_nos:
+            stake = self.repository.find_epoch_arrays(epoch_no)
+            row = {'epoch_no': epoch_no, **self.summary(stake)}
+
+            if previous is not None:
+                moved = self.migration(previous, stake)
+                row['migrated_delegators'] = int(moved['delegators'].sum())
+                row['migrated_stake'] = int(moved['amount'].sum())
+
+            rows.append(row)
+            previous = stake
+
+        return pd.DataFrame(rows)
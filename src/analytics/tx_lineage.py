@@ -0,0 +1,106 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# outputs: visited tx_out rows with the hop they were reached at
+# spent_by: edges tx_out id -> id of the tx spending it
+# created_by: edges tx id -> id of the tx_out it created
+Lineage = namedtuple('Lineage', ['outputs', 'spent_by', 'created_by'])
+
+OUTPUT_COLUMNS = ['id', 'tx_id', 'index', 'address', 'value']
+
+
+class TxLineage():
+    # Breadth first traversal of the transaction graph, one batched query
+    # per hop and direction instead of one ORM query per edge. Visited
+    # outputs are kept as a sorted int64 id array.
+    tx_outs = None
+    tx_ins = None
+
+    def __init__(self, tx_outs, tx_ins):
+        self.tx_outs = tx_outs
+        self.tx_ins = tx_ins
+
+    def forward(self, tx_out_ids, max_depth=3, min_value=0, max_outputs=None):
+        # follows funds from outputs to the txs spending them and their outputs
+        return self._walk(tx_out_ids, max_depth, min_value, max_outputs, self._spend)
+
+    def backward(self, tx_out_ids, max_depth=3, min_value=0, max_outputs=None):
+        # follows funds from outputs to the outputs their tx spent
+        return self._walk(tx_out_ids, max_depth, min_value, max_outputs, self._fund)
+
+    def _walk(self, tx_out_ids, max_depth, min_value, max_outputs, hop):
+        frontier = self.tx_outs.find_by_ids(np.asarray(tx_out_ids).tolist(), columns=OUTPUT_COLUMNS, lovelace=True)
+        frontier = frontier.assign(depth=0)
+
+        visited = np.sort(frontier['id'].to_numpy(np.int64))
+        outputs, spent_by, created_by = [frontier], [], []
+
+        for depth in range(1, max_depth + 1):
+            frontier = frontier[frontier['value'] >= min_value]
+
+            if frontier.empty:
+                break
+
+            reached, spends, creates = hop(frontier)
+            spent_by.append(spends)
+            created_by.append(creates)
+
+            reached = reached[~np.isin(reached['id'].to_numpy(np.int64), visited, assume_unique=True)]
+
+            if max_outputs is not None:
+                reached = reached.iloc[:max(0, max_outputs - len(visited))]
+
+            if reached.empty:
+                break
+
+            visited = np.union1d(visited, reached['id'].to_numpy(np.int64))
+            frontier = reached.assign(depth=depth)
+            outputs.append(frontier)
+
+        return Lineage(
+            pd.concat(outputs, ignore_index=True),
+            self._edges(spent_by, 'tx_out_id', 'tx_id'),
+            self._edges(created_by, 'tx_id', 'tx_out_id'),
+        )
+
+    def _spend(self, frontier):
+        refs = list(zip(frontier['tx_id'].tolist(), frontier['index'].tolist()))
+
+        # the tx_in (tx_out_id, tx_out_index) unique constraint serves this
+        tx_ins = self.tx_ins.find_by_keys(('tx_out_id', 'tx_out_index'), refs, columns=['tx_in_id', 'tx_out_id', 'tx_out_index'])
+        spent = frontier.merge(tx_ins, left_on=['tx_id', 'index'], right_on=['tx_out_id', 'tx_out_index'])
+
+        reached = self.tx_outs.find_by_values('tx_id', spent['tx_in_id'].tolist(), columns=OUTPUT_COLUMNS, lovelace=True)
+
+        spends = (spent['id'].to_numpy(np.int64), spent['tx_in_id'].to_numpy(np.int64))
+        creates = (reached['tx_id'].to_numpy(np.int64), reached['id'].to_numpy(np.int64))
+
+        return reached, spends, creates
+
+    def _fund(self, frontier):
+        tx_ids = frontier['tx_id'].unique().tolist()
+
+        tx_ins = self.tx_ins.find_by_values('tx_in_id', tx_ids, columns=['tx_in_id', 'tx_out_id', 'tx_out_index'])
+        refs = list(zip(tx_ins['tx_out_id'].tolist(), tx_ins['tx_out_index'].tolist()))
+
+        reached = self.tx_outs.find_by_refs(refs, columns=OUTPUT_COLUMNS, lovelace=True)
+        spent = reached.merge(tx_ins, left_on=['tx_id', 'index'], right_on=['tx_out_id', 'tx_out_index'])
+
+        spends = (spent['id'].to_numpy(np.int64), spent['tx_in_id'].to_numpy(np.int64))
+        creates = (frontier['tx_id'].to_numpy(np.int64), frontier['id'].to_numpy(np.int64))
+
+        return reached, spends, creates
+
+    def _edges(self, edges, source, target):
+        if not edges:
+            return {source: np.empty(0, np.int64), target: np.empty(0, np.int64)}
+
+        sources = np.concatenate([edge[0] for edge in edges])
+        targets = np.concatenate([edge[1] for edge in edges])
+
+        # the same edge can be found from both of its ends
+        pairs = np.unique(np.stack([sources, targets], axis=1), axis=0)
+
+        return {source: pairs[:, 0], target: pairs[:, 1]}
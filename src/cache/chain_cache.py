@@ -0,0 +1,197 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from sqlalchemy import LargeBinary
+from src.connector.chain_tip import stable_max_id
+from src.connector.lovelace import lovelace_decimal
+from src.entity.dtypes import numeric_columns, table_dtypes
+from src.exporter.parquet_exporter import arrow_type
+from src.parameters import PAGE_SIZE, ROLLBACK_WINDOW
+
+NULLABLE_TYPES = {
+    pa.int16(): pd.Int16Dtype(),
+    pa.int64(): pd.Int64Dtype(),
+    pa.bool_(): pd.BooleanDtype(),
+}
+
+
+def cache_arrow_type(column):
+    # amounts are decimal128(38, 0) as in exports, word64 token quantities
+    # do not fit int64
+    if isinstance(column.type, LargeBinary):
+        return pa.binary()
+
+    return arrow_type(column)
+
+
+def cache_array(values, arrow_type):
+    if not pa.types.is_decimal(arrow_type):
+        return pa.array(values, type=arrow_type, from_pandas=True)
+
+    # lovelace int64 columns cast in one go, objects hold ints beyond int64
+    if values.dtype != object:
+        return pa.array(values, type=pa.int64(), from_pandas=True).cast(arrow_type)
+
+    return pa.array([None if pd.isna(value) else value for value in values], type=arrow_type)
+
+
+class ChainCache():
+    # Rows of blocks deeper than the rollback window (k blocks) are immutable,
+    # those are kept on disk as Arrow IPC segments named <first id>-<last id>
+    # and memory mapped on read. Anything newer is always read from the db.
+    repository = None
+    path = None
+    rollback_window = None
+
+    def __init__(self, repository, path, rollback_window=ROLLBACK_WINDOW):
+        self.repository = repository
+        self.path = os.path.join(path, repository.entity.__tablename__)
+        self.rollback_window = rollback_window
+
+        os.makedirs(self.path, exist_ok=True)
+
+    def find_all(self, columns=None, lovelace=False):
+        frames = list(self.find_all_chunked(PAGE_SIZE, columns, lovelace))
+
+        if not frames:
+            return self._frame(self.schema(columns).empty_table(), columns, lovelace)
+
+        return pd.concat(frames, ignore_index=True)
+
+    def find_all_chunked(self, chunk_size=PAGE_SIZE, columns=None, lovelace=False):
+        high_water = self.refresh()
+        table_columns = self._columns(columns)
+
+        for start, end in self.segments():
+            table = self.table(start, end, table_columns)
+
+            for batch in table.to_batches(max_chunksize=chunk_size):
+                yield self._frame(pa.Table.from_batches([batch]), table_columns, lovelace)
+
+        # the tail inside the rollback window can still change, never cached
+        pages = self.repository.find_pages(
+            last_id=high_water,
+            limit=chunk_size,
+            columns=table_columns,
+            lovelace=lovelace
+        )
+
+        for df in pages:
+            yield df[table_columns]
+
+    def refresh(self):
+        stable_id = self.stable_id()
+        segments = self.segments()
+
+        # a rollback deeper than expected or a resync: drop what moved
+        while segments and segments[-1][1] > stable_id:
+            self._remove(*segments.pop())
+
+        high_water = segments[-1][1] if segments else 0
+
+        if stable_id > high_water:
+            self._fetch(high_water, stable_id)
+            high_water = stable_id
+
+        return high_water
+
+    def stable_id(self):
+        return stable_max_id(
+            self.repository.engine,
+            self.repository.entity.id,
+            self.rollback_window,
+            self.repository.with_block
+        )
+
+    def segments(self):
+        segments = []
+
+        for name in os.listdir(self.path):
+            if not name.endswith('.arrow'):
+                continue
+
+            start, end = name[:-len('.arrow')].split('-')
+            segments.append((int(start), int(end)))
+
+        return sorted(segments)
+
+    def schema(self, columns=None):
+        return pa.schema([
+            pa.field(column.name, cache_arrow_type(column))
+            for column in self.repository.table_columns(columns)
+        ])
+
+    def table(self, start, end, columns=None):
+        source = pa.memory_map(self._segment_path(start, end))
+        table = pa.ipc.open_file(source).read_all()
+
+        if columns is None:
+            return table
+
+        return table.select(columns)
+
+    def _fetch(self, high_water, stable_id):
+        schema = self.schema()
+        columns = schema.names
+        path = self._segment_path(high_water + 1, stable_id)
+        temporary_path = path + '.tmp'
+
+        pages = self.repository.find_pages(
+            last_id=high_water,
+            columns=columns,
+            lovelace=True,
+            id=(None, stable_id + 1)
+        )
+
+        with pa.OSFile(temporary_path, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+            for df in pages:
+                writer.write_table(pa.Table.from_arrays(
+                    [cache_array(df[field.name], field.type) for field in schema],
+                    schema=schema
+                ))
+
+        os.replace(temporary_path, path)
+
+    def _frame(self, table, columns=None, lovelace=False):
+        # amounts come back as the db read decodes them: float64, or in
+        # lovelace mode int64 when they fit and exact Decimals otherwise
+        table_columns = self.repository.table_columns(columns)
+        amounts = {}
+
+        for name in numeric_columns(table_columns):
+            values = table.column(name)
+
+            if not lovelace:
+                values = pc.cast(values, pa.float64())
+            else:
+                try:
+                    values = pc.cast(values, pa.int64())
+                except pa.ArrowInvalid:
+                    amounts[name] = [pd.NA if value is None else lovelace_decimal(value) for value in values.to_pylist()]
+
+            table = table.set_column(table.schema.get_field_index(name), name, values)
+
+        df = table.to_pandas(types_mapper=NULLABLE_TYPES.get)
+
+        for name, values in amounts.items():
+            df[name] = pd.Series(values, index=df.index, dtype=object)
+
+        dtypes = table_dtypes(table_columns)
+
+        for name in numeric_columns(table_columns):
+            if lovelace and name not in amounts:
+                dtypes[name] = 'Int64' if df[name].isna().any() else 'int64'
+
+        return df.astype(dtypes)
+
+    def _columns(self, columns=None):
+        return [column.name for column in self.repository.table_columns(columns)]
+
+    def _remove(self, start, end):
+        os.remove(self._segment_path(start, end))
+
+    def _segment_path(self, start, end):
+        return os.path.join(self.path, f'{start:012d}-{end:012d}.arrow')
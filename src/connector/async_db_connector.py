@@ -0,0 +1,60 @@
+import asyncio
+
+from threading import Lock
+from weakref import WeakKeyDictionary
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.metrics.query_metrics import instrument_engine
+from src.parameters import DB_URL, DB_POOL
+
+# one async engine (and so one asyncpg pool) per DSN and pool arguments for
+# each event loop, asyncpg connections can only be used on the loop they
+# were opened on. Engines of a loop are dropped with it, those made outside
+# any loop are kept until disposed
+_engines = WeakKeyDictionary()
+_unbound_engines = {}
+_engines_lock = Lock()
+
+
+def async_db_url(url):
+    return make_url(url).set(drivername='postgresql+asyncpg')
+
+
+def async_db_connect(url=DB_URL['dev'], **pool):
+    key = (url, frozenset(pool.items()))
+
+    with _engines_lock:
+        engines = _loop_engines(_running_loop())
+        engine = engines.get(key)
+
+        if engine is None:
+            engine = create_async_engine(async_db_url(url), echo=False, **{**DB_POOL, **pool})
+            instrument_engine(engine.sync_engine)
+            engines[key] = engine
+
+    return engine
+
+
+async def async_db_dispose():
+    # the engines of the running loop and those not yet bound to one
+    with _engines_lock:
+        engines = [*_engines.pop(asyncio.get_running_loop(), {}).values(), *_unbound_engines.values()]
+        _unbound_engines.clear()
+
+    for engine in engines:
+        await engine.dispose()
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _loop_engines(loop):
+    if loop is None:
+        return _unbound_engines
+
+    return _engines.setdefault(loop, {})
@@ -0,0 +1,21 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from src.entity.cardano import Block
+
+
+def stable_max_id(engine, column, rollback_window, with_block=None):
+    # the largest id in column among rows of blocks deeper than the
+    # rollback window, 0 while there are none. with_block joins the
+    # column's table to its block, block ids need no join
+    with Session(engine) as session:
+        tip = session.query(func.max(Block.block_no)).scalar()
+
+        if tip is None:
+            return 0
+
+        query = session.query(func.max(column))
+
+        if with_block is not None:
+            query = with_block(query)
+
+        return query.filter(Block.block_no <= tip - rollback_window).scalar() or 0
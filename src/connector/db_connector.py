@@ -1,10 +1,33 @@
+from threading import Lock
+
 from sqlalchemy import create_engine
-from src.parameters import DB_URL
+from src.metrics.query_metrics import instrument_engine
+from src.parameters import DB_URL, DB_POOL
+
+# one engine (and so one connection pool) per DSN and pool arguments for
+# the whole process
+_engines = {}
+_engines_lock = Lock()
+
 
+def db_connect(url=DB_URL['dev'], **pool):
+    key = (url, frozenset(pool.items()))
 
-def db_connect():
-    engine = create_engine(DB_URL['dev'], echo=False)
+    with _engines_lock:
+        engine = _engines.get(key)
 
-    engine.connect()
+        if engine is None:
+            engine = instrument_engine(create_engine(url, echo=False, **{**DB_POOL, **pool}))
+            _engines[key] = engine
 
     return engine
+
+
+def db_dispose(close=True):
+    # close=False in a forked child drops the inherited pool without
+    # closing connections the parent still uses
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose(close=close)
+
+        _engines.clear()
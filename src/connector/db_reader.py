@@ -0,0 +1,60 @@
+from contextlib import nullcontext
+from time import perf_counter
+
+import pandas as pd
+
+from src.connector.lovelace import lovelace_numeric
+from src.entity.dtypes import lovelace_frame
+from src.metrics.query_metrics import query_scope
+from src.parameters import CHUNK_SIZE
+
+
+def read_frame(owner, engine, sql, numeric=None):
+    # a read of a rollup, index or registry, timed and attributed to it and
+    # its query_operation like the repository reads. numeric are Numeric
+    # columns decoded in lovelace mode, None reads without the caster
+    scope = query_scope(owner)
+    start = perf_counter()
+
+    with scope.active(), scope.connect(engine) as connection, _numeric(connection, numeric):
+        df = pd.read_sql(sql=sql, con=connection, coerce_float=numeric is None)
+
+    df = _lovelace(df, numeric)
+    scope.observe(perf_counter() - start, df)
+
+    return df
+
+
+def read_chunks(owner, engine, sql, numeric=None, chunk_size=CHUNK_SIZE):
+    # read_frame streamed through a server-side cursor, each chunk timed
+    # without the time the caller spends on the previous one
+    scope = query_scope(owner)
+    start = perf_counter()
+
+    with scope.connect(engine) as connection, _numeric(connection, numeric):
+        connection = connection.execution_options(stream_results=True, max_row_buffer=chunk_size)
+
+        with scope.active():
+            chunks = pd.read_sql(sql=sql, con=connection, chunksize=chunk_size, coerce_float=numeric is None)
+
+        while True:
+            with scope.active():
+                df = next(chunks, None)
+
+            if df is None:
+                return
+
+            df = _lovelace(df, numeric)
+            scope.observe(perf_counter() - start, df)
+
+            yield df
+
+            start = perf_counter()
+
+
+def _numeric(connection, numeric):
+    return nullcontext() if numeric is None else lovelace_numeric(connection)
+
+
+def _lovelace(df, numeric):
+    return df if not numeric else lovelace_frame(df, numeric)
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from decimal import Decimal
+
+import pandas as pd
+import psycopg2.extensions
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def cast_lovelace(value, cursor):
+    if value is None:
+        return pd.NA
+
+    # plain integers short enough to fit int64 skip Decimal entirely
+    digits = value[1:] if value[0] == '-' else value
+
+    if digits.isdigit() and len(digits) <= 18:
+        return int(value)
+
+    return lovelace_decimal(Decimal(value))
+
+
+def lovelace_decimal(number):
+    # whole amounts in int64 range as int, anything else stays Decimal
+    if number == number.to_integral_value() and INT64_MIN <= number <= INT64_MAX:
+        return int(number)
+
+    return number
+
+
+LOVELACE = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    'LOVELACE',
+    cast_lovelace
+)
+
+
+@contextmanager
+def lovelace_numeric(connection):
+    # scoped to the raw psycopg2 connection and restored afterwards,
+    # as the connection goes back to the shared pool
+    dbapi_connection = connection.connection.dbapi_connection
+
+    psycopg2.extensions.register_type(LOVELACE, dbapi_connection)
+
+    try:
+        yield connection
+    finally:
+        psycopg2.extensions.register_type(psycopg2.extensions.DECIMAL, dbapi_connection)
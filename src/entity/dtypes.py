@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+import pandas as pd
+
+from sqlalchemy import BigInteger, Boolean, Enum, Float, Integer, Numeric, SmallInteger
+
+
+def column_dtype(column):
+    column_type = column.type
+    nullable = column.nullable and not column.primary_key
+
+    if isinstance(column_type, Enum):
+        return pd.CategoricalDtype(column_type.enums)
+
+    if isinstance(column_type, Boolean):
+        return 'boolean' if nullable else 'bool'
+
+    if isinstance(column_type, SmallInteger):
+        return 'Int16' if nullable else 'int16'
+
+    if isinstance(column_type, (BigInteger, Integer)):
+        return 'Int64' if nullable else 'int64'
+
+    if isinstance(column_type, Float):
+        return 'float64'
+
+    # Numeric, String, LargeBinary, DateTime and JSONB keep the dtype
+    # pandas infers for them
+    return None
+
+
+def table_dtypes(columns):
+    dtypes = {}
+
+    for column in columns:
+        dtype = column_dtype(column)
+
+        if dtype is not None:
+            dtypes[column.name] = dtype
+
+    return dtypes
+
+
+def numeric_columns(columns):
+    return [
+        column.name for column in columns
+        if isinstance(column.type, Numeric) and not isinstance(column.type, Float)
+    ]
+
+
+def lovelace_frame(df, columns):
+    # int64 when every value fits, Int64 when there are NULLs, otherwise
+    # the column keeps its exact int/Decimal objects
+    for name in columns:
+        if df[name].dtype != object:
+            continue
+
+        # fractional or out of range values were decoded as Decimal
+        if any(isinstance(value, Decimal) for value in df[name]):
+            continue
+
+        dtype = 'Int64' if df[name].isna().any() else 'int64'
+
+        try:
+            df[name] = df[name].astype(dtype)
+        except OverflowError:
+            pass
+
+    return df
@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, Numeric, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.block import Block
+
+
+class AdaPot(Base):
+    __tablename__ = 'ada_pots'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('ada_pots_id_seq'::regclass)"))
+    slot_no = Column(Integer, nullable=False)
+    epoch_no = Column(Integer, nullable=False)
+    treasury = Column(Numeric, nullable=False)
+    reserves = Column(Numeric, nullable=False)
+    rewards = Column(Numeric, nullable=False)
+    utxo = Column(Numeric, nullable=False)
+    deposits = Column(Numeric, nullable=False)
+    fees = Column(Numeric, nullable=False)
+    block_id = Column(ForeignKey('block.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, unique=True)
+
+    block = relationship('Block', uselist=False)
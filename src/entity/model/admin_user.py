@@ -0,0 +1,10 @@
+from sqlalchemy import BigInteger, Column, String, text
+from src.entity.model.base import Base
+
+
+class AdminUser(Base):
+    __tablename__ = 'admin_user'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('admin_user_id_seq'::regclass)"))
+    username = Column(String, nullable=False, unique=True)
+    password = Column(String, nullable=False)
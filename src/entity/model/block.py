@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, LargeBinary, String, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.slot_leader import SlotLeader
+
+
+class Block(Base):
+    __tablename__ = 'block'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('block_id_seq'::regclass)"))
+    hash = Column(LargeBinary, nullable=False, unique=True)
+    epoch_no = Column(Integer, index=True)
+    slot_no = Column(Integer, index=True)
+    epoch_slot_no = Column(Integer)
+    block_no = Column(Integer, index=True)
+    previous_id = Column(ForeignKey('block.id', ondelete='CASCADE', onupdate='RESTRICT'), index=True)
+    slot_leader_id = Column(ForeignKey('slot_leader.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                            index=True)
+    size = Column(Integer, nullable=False)
+    time = Column(DateTime, nullable=False, index=True)
+    tx_count = Column(BigInteger, nullable=False)
+    proto_major = Column(Integer, nullable=False)
+    proto_minor = Column(Integer, nullable=False)
+    vrf_key = Column(String)
+    op_cert = Column(LargeBinary)
+    op_cert_counter = Column(BigInteger)
+
+    previous = relationship('Block', remote_side=[id])
+    slot_leader = relationship('SlotLeader')
@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, SmallInteger, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.tx import Tx
+
+
+class CollateralTxIn(Base):
+    __tablename__ = 'collateral_tx_in'
+    __table_args__ = (
+        UniqueConstraint('tx_in_id', 'tx_out_id', 'tx_out_index'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('collateral_tx_in_id_seq'::regclass)"))
+    tx_in_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False)
+    tx_out_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    tx_out_index = Column(SmallInteger, nullable=False)
+
+    tx_in = relationship('Tx', primaryjoin='CollateralTxIn.tx_in_id == Tx.id')
+    tx_out = relationship('Tx', primaryjoin='CollateralTxIn.tx_out_id == Tx.id')
@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, text, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.block import Block
+
+
+class CostModel(Base):
+    __tablename__ = 'cost_model'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('cost_model_id_seq'::regclass)"))
+    costs = Column(JSONB(astext_type=Text()), nullable=False, unique=True)
+    block_id = Column(ForeignKey('block.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False)
+
+    block = relationship('Block')
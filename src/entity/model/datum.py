@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, LargeBinary, text, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.tx import Tx
+
+
+class Datum(Base):
+    __tablename__ = 'datum'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('datum_id_seq'::regclass)"))
+    hash = Column(LargeBinary, nullable=False, unique=True)
+    tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False)
+    value = Column(JSONB(astext_type=Text()))
+
+    tx = relationship('Tx')
@@ -0,0 +1,30 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_hash import PoolHash
+from src.entity.model.redeemer import Redeemer
+from src.entity.model.stake_address import StakeAddres
+from src.entity.model.tx import Tx
+
+
+class Delegation(Base):
+    __tablename__ = 'delegation'
+    __table_args__ = (
+        UniqueConstraint('addr_id', 'pool_hash_id', 'tx_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('delegation_id_seq'::regclass)"))
+    addr_id = Column(ForeignKey('stake_address.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                     index=True)
+    cert_index = Column(Integer, nullable=False)
+    pool_hash_id = Column(ForeignKey('pool_hash.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                          index=True)
+    active_epoch_no = Column(BigInteger, nullable=False, index=True)
+    tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    slot_no = Column(Integer, nullable=False)
+    redeemer_id = Column(ForeignKey('redeemer.id', ondelete='CASCADE', onupdate='RESTRICT'), index=True)
+
+    addr = relationship('StakeAddres')
+    pool_hash = relationship('PoolHash')
+    redeemer = relationship('Redeemer')
+    tx = relationship('Tx')
@@ -0,0 +1,9 @@
+from sqlalchemy import BigInteger, Column, LargeBinary, text
+from src.entity.model.base import Base
+
+
+class DelistedPool(Base):
+    __tablename__ = 'delisted_pool'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('delisted_pool_id_seq'::regclass)"))
+    hash_raw = Column(LargeBinary, nullable=False, unique=True)
@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, Numeric, text
+from src.entity.model.base import Base
+
+
+class Epoch(Base):
+    __tablename__ = 'epoch'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('epoch_id_seq'::regclass)"))
+    out_sum = Column(Numeric, nullable=False)
+    fees = Column(Numeric, nullable=False)
+    tx_count = Column(Integer, nullable=False)
+    blk_count = Column(Integer, nullable=False)
+    no = Column(Integer, nullable=False, unique=True)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
@@ -0,0 +1,49 @@
+from sqlalchemy import BigInteger, Column, Float, ForeignKey, Integer, LargeBinary, Numeric, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.block import Block
+from src.entity.model.cost_model import CostModel
+
+
+class EpochParam(Base):
+    __tablename__ = 'epoch_param'
+    __table_args__ = (
+        UniqueConstraint('epoch_no', 'block_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('epoch_param_id_seq'::regclass)"))
+    epoch_no = Column(Integer, nullable=False)
+    min_fee_a = Column(Integer, nullable=False)
+    min_fee_b = Column(Integer, nullable=False)
+    max_block_size = Column(Integer, nullable=False)
+    max_tx_size = Column(Integer, nullable=False)
+    max_bh_size = Column(Integer, nullable=False)
+    key_deposit = Column(Numeric, nullable=False)
+    pool_deposit = Column(Numeric, nullable=False)
+    max_epoch = Column(Integer, nullable=False)
+    optimal_pool_count = Column(Integer, nullable=False)
+    influence = Column(Float(53), nullable=False)
+    monetary_expand_rate = Column(Float(53), nullable=False)
+    treasury_growth_rate = Column(Float(53), nullable=False)
+    decentralisation = Column(Float(53), nullable=False)
+    entropy = Column(LargeBinary)
+    protocol_major = Column(Integer, nullable=False)
+    protocol_minor = Column(Integer, nullable=False)
+    min_utxo_value = Column(Numeric, nullable=False)
+    min_pool_cost = Column(Numeric, nullable=False)
+    nonce = Column(LargeBinary)
+    coins_per_utxo_word = Column(Numeric)
+    cost_model_id = Column(ForeignKey('cost_model.id', ondelete='CASCADE', onupdate='RESTRICT'))
+    price_mem = Column(Float(53))
+    price_step = Column(Float(53))
+    max_tx_ex_mem = Column(Numeric)
+    max_tx_ex_steps = Column(Numeric)
+    max_block_ex_mem = Column(Numeric)
+    max_block_ex_steps = Column(Numeric)
+    max_val_size = Column(Numeric)
+    collateral_percent = Column(Integer)
+    max_collateral_inputs = Column(Integer)
+    block_id = Column(ForeignKey('block.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+
+    block = relationship('Block')
+    cost_model = relationship('CostModel')
@@ -0,0 +1,11 @@
+from sqlalchemy import BigInteger, Column, Integer, Numeric, text
+from src.entity.model.base import Base
+
+
+class EpochRewardTotalReceived(Base):
+    __tablename__ = 'epoch_reward_total_received'
+
+    id = Column(BigInteger, primary_key=True,
+                server_default=text("nextval('epoch_reward_total_received_id_seq'::regclass)"))
+    earned_epoch = Column(Integer, nullable=False, unique=True)
+    amount = Column(Numeric, nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, Numeric, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_hash import PoolHash
+from src.entity.model.stake_address import StakeAddres
+
+
+class EpochStake(Base):
+    __tablename__ = 'epoch_stake'
+    __table_args__ = (
+        UniqueConstraint('epoch_no', 'addr_id', 'pool_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('epoch_stake_id_seq'::regclass)"))
+    addr_id = Column(ForeignKey('stake_address.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                     index=True)
+    pool_id = Column(ForeignKey('pool_hash.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    amount = Column(Numeric, nullable=False)
+    epoch_no = Column(Integer, nullable=False, index=True)
+
+    addr = relationship('StakeAddres')
+    pool = relationship('PoolHash')
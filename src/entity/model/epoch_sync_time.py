@@ -0,0 +1,11 @@
+from sqlalchemy import BigInteger, Column, Enum, text
+from src.entity.model.base import Base
+
+
+class EpochSyncTime(Base):
+    __tablename__ = 'epoch_sync_time'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('epoch_sync_time_id_seq'::regclass)"))
+    no = Column(BigInteger, nullable=False, unique=True)
+    seconds = Column(BigInteger, nullable=False)
+    state = Column(Enum('lagging', 'following', name='syncstatetype'), nullable=False)
@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Numeric, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.multi_asset import MultiAsset
+from src.entity.model.tx import Tx
+
+
+class MaTxMint(Base):
+    __tablename__ = 'ma_tx_mint'
+    __table_args__ = (
+        UniqueConstraint('ident', 'tx_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('ma_tx_mint_id_seq'::regclass)"))
+    quantity = Column(Numeric, nullable=False)
+    tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    ident = Column(ForeignKey('multi_asset.id', ondelete='RESTRICT', onupdate='RESTRICT'), nullable=False)
+
+    multi_asset = relationship('MultiAsset')
+    tx = relationship('Tx')
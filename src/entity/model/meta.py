@@ -0,0 +1,11 @@
+from sqlalchemy import BigInteger, Column, DateTime, String, text
+from src.entity.model.base import Base
+
+
+class Meta(Base):
+    __tablename__ = 'meta'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('meta_id_seq'::regclass)"))
+    start_time = Column(DateTime, nullable=False, unique=True)
+    network_name = Column(String, nullable=False)
+    version = Column(String, nullable=False)
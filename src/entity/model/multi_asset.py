@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, Column, LargeBinary, String, UniqueConstraint, text
+from src.entity.model.base import Base
+
+
+class MultiAsset(Base):
+    __tablename__ = 'multi_asset'
+    __table_args__ = (
+        UniqueConstraint('policy', 'name'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('multi_asset_id_seq'::regclass)"))
+    policy = Column(LargeBinary, nullable=False)
+    name = Column(LargeBinary, nullable=False)
+    fingerprint = Column(String, nullable=False)
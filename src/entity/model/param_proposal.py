@@ -0,0 +1,49 @@
+from sqlalchemy import BigInteger, Column, Float, ForeignKey, Integer, LargeBinary, Numeric, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.cost_model import CostModel
+from src.entity.model.tx import Tx
+
+
+class ParamProposal(Base):
+    __tablename__ = 'param_proposal'
+    __table_args__ = (
+        UniqueConstraint('key', 'registered_tx_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('param_proposal_id_seq'::regclass)"))
+    epoch_no = Column(Integer, nullable=False)
+    key = Column(LargeBinary, nullable=False)
+    min_fee_a = Column(Numeric)
+    min_fee_b = Column(Numeric)
+    max_block_size = Column(Numeric)
+    max_tx_size = Column(Numeric)
+    max_bh_size = Column(Numeric)
+    key_deposit = Column(Numeric)
+    pool_deposit = Column(Numeric)
+    max_epoch = Column(Numeric)
+    optimal_pool_count = Column(Numeric)
+    influence = Column(Float(53))
+    monetary_expand_rate = Column(Float(53))
+    treasury_growth_rate = Column(Float(53))
+    decentralisation = Column(Float(53))
+    entropy = Column(LargeBinary)
+    protocol_major = Column(Integer)
+    protocol_minor = Column(Integer)
+    min_utxo_value = Column(Numeric)
+    min_pool_cost = Column(Numeric)
+    coins_per_utxo_word = Column(Numeric)
+    cost_model_id = Column(ForeignKey('cost_model.id', ondelete='CASCADE', onupdate='RESTRICT'))
+    price_mem = Column(Float(53))
+    price_step = Column(Float(53))
+    max_tx_ex_mem = Column(Numeric)
+    max_tx_ex_steps = Column(Numeric)
+    max_block_ex_mem = Column(Numeric)
+    max_block_ex_steps = Column(Numeric)
+    max_val_size = Column(Numeric)
+    collateral_percent = Column(Integer)
+    max_collateral_inputs = Column(Integer)
+    registered_tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+
+    cost_model = relationship('CostModel')
+    registered_tx = relationship('Tx')
@@ -0,0 +1,10 @@
+from sqlalchemy import BigInteger, Column, LargeBinary, String, text
+from src.entity.model.base import Base
+
+
+class PoolHash(Base):
+    __tablename__ = 'pool_hash'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('pool_hash_id_seq'::regclass)"))
+    hash_raw = Column(LargeBinary, nullable=False, unique=True)
+    view = Column(String, nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, LargeBinary, String, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_hash import PoolHash
+from src.entity.model.tx import Tx
+
+
+class PoolMetadataRef(Base):
+    __tablename__ = 'pool_metadata_ref'
+    __table_args__ = (
+        UniqueConstraint('pool_id', 'url', 'hash'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('pool_metadata_ref_id_seq'::regclass)"))
+    pool_id = Column(ForeignKey('pool_hash.id', ondelete='RESTRICT', onupdate='RESTRICT'), nullable=False)
+    url = Column(String, nullable=False)
+    hash = Column(LargeBinary, nullable=False)
+    registered_tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+
+    pool = relationship('PoolHash')
+    registered_tx = relationship('Tx')
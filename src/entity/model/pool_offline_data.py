@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, LargeBinary, String, UniqueConstraint, text, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_hash import PoolHash
+from src.entity.model.pool_metadata_ref import PoolMetadataRef
+
+
+class PoolOfflineDatum(Base):
+    __tablename__ = 'pool_offline_data'
+    __table_args__ = (
+        UniqueConstraint('pool_id', 'hash'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('pool_offline_data_id_seq'::regclass)"))
+    pool_id = Column(ForeignKey('pool_hash.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False)
+    ticker_name = Column(String, nullable=False)
+    hash = Column(LargeBinary, nullable=False)
+    json = Column(JSONB(astext_type=Text()), nullable=False)
+    bytes = Column(LargeBinary, nullable=False)
+    pmr_id = Column(ForeignKey('pool_metadata_ref.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                    index=True)
+
+    pmr = relationship('PoolMetadataRef')
+    pool = relationship('PoolHash')
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_hash import PoolHash
+from src.entity.model.pool_metadata_ref import PoolMetadataRef
+
+
+class PoolOfflineFetchError(Base):
+    __tablename__ = 'pool_offline_fetch_error'
+    __table_args__ = (
+        UniqueConstraint('pool_id', 'fetch_time', 'retry_count'),
+    )
+
+    id = Column(BigInteger, primary_key=True,
+                server_default=text("nextval('pool_offline_fetch_error_id_seq'::regclass)"))
+    pool_id = Column(ForeignKey('pool_hash.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False)
+    fetch_time = Column(DateTime, nullable=False)
+    pmr_id = Column(ForeignKey('pool_metadata_ref.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                    index=True)
+    fetch_error = Column(String, nullable=False)
+    retry_count = Column(Integer, nullable=False)
+
+    pmr = relationship('PoolMetadataRef')
+    pool = relationship('PoolHash')
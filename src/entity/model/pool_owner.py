@@ -0,0 +1,23 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_hash import PoolHash
+from src.entity.model.stake_address import StakeAddres
+from src.entity.model.tx import Tx
+
+
+class PoolOwner(Base):
+    __tablename__ = 'pool_owner'
+    __table_args__ = (
+        UniqueConstraint('addr_id', 'pool_hash_id', 'registered_tx_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('pool_owner_id_seq'::regclass)"))
+    addr_id = Column(ForeignKey('stake_address.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False)
+    pool_hash_id = Column(ForeignKey('pool_hash.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                          index=True)
+    registered_tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+
+    addr = relationship('StakeAddres')
+    pool_hash = relationship('PoolHash')
+    registered_tx = relationship('Tx')
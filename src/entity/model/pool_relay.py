@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, String, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_update import PoolUpdate
+
+
+class PoolRelay(Base):
+    __tablename__ = 'pool_relay'
+    __table_args__ = (
+        UniqueConstraint('update_id', 'ipv4', 'ipv6', 'dns_name'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('pool_relay_id_seq'::regclass)"))
+    update_id = Column(ForeignKey('pool_update.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                       index=True)
+    ipv4 = Column(String)
+    ipv6 = Column(String)
+    dns_name = Column(String)
+    dns_srv_name = Column(String)
+    port = Column(Integer)
+
+    update = relationship('PoolUpdate')
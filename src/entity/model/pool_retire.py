@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_hash import PoolHash
+from src.entity.model.tx import Tx
+
+
+class PoolRetire(Base):
+    __tablename__ = 'pool_retire'
+    __table_args__ = (
+        UniqueConstraint('hash_id', 'announced_tx_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('pool_retire_id_seq'::regclass)"))
+    hash_id = Column(ForeignKey('pool_hash.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    cert_index = Column(Integer, nullable=False)
+    announced_tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    retiring_epoch = Column(Integer, nullable=False)
+
+    announced_tx = relationship('Tx')
+    hash = relationship('PoolHash')
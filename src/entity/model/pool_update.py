@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, Float, ForeignKey, Integer, LargeBinary, Numeric, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_hash import PoolHash
+from src.entity.model.pool_metadata_ref import PoolMetadataRef
+from src.entity.model.tx import Tx
+
+
+class PoolUpdate(Base):
+    __tablename__ = 'pool_update'
+    __table_args__ = (
+        UniqueConstraint('hash_id', 'registered_tx_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('pool_update_id_seq'::regclass)"))
+    hash_id = Column(ForeignKey('pool_hash.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    cert_index = Column(Integer, nullable=False)
+    vrf_key_hash = Column(LargeBinary, nullable=False)
+    pledge = Column(Numeric, nullable=False)
+    reward_addr = Column(LargeBinary, nullable=False, index=True)
+    active_epoch_no = Column(BigInteger, nullable=False, index=True)
+    meta_id = Column(ForeignKey('pool_metadata_ref.id', ondelete='CASCADE', onupdate='RESTRICT'), index=True)
+    margin = Column(Float(53), nullable=False)
+    fixed_cost = Column(Numeric, nullable=False)
+    registered_tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+
+    hash = relationship('PoolHash')
+    meta = relationship('PoolMetadataRef')
+    registered_tx = relationship('Tx')
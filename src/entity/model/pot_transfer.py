@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, Numeric, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.tx import Tx
+
+
+class PotTransfer(Base):
+    __tablename__ = 'pot_transfer'
+    __table_args__ = (
+        UniqueConstraint('tx_id', 'cert_index'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('pot_transfer_id_seq'::regclass)"))
+    cert_index = Column(Integer, nullable=False)
+    treasury = Column(Numeric, nullable=False)
+    reserves = Column(Numeric, nullable=False)
+    tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False)
+
+    tx = relationship('Tx')
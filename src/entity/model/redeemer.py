@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, Enum, ForeignKey, Integer, LargeBinary, Numeric, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.datum import Datum
+from src.entity.model.tx import Tx
+
+
+class Redeemer(Base):
+    __tablename__ = 'redeemer'
+    __table_args__ = (
+        UniqueConstraint('tx_id', 'purpose', 'index'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('redeemer_id_seq'::regclass)"))
+    tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False)
+    unit_mem = Column(BigInteger, nullable=False)
+    unit_steps = Column(BigInteger, nullable=False)
+    fee = Column(Numeric, nullable=False)
+    purpose = Column(Enum('spend', 'mint', 'cert', 'reward', name='scriptpurposetype'), nullable=False)
+    index = Column(Integer, nullable=False)
+    script_hash = Column(LargeBinary)
+    datum_id = Column(ForeignKey('datum.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False)
+
+    datum = relationship('Datum')
+    tx = relationship('Tx')
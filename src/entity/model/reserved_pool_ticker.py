@@ -0,0 +1,10 @@
+from sqlalchemy import BigInteger, Column, LargeBinary, String, text
+from src.entity.model.base import Base
+
+
+class ReservedPoolTicker(Base):
+    __tablename__ = 'reserved_pool_ticker'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('reserved_pool_ticker_id_seq'::regclass)"))
+    name = Column(String, nullable=False, unique=True)
+    pool_hash = Column(LargeBinary, nullable=False, index=True)
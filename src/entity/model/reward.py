@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, Enum, ForeignKey, Numeric, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_hash import PoolHash
+from src.entity.model.stake_address import StakeAddres
+
+
+class Reward(Base):
+    __tablename__ = 'reward'
+    __table_args__ = (
+        UniqueConstraint('addr_id', 'type', 'earned_epoch', 'pool_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('reward_id_seq'::regclass)"))
+    addr_id = Column(ForeignKey('stake_address.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                     index=True)
+    type = Column(Enum('leader', 'member', 'reserves', 'treasury', 'refund', name='rewardtype'), nullable=False)
+    amount = Column(Numeric, nullable=False)
+    earned_epoch = Column(BigInteger, nullable=False, index=True)
+    spendable_epoch = Column(BigInteger, nullable=False)
+    pool_id = Column(ForeignKey('pool_hash.id', ondelete='CASCADE', onupdate='RESTRICT'), index=True)
+
+    addr = relationship('StakeAddres')
+    pool = relationship('PoolHash')
@@ -0,0 +1,11 @@
+from sqlalchemy import BigInteger, Column, text
+from src.entity.model.base import Base
+
+
+class SchemaVersion(Base):
+    __tablename__ = 'schema_version'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('schema_version_id_seq'::regclass)"))
+    stage_one = Column(BigInteger, nullable=False)
+    stage_two = Column(BigInteger, nullable=False)
+    stage_three = Column(BigInteger, nullable=False)
@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, Column, Enum, ForeignKey, Integer, LargeBinary, text, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.tx import Tx
+
+
+class Script(Base):
+    __tablename__ = 'script'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('script_id_seq'::regclass)"))
+    tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    hash = Column(LargeBinary, nullable=False, unique=True)
+    type = Column(Enum('multisig', 'timelock', 'plutus', name='scripttype'), nullable=False)
+    json = Column(JSONB(astext_type=Text()))
+    bytes = Column(LargeBinary)
+    serialised_size = Column(Integer)
+
+    tx = relationship('Tx')
@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, LargeBinary, String, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.pool_hash import PoolHash
+
+
+class SlotLeader(Base):
+    __tablename__ = 'slot_leader'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('slot_leader_id_seq'::regclass)"))
+    hash = Column(LargeBinary, nullable=False, unique=True)
+    pool_hash_id = Column(ForeignKey('pool_hash.id', ondelete='CASCADE', onupdate='RESTRICT'), index=True)
+    description = Column(String, nullable=False)
+
+    pool_hash = relationship('PoolHash')
@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, LargeBinary, String, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.tx import Tx
+
+
+class StakeAddres(Base):
+    __tablename__ = 'stake_address'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('stake_address_id_seq'::regclass)"))
+    hash_raw = Column(LargeBinary, nullable=False, unique=True)
+    view = Column(String, nullable=False, index=True)
+    script_hash = Column(LargeBinary)
+    registered_tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+
+    registered_tx = relationship('Tx')
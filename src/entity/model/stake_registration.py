@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.stake_address import StakeAddres
+from src.entity.model.tx import Tx
+
+
+class StakeRegistration(Base):
+    __tablename__ = 'stake_registration'
+    __table_args__ = (
+        UniqueConstraint('addr_id', 'tx_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('stake_registration_id_seq'::regclass)"))
+    addr_id = Column(ForeignKey('stake_address.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                     index=True)
+    cert_index = Column(Integer, nullable=False)
+    epoch_no = Column(Integer, nullable=False)
+    tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+
+    addr = relationship('StakeAddres')
+    tx = relationship('Tx')
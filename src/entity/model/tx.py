@@ -0,0 +1,23 @@
+from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, Integer, LargeBinary, Numeric, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.block import Block
+
+
+class Tx(Base):
+    __tablename__ = 'tx'
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('tx_id_seq'::regclass)"))
+    hash = Column(LargeBinary, nullable=False, unique=True)
+    block_id = Column(ForeignKey('block.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    block_index = Column(Integer, nullable=False)
+    out_sum = Column(Numeric, nullable=False)
+    fee = Column(Numeric, nullable=False)
+    deposit = Column(BigInteger, nullable=False)
+    size = Column(Integer, nullable=False)
+    invalid_before = Column(Numeric)
+    invalid_hereafter = Column(Numeric)
+    valid_contract = Column(Boolean, nullable=False)
+    script_size = Column(Integer, nullable=False)
+
+    block = relationship('Block')
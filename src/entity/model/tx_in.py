@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, SmallInteger, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.redeemer import Redeemer
+from src.entity.model.tx import Tx
+
+
+class TxIn(Base):
+    __tablename__ = 'tx_in'
+    __table_args__ = (
+        UniqueConstraint('tx_out_id', 'tx_out_index'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('tx_in_id_seq'::regclass)"))
+    tx_in_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    tx_out_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    tx_out_index = Column(SmallInteger, nullable=False)
+    redeemer_id = Column(ForeignKey('redeemer.id', ondelete='CASCADE', onupdate='RESTRICT'), index=True)
+
+    redeemer = relationship('Redeemer')
+    tx_in = relationship('Tx', primaryjoin='TxIn.tx_in_id == Tx.id')
+    tx_out = relationship('Tx', primaryjoin='TxIn.tx_out_id == Tx.id')
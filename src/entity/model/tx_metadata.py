@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, LargeBinary, Numeric, UniqueConstraint, text, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.tx import Tx
+
+
+class TxMetadatum(Base):
+    __tablename__ = 'tx_metadata'
+    __table_args__ = (
+        UniqueConstraint('key', 'tx_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('tx_metadata_id_seq'::regclass)"))
+    key = Column(Numeric, nullable=False)
+    json = Column(JSONB(astext_type=Text()))
+    bytes = Column(LargeBinary, nullable=False)
+    tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+
+    tx = relationship('Tx')
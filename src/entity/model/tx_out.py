@@ -0,0 +1,28 @@
+from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, \
+    LargeBinary, Numeric, SmallInteger, String, UniqueConstraint, \
+    text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.stake_address import StakeAddres
+from src.entity.model.tx import Tx
+
+
+class TxOut(Base):
+    __tablename__ = 'tx_out'
+    __table_args__ = (
+        UniqueConstraint('tx_id', 'index'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('tx_out_id_seq'::regclass)"))
+    tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+    index = Column(SmallInteger, nullable=False)
+    address = Column(String, nullable=False, index=True)
+    address_raw = Column(LargeBinary, nullable=False)
+    address_has_script = Column(Boolean, nullable=False)
+    payment_cred = Column(LargeBinary, index=True)
+    stake_address_id = Column(ForeignKey('stake_address.id', ondelete='CASCADE', onupdate='RESTRICT'), index=True)
+    value = Column(Numeric, nullable=False)
+    data_hash = Column(LargeBinary)
+
+    stake_address = relationship('StakeAddres')
+    tx = relationship('Tx')
@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Boolean, Column, LargeBinary, Numeric, SmallInteger, String, Table
+from src.entity.model.base import metadata
+
+
+t_utxo_byron_view = Table(
+    'utxo_byron_view', metadata,
+    Column('id', BigInteger),
+    Column('tx_id', BigInteger),
+    Column('index', SmallInteger),
+    Column('address', String),
+    Column('address_raw', LargeBinary),
+    Column('address_has_script', Boolean),
+    Column('payment_cred', LargeBinary),
+    Column('stake_address_id', BigInteger),
+    Column('value', Numeric),
+    Column('data_hash', LargeBinary)
+)
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Numeric, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from src.entity.model.base import Base
+from src.entity.model.redeemer import Redeemer
+from src.entity.model.stake_address import StakeAddres
+from src.entity.model.tx import Tx
+
+
+class Withdrawal(Base):
+    __tablename__ = 'withdrawal'
+    __table_args__ = (
+        UniqueConstraint('addr_id', 'tx_id'),
+    )
+
+    id = Column(BigInteger, primary_key=True, server_default=text("nextval('withdrawal_id_seq'::regclass)"))
+    addr_id = Column(ForeignKey('stake_address.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False,
+                     index=True)
+    amount = Column(Numeric, nullable=False)
+    redeemer_id = Column(ForeignKey('redeemer.id', ondelete='CASCADE', onupdate='RESTRICT'), index=True)
+    tx_id = Column(ForeignKey('tx.id', ondelete='CASCADE', onupdate='RESTRICT'), nullable=False, index=True)
+
+    addr = relationship('StakeAddres')
+    redeemer = relationship('Redeemer')
+    tx = relationship('Tx')
@@ -0,0 +1,168 @@
+import os
+
+from threading import Thread
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as pa_dataset
+import pyarrow.parquet as pq
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Enum, Float, Integer, \
+    LargeBinary, Numeric, SmallInteger, func
+from sqlalchemy.orm import Session
+from src.parameters import COPY_BLOCK_SIZE
+
+
+def arrow_type(column):
+    column_type = column.type
+
+    if isinstance(column_type, Enum):
+        return pa.dictionary(pa.int32(), pa.string())
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, SmallInteger):
+        return pa.int16()
+    if isinstance(column_type, (BigInteger, Integer)):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Numeric):
+        # db-sync amounts are numeric(20, 0), beyond int64 for token quantities
+        return pa.decimal128(38, 0)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp('us')
+
+    # String, JSONB and hex encoded LargeBinary
+    return pa.string()
+
+
+class ParquetExporter():
+    repository = None
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    def export(self, path, columns=None, by_epoch=True):
+        schema = self.schema(columns, by_epoch)
+        written = []
+
+        pa_dataset.write_dataset(
+            data=self.batches(columns, by_epoch),
+            base_dir=path,
+            schema=schema,
+            format='parquet',
+            partitioning=['epoch'] if by_epoch else None,
+            partitioning_flavor='hive' if by_epoch else None,
+            existing_data_behavior='overwrite_or_ignore',
+            max_partitions=4096,
+            file_visitor=written.append,
+        )
+
+        # no rows selected, still leave a readable zero-row file
+        if not written:
+            os.makedirs(path, exist_ok=True)
+            pq.write_table(self.schema(columns).empty_table(), os.path.join(path, 'part-0.parquet'))
+
+    def schema(self, columns=None, by_epoch=False):
+        fields = [
+            pa.field(column.name, arrow_type(column), nullable=column.nullable)
+            for column in self.repository.table_columns(columns)
+        ]
+
+        if by_epoch:
+            fields.append(pa.field('epoch', pa.int64()))
+
+        return pa.schema(fields)
+
+    def batches(self, columns=None, by_epoch=False):
+        schema = self.schema(columns, by_epoch)
+        sql = self._copy_statement(columns, by_epoch)
+
+        # COPY streams CSV into a pipe from a worker thread while pyarrow
+        # parses it into record batches, no Python row objects are built
+        read_fd, write_fd = os.pipe()
+        reader_file = os.fdopen(read_fd, 'rb')
+        writer_file = os.fdopen(write_fd, 'wb')
+        errors = []
+
+        def copy():
+            try:
+                with self.repository.engine.connect() as connection:
+                    cursor = connection.connection.dbapi_connection.cursor()
+                    cursor.copy_expert(f'COPY ({sql}) TO STDOUT WITH (FORMAT csv)', writer_file)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                writer_file.close()
+
+        thread = Thread(target=copy, daemon=True)
+        thread.start()
+
+        try:
+            # peek blocks until COPY writes its first rows or closes the pipe,
+            # an empty pipe is an empty result or a COPY that failed
+            if not reader_file.peek(1):
+                thread.join()
+
+                if errors:
+                    raise errors[0]
+
+                yield pa.RecordBatch.from_pylist([], schema=schema)
+                return
+
+            reader = pa_csv.open_csv(
+                reader_file,
+                read_options=pa_csv.ReadOptions(
+                    column_names=schema.names,
+                    block_size=COPY_BLOCK_SIZE,
+                ),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types=schema,
+                    true_values=['t'],
+                    false_values=['f'],
+                    strings_can_be_null=True,
+                    quoted_strings_can_be_null=False,
+                ),
+            )
+
+            for batch in reader:
+                yield batch
+        except pa.ArrowInvalid as error:
+            # a COPY failing midway truncates the CSV, its error is the cause
+            thread.join()
+
+            if errors:
+                raise errors[0] from error
+
+            raise
+        finally:
+            reader_file.close()
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+    def _copy_statement(self, columns=None, by_epoch=False):
+        selected = []
+
+        for column in self.repository.table_columns(columns):
+            attribute = getattr(self.repository.entity, column.name)
+
+            if isinstance(column.type, LargeBinary):
+                attribute = func.encode(attribute, 'hex').label(column.name)
+
+            selected.append(attribute)
+
+        query = Session(bind=self.repository.engine).query(*selected)
+
+        if by_epoch:
+            query = self.repository.with_epoch(query)
+
+        statement = query \
+            .order_by(self.repository.entity.id.asc()) \
+            .statement
+
+        return statement.compile(
+            dialect=self.repository.engine.dialect,
+            compile_kwargs={'literal_binds': True}
+        )
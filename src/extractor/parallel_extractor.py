@@ -0,0 +1,155 @@
+import multiprocessing
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from sqlalchemy import func, select, text
+from src.connector.db_connector import db_dispose
+from src.entity.cardano import Block
+
+# repositories of the worker process, one per (class, url)
+_repositories = {}
+
+
+def _init_worker():
+    # forked workers must not reuse the parent's pooled connections
+    db_dispose(close=False)
+
+
+def _extract(repository_class, url, by, partition, columns, lovelace, path):
+    key = (repository_class, url)
+
+    if key not in _repositories:
+        _repositories[key] = repository_class(url)
+
+    extractor = ParallelExtractor(_repositories[key])
+    df = extractor.find_partition(by, partition, columns, lovelace)
+
+    if path is None:
+        return df
+
+    df.to_parquet(path, index=False)
+
+    return len(df)
+
+
+class ParallelExtractor():
+    # Reads a table as id or epoch partitions from a process pool, each
+    # worker with its own connection and its own rows to decode. Id ranges
+    # are cut at the id histogram bounds of pg_stats, so they hold about the
+    # same number of rows, falling back to even min/max ranges.
+    repository = None
+    workers = None
+
+    def __init__(self, repository, workers=None):
+        self.repository = repository
+        self.workers = workers or os.cpu_count()
+
+    def extract(self, columns=None, lovelace=False, by='id', partitions=None):
+        # partitions in id order, concatenated
+        frames = list(self._map(by, self.partitions(by, partitions), columns, lovelace))
+
+        if not frames:
+            return self.repository.empty_frame(columns)
+
+        return pd.concat(frames, ignore_index=True)
+
+    def extract_to(self, path, columns=None, lovelace=False, by='id', partitions=None):
+        # one Parquet file per partition, epoch partitions in hive layout
+        partitions = self.partitions(by, partitions)
+        paths = []
+
+        for index, partition in enumerate(partitions):
+            if by == 'epoch':
+                os.makedirs(os.path.join(path, f'epoch={partition}'), exist_ok=True)
+                paths.append(os.path.join(path, f'epoch={partition}', 'part-00000.parquet'))
+            else:
+                os.makedirs(path, exist_ok=True)
+                paths.append(os.path.join(path, f'part-{index:05d}.parquet'))
+
+        rows = list(self._map(by, partitions, columns, lovelace, paths))
+
+        return dict(zip(paths, rows))
+
+    def partitions(self, by='id', partitions=None):
+        if by == 'id':
+            return self.id_ranges(partitions or self.workers * 4)
+        if by == 'epoch':
+            return self.epochs() if partitions is None else list(partitions)
+
+        raise ValueError(f'can not partition by {by}')
+
+    def id_ranges(self, count):
+        # [start, end) ranges covering min(id) to max(id)
+        min_id, max_id = self._min_max(self.repository.entity.id)
+
+        if min_id is None:
+            return []
+
+        bounds = self._histogram_bounds()
+
+        if len(bounds) > count:
+            bounds = np.asarray(bounds, dtype=np.int64)
+            edges = bounds[np.linspace(0, len(bounds) - 1, count + 1).round().astype(int)]
+        else:
+            edges = np.linspace(min_id, max_id + 1, count + 1).astype(np.int64)
+
+        edges[0], edges[-1] = min_id, max_id + 1
+        edges = np.unique(edges)
+
+        return [(int(start), int(end)) for start, end in zip(edges[:-1], edges[1:])]
+
+    def epochs(self):
+        first, last = self._min_max(Block.epoch_no)
+
+        if first is None:
+            return []
+
+        return list(range(first, last + 1))
+
+    def find_partition(self, by, partition, columns=None, lovelace=False):
+        if by == 'id':
+            return self.repository.find_page(limit=None, columns=columns, lovelace=lovelace, id=partition)
+
+        return self.repository.find_epoch(partition, columns, lovelace)
+
+    def _map(self, by, partitions, columns, lovelace, paths=None):
+        url = self.repository.engine.url.render_as_string(hide_password=False)
+
+        if not partitions:
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(partitions)),
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_worker
+        ) as executor:
+            yield from executor.map(
+                _extract,
+                [type(self.repository)] * len(partitions),
+                [url] * len(partitions),
+                [by] * len(partitions),
+                partitions,
+                [columns] * len(partitions),
+                [lovelace] * len(partitions),
+                paths or [None] * len(partitions),
+            )
+
+    def _min_max(self, column):
+        with self.repository.engine.connect() as connection:
+            return connection.execute(select(func.min(column), func.max(column))).one()
+
+    def _histogram_bounds(self):
+        # planner statistics of the primary key, empty before ANALYZE
+        sql = text(
+            'SELECT histogram_bounds::text::bigint[] FROM pg_stats '
+            'WHERE schemaname = current_schema() AND tablename = :table AND attname = :column'
+        )
+
+        with self.repository.engine.connect() as connection:
+            bounds = connection.execute(sql, {'table': self.repository.entity.__tablename__, 'column': 'id'}).scalar()
+
+        return bounds or []
@@ -0,0 +1,156 @@
+from collections import deque, namedtuple
+
+import pandas as pd
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from src.entity.cardano import Block
+from src.parameters import DB_URL, FOLLOW_BATCH_SIZE, ROLLBACK_WINDOW
+from src.repository.block_repository import BlockRepository
+from src.repository.tx_in_repository import TxInRepository
+from src.repository.tx_out_repository import TxOutRepository
+from src.repository.tx_repository import TxRepository
+
+RollForward = namedtuple('RollForward', ['blocks', 'txs', 'tx_outs', 'tx_ins'])
+RollBack = namedtuple('RollBack', ['block_id', 'block_no', 'hash'])
+
+
+class ChainFollower():
+    # Tails blocks added by cardano-db-sync. Block ids only grow, also across
+    # rollbacks, so new blocks are a keyset page past the cursor. Rollbacks
+    # are detected by the cursor block disappearing or changing hash, or a
+    # new block not linking to it, and resolved against the (id, hash) of the
+    # last rollback window of blocks.
+    blocks = None
+    txs = None
+    tx_outs = None
+    tx_ins = None
+    batch_size = None
+    lovelace = None
+
+    def __init__(self, url=DB_URL['dev'], block_id=None, batch_size=FOLLOW_BATCH_SIZE, lovelace=False):
+        self.blocks = BlockRepository(url)
+        self.txs = TxRepository(url)
+        self.tx_outs = TxOutRepository(url)
+        self.tx_ins = TxInRepository(url)
+        self.batch_size = batch_size
+        self.lovelace = lovelace
+        self._history = deque(maxlen=ROLLBACK_WINDOW)
+
+        if block_id is None:
+            with Session(self.blocks.engine) as session:
+                block_id = session.query(func.max(Block.id)).scalar() or 0
+
+        if block_id:
+            block = self.blocks.find_by_ids([block_id], columns=['id', 'block_no', 'hash'])
+
+            if block.empty:
+                raise ValueError(f'no block with id {block_id}')
+
+            self._remember(block)
+
+    @property
+    def cursor(self):
+        return self._history[-1] if self._history else None
+
+    def poll(self):
+        # one call catches up with the db and returns the ordered events
+        events = []
+
+        while True:
+            rollback = self._check_cursor()
+
+            if rollback is not None:
+                events.append(rollback)
+
+            blocks = self.blocks.find_page(
+                last_id=self.cursor[0] if self.cursor else None,
+                limit=self.batch_size,
+                lovelace=self.lovelace
+            )
+
+            if blocks.empty:
+                return events
+
+            linked = self._linked(blocks)
+
+            if linked.empty:
+                # the next block forks off below the cursor, db-sync is still
+                # deleting the orphaned blocks: pick it up on the next poll
+                return events
+
+            events.append(self._roll_forward(linked))
+            self._remember(linked)
+
+            if len(blocks) < self.batch_size:
+                return events
+
+    def _check_cursor(self):
+        if self.cursor is None:
+            return None
+
+        block_id, _, block_hash = self.cursor
+        current = self.blocks.find_by_ids([block_id], columns=['id', 'hash'])
+
+        if not current.empty and current['hash'].iloc[0] == block_hash:
+            return None
+
+        return self._roll_back()
+
+    def _roll_back(self):
+        ids = [block_id for block_id, _, _ in self._history]
+        current = self.blocks.find_by_ids(ids, columns=['id', 'hash'])
+        hashes = dict(zip(current['id'].tolist(), current['hash'].tolist()))
+
+        while self._history:
+            block_id, block_no, block_hash = self._history[-1]
+
+            if hashes.get(block_id) == block_hash:
+                return RollBack(block_id, block_no, block_hash)
+
+            self._history.pop()
+
+        raise RuntimeError('rollback deeper than the followed history')
+
+    def _linked(self, blocks):
+        # the prefix of blocks forming a chain on top of the cursor
+        previous_id = self.cursor[0] if self.cursor is not None else None
+        count = 0
+
+        for block_id, block_previous_id in zip(blocks['id'].tolist(), blocks['previous_id'].tolist()):
+            if previous_id is not None and block_previous_id != previous_id:
+                break
+
+            previous_id = block_id
+            count += 1
+
+        return blocks.iloc[:count]
+
+    def _roll_forward(self, blocks):
+        block_ids = blocks['id']
+        txs = self._range(self.txs, block_id=(int(block_ids.iloc[0]), int(block_ids.iloc[-1]) + 1))
+
+        if txs.empty:
+            return RollForward(blocks, txs, self.tx_outs.empty_frame(), self.tx_ins.empty_frame())
+
+        tx_ids = (int(txs['id'].iloc[0]), int(txs['id'].iloc[-1]) + 1)
+
+        return RollForward(
+            blocks,
+            txs,
+            self._range(self.tx_outs, tx_id=tx_ids),
+            self._range(self.tx_ins, tx_in_id=tx_ids),
+        )
+
+    def _range(self, repository, **ranges):
+        # ids follow chain order, so a block's rows are a contiguous range
+        pages = list(repository.find_pages(lovelace=self.lovelace, **ranges))
+
+        if not pages:
+            return repository.empty_frame()
+
+        return pd.concat(pages, ignore_index=True)
+
+    def _remember(self, blocks):
+        for row in blocks[['id', 'block_no', 'hash']].itertuples(index=False):
+            self._history.append((int(row.id), row.block_no, row.hash))
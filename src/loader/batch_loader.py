@@ -0,0 +1,84 @@
+import asyncio
+
+
+class BatchLoader():
+    # DataLoader-style coalescing: load() calls made in the same event loop
+    # tick are collected and resolved with a single find_by_keys call.
+    # Results are memoized for the lifetime of the loader, so use one per
+    # request. Callers await a shielded future: one cancelled caller does
+    # not cancel the load for the others waiting on the same key.
+    repository = None
+    names = None
+    columns = None
+
+    def __init__(self, repository, names, columns=None):
+        self.repository = repository
+        self.names = (names,) if isinstance(names, str) else tuple(names)
+        self.columns = columns
+        self._futures = {}
+        self._queue = []
+        self._tasks = set()
+
+    async def load(self, key):
+        future = self._futures.get(key)
+
+        if future is None or future.cancelled():
+            future = asyncio.get_running_loop().create_future()
+            self._futures[key] = future
+
+            if not self._queue:
+                asyncio.get_running_loop().call_soon(self._dispatch)
+
+            self._queue.append(key)
+
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys):
+        return await asyncio.gather(*[self.load(key) for key in keys])
+
+    def _dispatch(self):
+        keys, self._queue = self._queue, []
+
+        # the futures of this batch, a key cancelled directly may be queued
+        # again with a new future before this batch resolves
+        futures = {key: self._futures[key] for key in keys}
+
+        task = asyncio.ensure_future(self._resolve(futures))
+
+        # keep a reference until done, the loop only holds weak ones
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, futures):
+        columns = self.columns
+
+        if columns is not None:
+            columns = [*columns, *[name for name in self.names if name not in columns]]
+
+        try:
+            df = await self.repository.find_by_keys(self.names, list(futures), columns)
+        except Exception as error:
+            for key, future in futures.items():
+                self._forget(key, future)
+
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        rows = {}
+
+        for row in df.to_dict('records'):
+            key = tuple(row[name] for name in self.names)
+            rows[key[0] if len(key) == 1 else key] = row
+
+        for key, future in futures.items():
+            # a future cancelled directly is dropped, the key is fetched again
+            if future.cancelled():
+                self._forget(key, future)
+            elif not future.done():
+                future.set_result(rows.get(key))
+
+    def _forget(self, key, future):
+        # only while the key still maps to this batch's future
+        if self._futures.get(key) is future:
+            del self._futures[key]
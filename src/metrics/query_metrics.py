@@ -0,0 +1,320 @@
+import inspect
+import json
+import logging
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy import event
+from src.parameters import SLOW_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60)
+ROWS_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+BYTES_BUCKETS = (1 << 10, 1 << 14, 1 << 17, 1 << 20, 1 << 24, 1 << 27, 1 << 30)
+
+BUCKETS = {
+    'query_seconds': SECONDS_BUCKETS,
+    'execute_seconds': SECONDS_BUCKETS,
+    'pool_wait_seconds': SECONDS_BUCKETS,
+    'frame_seconds': SECONDS_BUCKETS,
+    'rows': ROWS_BUCKETS,
+    'bytes': BYTES_BUCKETS,
+}
+
+# the repository read the current thread or task is in, if any
+_scope = ContextVar('query_scope', default=None)
+
+# the (repository, finder) the current thread or task is in, if any
+_operation = ContextVar('query_operation', default=None)
+
+
+class Histogram():
+    buckets = None
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        cumulative, total = [], 0
+
+        for count in self.counts[:-1]:
+            total += count
+            cumulative.append(total)
+
+        return {
+            'buckets': dict(zip(self.buckets, cumulative)),
+            'sum': self.sum,
+            'count': self.count,
+        }
+
+
+class QueryMetrics():
+    # In memory histograms per (repository, operation, metric). A sink is
+    # any callable taking snapshot(), see prometheus_text and json_text.
+    # Queries running longer than slow_query_seconds are logged with their
+    # EXPLAIN plan.
+    slow_query_seconds = None
+
+    def __init__(self, slow_query_seconds=None):
+        self.slow_query_seconds = slow_query_seconds
+        self._histograms = {}
+        self._lock = Lock()
+
+    def observe(self, repository, operation, metric, value):
+        key = (repository, operation, metric)
+
+        with self._lock:
+            histogram = self._histograms.get(key)
+
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(BUCKETS[metric])
+
+            histogram.observe(value)
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {'repository': repository, 'operation': operation, 'metric': metric, **histogram.snapshot()}
+                for (repository, operation, metric), histogram in sorted(self._histograms.items())
+            ]
+
+    def dump(self, sink):
+        return sink(self.snapshot())
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+METRICS = QueryMetrics(SLOW_QUERY_SECONDS)
+
+
+class QueryScope():
+    # one repository read: the connection checkout, the cursor executions
+    # and the DataFrame built from them
+    repository = None
+    operation = None
+
+    def __init__(self, repository, operation):
+        self.repository = repository
+        self.operation = operation
+        self.pool_wait = 0
+        self.execute = 0
+
+    @contextmanager
+    def active(self):
+        # only around the scope's own database work, never across a yield
+        token = _scope.set(self)
+
+        try:
+            yield self
+        finally:
+            _scope.reset(token)
+
+    @contextmanager
+    def connect(self, engine):
+        start = perf_counter()
+        connection = engine.connect()
+        self.pool_wait += perf_counter() - start
+
+        with connection:
+            yield connection
+
+    def observe(self, seconds, df):
+        for metric, value in [
+            ('query_seconds', seconds),
+            ('pool_wait_seconds', self.pool_wait),
+            ('frame_seconds', max(0, seconds - self.pool_wait - self.execute)),
+            ('rows', len(df)),
+            ('bytes', frame_bytes(df)),
+        ]:
+            METRICS.observe(self.repository, self.operation, metric, value)
+
+        self.pool_wait = 0
+        self.execute = 0
+
+
+def query_scope(repository):
+    current = _operation.get()
+    name = current[1] if current is not None and current[0] is repository else 'query'
+
+    return QueryScope(type(repository).__name__, name)
+
+
+@contextmanager
+def operation(repository, name):
+    # the outermost finder of the repository names its reads, so find_pages
+    # and find_page calls made by find_pages are told apart
+    current = _operation.get()
+
+    if current is not None and current[0] is repository:
+        yield
+        return
+
+    token = _operation.set((repository, name))
+
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+def query_operation(function):
+    # names the reads of a repository finder after it. Generators are only
+    # in the operation while producing an item, never across a yield
+    name = function.__name__
+
+    if inspect.isasyncgenfunction(function):
+        @wraps(function)
+        async def async_generator(self, *args, **kwargs):
+            iterator = function(self, *args, **kwargs)
+
+            try:
+                while True:
+                    with operation(self, name):
+                        try:
+                            item = await iterator.__anext__()
+                        except StopAsyncIteration:
+                            return
+
+                    yield item
+            finally:
+                await iterator.aclose()
+
+        return async_generator
+
+    if inspect.iscoroutinefunction(function):
+        @wraps(function)
+        async def coroutine(self, *args, **kwargs):
+            with operation(self, name):
+                return await function(self, *args, **kwargs)
+
+        return coroutine
+
+    if inspect.isgeneratorfunction(function):
+        @wraps(function)
+        def generator(self, *args, **kwargs):
+            iterator = function(self, *args, **kwargs)
+
+            try:
+                while True:
+                    with operation(self, name):
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            return
+
+                    yield item
+            finally:
+                iterator.close()
+
+        return generator
+
+    @wraps(function)
+    def wrapper(self, *args, **kwargs):
+        with operation(self, name):
+            return function(self, *args, **kwargs)
+
+    return wrapper
+
+
+def frame_bytes(df, sample_size=1000):
+    # deep memory usage of a sample, scaled: strings and bytes are counted
+    # without walking every object of a large frame
+    if df.empty:
+        return 0
+
+    sample = df.iloc[:sample_size]
+
+    return int(sample.memory_usage(index=False, deep=True).sum() * len(df) / len(sample))
+
+
+def instrument_engine(engine, metrics=METRICS):
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault('query_start', []).append(perf_counter())
+
+    @event.listens_for(engine, 'handle_error')
+    def handle_error(context):
+        # a failed execution never reaches after_cursor_execute
+        connection = context.connection
+
+        if connection is not None and connection.info.get('query_start'):
+            connection.info['query_start'].pop()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        seconds = perf_counter() - connection.info['query_start'].pop()
+        scope = _scope.get()
+
+        if scope is not None:
+            scope.execute += seconds
+            metrics.observe(scope.repository, scope.operation, 'execute_seconds', seconds)
+        else:
+            metrics.observe('engine', 'execute', 'execute_seconds', seconds)
+
+        if metrics.slow_query_seconds is not None and seconds >= metrics.slow_query_seconds:
+            log_slow_query(cursor, statement, parameters, seconds, scope)
+
+    return engine
+
+
+def log_slow_query(cursor, statement, parameters, seconds, scope=None):
+    # server-side cursors only declare the query here, streamed reads are
+    # timed per chunk by the repositories instead
+    try:
+        explain = cursor.connection.cursor()
+        explain.execute('EXPLAIN ' + statement, parameters)
+        plan = '\n'.join(str(row[0]) for row in explain.fetchall())
+        explain.close()
+    except Exception as error:
+        plan = f'EXPLAIN failed: {error}'
+
+    source = 'engine' if scope is None else f'{scope.repository}.{scope.operation}'
+
+    logger.warning('slow query, %s, %.3fs\n%s\n%s', source, seconds, statement, plan)
+
+
+def prometheus_text(snapshot):
+    lines = []
+    metrics = sorted({row['metric'] for row in snapshot})
+
+    for metric in metrics:
+        name = f'repository_{metric}'
+        lines.append(f'# TYPE {name} histogram')
+
+        for row in snapshot:
+            if row['metric'] != metric:
+                continue
+
+            labels = f'repository="{row["repository"]}",operation="{row["operation"]}"'
+
+            for bound, count in row['buckets'].items():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {row["count"]}')
+            lines.append(f'{name}_sum{{{labels}}} {row["sum"]}')
+            lines.append(f'{name}_count{{{labels}}} {row["count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def json_text(snapshot):
+    return json.dumps([
+        {**row, 'buckets': {str(bound): count for bound, count in row['buckets'].items()}}
+        for row in snapshot
+    ])
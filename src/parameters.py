@@ -1,3 +1,29 @@
 DB_URL = {
-    "dev": "postgresql://postgres:@localhost/cardano_mainnet",
+    "dev": "postgresql+psycopg2://postgres:@localhost/cardano_mainnet",
 }
+
+DB_POOL = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+CHUNK_SIZE = 50000
+PAGE_SIZE = 10000
+LOOKUP_SIZE = 5000
+COPY_BLOCK_SIZE = 16 << 20
+
+CACHE_PATH = '.cache'
+ROLLBACK_WINDOW = 2160
+FOLLOW_BATCH_SIZE = 100
+ROLLUP_PATH = '.rollup'
+OPTIMAL_POOL_COUNT = 500
+TOKEN_PATH = '.token'
+TOKEN_BATCH_SIZE = 100000
+SLOW_QUERY_SECONDS = None
+POOL_REGISTRY_PATH = '.pool_registry'
+RESOLVER_CAPACITY = 1000000
+RESOLVER_BATCH_SIZE = 100000
+SCRIPT_COST_PATH = '.script_cost'
+SCRIPT_COST_BATCH_SIZE = 10000
@@ -0,0 +1,216 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from src.connector.db_connector import db_connect
+from src.connector.db_reader import read_frame
+from src.entity.cardano import Block, PoolMetadataRef, PoolOfflineDatum, PoolOwner, PoolRelay, PoolRetire, \
+    PoolUpdate, Tx
+from src.metrics.query_metrics import query_operation
+from src.parameters import DB_URL, POOL_REGISTRY_PATH
+
+SNAPSHOT_COLUMNS = [
+    'epoch_no', 'pool_id', 'update_id', 'pledge', 'margin', 'fixed_cost', 'reward_addr', 'vrf_key_hash',
+    'active_epoch_no', 'registered_tx_id', 'owners', 'relays', 'meta_url', 'meta_hash', 'ticker_name',
+    'status', 'retiring_epoch',
+]
+
+
+class PoolRegistry():
+    # Point in time pool parameters: for every epoch the registration in
+    # effect per pool with its owners, relays and metadata, and whether the
+    # pool is registered, retiring or retired. The pool tables are small, so
+    # they are read once and every missing epoch is built from them in one
+    # pass. Closed epochs are kept as one Parquet file each, the open epoch
+    # is built on request.
+    engine = None
+    path = None
+
+    def __init__(self, url=DB_URL['dev'], path=POOL_REGISTRY_PATH):
+        self.engine = db_connect(url)
+        self.path = path
+
+    @query_operation
+    def find_epoch(self, epoch):
+        # every pool known in the epoch, one file read for closed epochs
+        if os.path.exists(self._path(epoch)):
+            return pd.read_parquet(self._path(epoch))
+
+        return self.snapshots([epoch])[epoch]
+
+    def find_pools(self, epoch, pool_ids):
+        snapshot = self.find_epoch(epoch)
+
+        return snapshot[snapshot['pool_id'].isin(pool_ids)].reset_index(drop=True)
+
+    @query_operation
+    def refresh(self):
+        with Session(self.engine) as session:
+            tip_epoch = session.query(func.max(Block.epoch_no)).scalar()
+
+        if tip_epoch is None:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+
+        missing = [epoch for epoch in range(0, tip_epoch) if not os.path.exists(self._path(epoch))]
+
+        for epoch, snapshot in self.snapshots(missing).items():
+            snapshot.to_parquet(self._path(epoch) + '.tmp', index=False)
+            os.replace(self._path(epoch) + '.tmp', self._path(epoch))
+
+    @query_operation
+    def snapshots(self, epochs):
+        if not epochs:
+            return {}
+
+        updates = self._updates()
+        retires = self._retires()
+        owners = self._owners()
+        relays = self._relays()
+        metadata = self._metadata()
+
+        return {
+            epoch: self._snapshot(epoch, updates, retires, owners, relays, metadata)
+            for epoch in epochs
+        }
+
+    def _snapshot(self, epoch, updates, retires, owners, relays, metadata):
+        # the latest certificate per pool that is active in the epoch
+        active = updates[updates['active_epoch_no'] <= epoch] \
+            .drop_duplicates('hash_id', keep='last') \
+            .rename(columns={'id': 'update_id', 'hash_id': 'pool_id'})
+
+        # a registration made after a retirement was announced cancels it,
+        # even before the new parameters are active
+        registered = updates[updates['registered_epoch_no'] <= epoch] \
+            .drop_duplicates('hash_id', keep='last') \
+            .set_index('hash_id')['registered_tx_id']
+
+        retiring = retires[retires['announced_epoch_no'] <= epoch] \
+            .drop_duplicates('hash_id', keep='last') \
+            .set_index('hash_id')
+
+        retiring = retiring[
+            retiring['announced_tx_id'].to_numpy() >
+            registered.reindex(retiring.index).fillna(0).to_numpy()
+        ]['retiring_epoch']
+
+        snapshot = active \
+            .merge(owners, on=['pool_id', 'registered_tx_id'], how='left') \
+            .merge(relays, on='update_id', how='left') \
+            .merge(metadata, on='meta_id', how='left')
+
+        # Int64 whatever dtype the retirements were read with, an empty
+        # pool_retire reads as object columns
+        retiring_epoch = retiring.reindex(snapshot['pool_id']).astype('Int64').reset_index(drop=True)
+
+        snapshot['retiring_epoch'] = retiring_epoch
+        snapshot['status'] = np.where(
+            retiring_epoch.isna(), 'registered',
+            np.where((retiring_epoch <= epoch).fillna(False), 'retired', 'retiring')
+        )
+        snapshot['epoch_no'] = epoch
+
+        # pools without owners or relays get empty lists, not NaN
+        for name in ['owners', 'relays']:
+            snapshot[name] = [value if isinstance(value, list) else [] for value in snapshot[name]]
+
+        return snapshot[SNAPSHOT_COLUMNS].sort_values('pool_id', ignore_index=True)
+
+    def _updates(self):
+        sql = Session(bind=self.engine).query(
+            PoolUpdate.id,
+            PoolUpdate.hash_id,
+            PoolUpdate.pledge,
+            PoolUpdate.margin,
+            PoolUpdate.fixed_cost,
+            PoolUpdate.reward_addr,
+            PoolUpdate.vrf_key_hash,
+            PoolUpdate.active_epoch_no,
+            PoolUpdate.meta_id,
+            PoolUpdate.registered_tx_id,
+            Block.epoch_no.label('registered_epoch_no'),
+        ).join(Tx, Tx.id == PoolUpdate.registered_tx_id) \
+            .join(Block, Block.id == Tx.block_id) \
+            .order_by(PoolUpdate.registered_tx_id.asc(), PoolUpdate.cert_index.asc()) \
+            .statement
+
+        return self._read(sql, ['pledge', 'fixed_cost'])
+
+    def _retires(self):
+        sql = Session(bind=self.engine).query(
+            PoolRetire.hash_id,
+            PoolRetire.announced_tx_id,
+            PoolRetire.retiring_epoch,
+            Block.epoch_no.label('announced_epoch_no'),
+        ).join(Tx, Tx.id == PoolRetire.announced_tx_id) \
+            .join(Block, Block.id == Tx.block_id) \
+            .order_by(PoolRetire.announced_tx_id.asc(), PoolRetire.cert_index.asc()) \
+            .statement
+
+        return self._read(sql)
+
+    def _owners(self):
+        # owners belong to the registration certificate of their pool in
+        # their tx, a tx can register several pools
+        sql = Session(bind=self.engine) \
+            .query(PoolOwner.pool_hash_id.label('pool_id'), PoolOwner.registered_tx_id, PoolOwner.addr_id) \
+            .order_by(PoolOwner.registered_tx_id.asc(), PoolOwner.pool_hash_id.asc(), PoolOwner.addr_id.asc()) \
+            .statement
+
+        return self._read(sql) \
+            .groupby(['pool_id', 'registered_tx_id'])['addr_id'] \
+            .agg(list) \
+            .rename('owners') \
+            .reset_index()
+
+    def _relays(self):
+        sql = Session(bind=self.engine) \
+            .query(PoolRelay.update_id, PoolRelay.ipv4, PoolRelay.ipv6, PoolRelay.dns_name,
+                   PoolRelay.dns_srv_name, PoolRelay.port) \
+            .order_by(PoolRelay.id.asc()) \
+            .statement
+
+        relays = self._read(sql)
+        hosts = relays['dns_name'] \
+            .fillna(relays['dns_srv_name']) \
+            .fillna(relays['ipv4']) \
+            .fillna(relays['ipv6'])
+
+        relays['relay'] = [
+            host if pd.isna(port) else f'{host}:{int(port)}'
+            for host, port in zip(hosts, relays['port'])
+        ]
+
+        return relays \
+            .groupby('update_id')['relay'] \
+            .agg(list) \
+            .rename('relays') \
+            .reset_index()
+
+    def _metadata(self):
+        # the metadata reference of a registration and the latest offline
+        # data fetched for it
+        references = Session(bind=self.engine) \
+            .query(PoolMetadataRef.id.label('meta_id'), PoolMetadataRef.url.label('meta_url'),
+                   PoolMetadataRef.hash.label('meta_hash')) \
+            .statement
+
+        offline = Session(bind=self.engine) \
+            .query(PoolOfflineDatum.pmr_id.label('meta_id'), PoolOfflineDatum.ticker_name) \
+            .order_by(PoolOfflineDatum.id.asc()) \
+            .statement
+
+        tickers = self._read(offline).drop_duplicates('meta_id', keep='last')
+
+        return self._read(references).merge(tickers, on='meta_id', how='left')
+
+    def _read(self, sql, numeric=()):
+        return read_frame(self, self.engine, sql, numeric)
+
+    def _path(self, epoch):
+        return os.path.join(self.path, f'epoch={epoch}.parquet')
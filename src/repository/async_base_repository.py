@@ -0,0 +1,176 @@
+import asyncio
+
+from decimal import Decimal
+from time import perf_counter
+
+import pandas as pd
+
+from src.connector.async_db_connector import async_db_connect
+from src.connector.lovelace import lovelace_decimal
+from src.entity.dtypes import numeric_columns
+from src.metrics.query_metrics import query_operation, query_scope
+from src.parameters import DB_URL, CHUNK_SIZE, LOOKUP_SIZE, PAGE_SIZE
+from src.repository.base_repository import BaseRepository
+
+
+class AsyncBaseRepository(BaseRepository):
+    # asyncio counterpart of BaseRepository, sharing its statements. Combine
+    # with a repository to reuse its entity and joins, e.g.
+    # class AsyncTxOutRepository(AsyncBaseRepository, TxOutRepository)
+    # Every public finder is overridden as a coroutine (an async generator
+    # for the chunked and paged ones) with the sync signature. asyncpg
+    # decodes Numeric to Decimal, lovelace mode converts whole amounts to
+    # int afterwards.
+    url = None
+
+    def __init__(self, url=DB_URL['dev']):
+        self.url = url
+        self._engine = None
+
+    @property
+    def engine(self):
+        # the engine of the running event loop, unless one was set
+        return self._engine if self._engine is not None else async_db_connect(self.url)
+
+    @engine.setter
+    def engine(self, engine):
+        self._engine = engine
+
+    @query_operation
+    async def find_all(self, columns=None, lovelace=False):
+        sql = self._find_all_statement(columns)
+
+        return await self._read_sql(sql, columns, lovelace)
+
+    @query_operation
+    async def find_all_chunked(self, chunk_size=CHUNK_SIZE, columns=None, lovelace=False):
+        sql = self._find_all_statement(columns)
+        scope = query_scope(self)
+        start = perf_counter()
+
+        # stream() reads through a server-side cursor. The scope is active
+        # around each fetch only, never across the yield
+        async with self.engine.connect() as connection:
+            scope.pool_wait += perf_counter() - start
+
+            with scope.active():
+                result = await connection.stream(sql)
+
+            partitions = result.partitions(chunk_size)
+
+            while True:
+                with scope.active():
+                    rows = await anext(partitions, None)
+
+                if rows is None:
+                    return
+
+                df = self._frame(rows, result.keys(), columns, lovelace)
+                scope.observe(perf_counter() - start, df)
+
+                yield df
+
+                start = perf_counter()
+
+    @query_operation
+    async def find_page(self, last_id=None, limit=PAGE_SIZE, columns=None, lovelace=False, **ranges):
+        sql = self._page_statement(last_id, limit, columns, ranges)
+
+        return await self._read_sql(sql, columns, lovelace)
+
+    @query_operation
+    async def find_pages(self, last_id=None, limit=PAGE_SIZE, columns=None, lovelace=False, **ranges):
+        # the id column is needed to seek to the next page
+        if columns is not None and 'id' not in columns:
+            columns = ['id', *columns]
+
+        while True:
+            df = await self.find_page(last_id=last_id, limit=limit, columns=columns, lovelace=lovelace, **ranges)
+
+            if df.empty:
+                return
+
+            yield df
+
+            if len(df) < limit:
+                return
+
+            last_id = int(df['id'].iloc[-1])
+
+    @query_operation
+    async def find_by_ids(self, ids, columns=None, lovelace=False):
+        return await self.find_by_keys('id', ids, columns, lovelace)
+
+    @query_operation
+    async def find_by_keys(self, names, keys, columns=None, lovelace=False, chunk_size=LOOKUP_SIZE):
+        # chunks run concurrently, bounded by the connection pool
+        frames = await asyncio.gather(*[
+            self._read_sql(sql, columns, lovelace)
+            for sql in self._keys_statements(names, keys, columns, chunk_size)
+        ])
+
+        if not frames:
+            return self.empty_frame(columns)
+
+        return pd.concat(frames, ignore_index=True)
+
+    @query_operation
+    async def find_by_values(self, name, values, columns=None, lovelace=False, chunk_size=LOOKUP_SIZE):
+        def statement(chunk):
+            return self._values_statement(name, chunk, columns)
+
+        return await self._read_chunks(statement, values, columns, lovelace, chunk_size)
+
+    @query_operation
+    async def find_epoch(self, epoch, columns=None, lovelace=False):
+        if columns is not None and 'id' not in columns:
+            columns = ['id', *columns]
+
+        return await self._read_sql(self._epoch_statement(epoch, columns), columns, lovelace)
+
+    @query_operation
+    async def find_aggregate(self, aggregates, group_by=(), bucket=None, lovelace=False, **ranges):
+        sql = self._aggregate_statement(aggregates, group_by, bucket, ranges)
+
+        return await self._read_sql(sql, self._aggregate_columns(aggregates, group_by, bucket), lovelace)
+
+    async def _read_sql(self, sql, columns=None, lovelace=False):
+        scope = query_scope(self)
+        start = perf_counter()
+
+        with scope.active():
+            async with self.engine.connect() as connection:
+                scope.pool_wait += perf_counter() - start
+                result = await connection.execute(sql)
+                df = self._frame(result.fetchall(), result.keys(), columns, lovelace)
+
+        scope.observe(perf_counter() - start, df)
+
+        return df
+
+    async def _read_chunks(self, statement, values, columns=None, lovelace=False, chunk_size=LOOKUP_SIZE):
+        values = list(dict.fromkeys(values))
+
+        frames = await asyncio.gather(*[
+            self._read_sql(statement(values[start:start + chunk_size]), columns, lovelace)
+            for start in range(0, len(values), chunk_size)
+        ])
+
+        if not frames:
+            return self.empty_frame(columns)
+
+        return pd.concat(frames, ignore_index=True)
+
+    def _frame(self, rows, keys, columns=None, lovelace=False):
+        # like the sync reads, Decimal amounts become floats unless in
+        # lovelace mode
+        df = pd.DataFrame.from_records(rows, columns=list(keys), coerce_float=not lovelace)
+
+        if lovelace:
+            for name in numeric_columns(self.table_columns(columns)):
+                df[name] = [
+                    lovelace_decimal(value) if isinstance(value, Decimal) else pd.NA if value is None else value
+                    for value in df[name]
+                ]
+
+        return self._lovelace(df.astype(self._dtypes(columns)), columns, lovelace)
@@ -0,0 +1,21 @@
+from src.repository.async_base_repository import AsyncBaseRepository
+from src.repository.block_repository import BlockRepository
+from src.repository.ma_tx_out_repository import MaTxOutRepository
+from src.repository.tx_out_repository import TxOutRepository
+from src.repository.tx_repository import TxRepository
+
+
+class AsyncBlockRepository(AsyncBaseRepository, BlockRepository):
+    pass
+
+
+class AsyncTxRepository(AsyncBaseRepository, TxRepository):
+    pass
+
+
+class AsyncTxOutRepository(AsyncBaseRepository, TxOutRepository):
+    pass
+
+
+class AsyncMaTxOutRepository(AsyncBaseRepository, MaTxOutRepository):
+    pass
@@ -1,26 +1,450 @@
+from contextlib import nullcontext
+from time import perf_counter
+
 import pandas as pd
 
+from sqlalchemy import BigInteger, Column, DateTime, Float, Integer, Numeric, PrimaryKeyConstraint, UniqueConstraint, \
+    and_, any_, cast, column, func, literal, select, values
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
 from src.connector.db_connector import db_connect
+from src.connector.lovelace import lovelace_numeric
+from src.entity.cardano import Block
+from src.entity.dtypes import lovelace_frame, numeric_columns, table_dtypes
+from src.metrics.query_metrics import query_operation, query_scope
+from src.parameters import DB_URL, CHUNK_SIZE, LOOKUP_SIZE, PAGE_SIZE
+
+AGGREGATES = {
+    'sum': func.sum,
+    'count': func.count,
+    'min': func.min,
+    'max': func.max,
+    'avg': func.avg,
+}
+TIME_BUCKETS = ('minute', 'hour', 'day', 'week', 'month', 'quarter', 'year')
 
 
 class BaseRepository():
-    connection = None
+    engine = None
     entity = None
+    cache = None
+
+    def __init__(self, url=DB_URL['dev'], cache_path=None):
+        self.engine = db_connect(url)
+
+        if cache_path is not None:
+            # pyarrow is only imported by repositories that cache
+            from src.cache.chain_cache import ChainCache
+
+            self.cache = ChainCache(self, cache_path)
+
+    @query_operation
+    def find_all(self, columns=None, lovelace=False):
+        if self.cache is not None:
+            return self.cache.find_all(columns, lovelace)
+
+        sql = self._find_all_statement(columns)
+
+        return self._read_sql(sql, columns, lovelace)
+
+    @query_operation
+    def find_all_chunked(self, chunk_size=CHUNK_SIZE, columns=None, lovelace=False):
+        if self.cache is not None:
+            yield from self.cache.find_all_chunked(chunk_size, columns, lovelace)
+            return
+
+        sql = self._find_all_statement(columns)
+        scope = query_scope(self)
+        start = perf_counter()
+
+        # stream_results makes psycopg2 use a named (server-side) cursor,
+        # so only one chunk of rows is held in memory at a time
+        with scope.connect(self.engine) as connection, self._numeric(connection, lovelace):
+            connection = connection.execution_options(
+                stream_results=True,
+                max_row_buffer=chunk_size,
+            )
+
+            with scope.active():
+                chunks = pd.read_sql(
+                    sql=sql,
+                    con=connection,
+                    chunksize=chunk_size,
+                    coerce_float=not lovelace,
+                    dtype=self._dtypes(columns)
+                )
+
+            # each chunk is timed on its own, without the time the caller
+            # spends on the previous one
+            while True:
+                with scope.active():
+                    df = next(chunks, None)
+
+                if df is None:
+                    return
+
+                df = self._lovelace(df, columns, lovelace)
+                scope.observe(perf_counter() - start, df)
+
+                yield df
+
+                start = perf_counter()
+
+    @query_operation
+    def find_page(self, last_id=None, limit=PAGE_SIZE, columns=None, lovelace=False, **ranges):
+        sql = self._page_statement(last_id, limit, columns, ranges)
+
+        return self._read_sql(sql, columns, lovelace)
+
+    @query_operation
+    def find_by_ids(self, ids, columns=None, lovelace=False):
+        return self.find_by_keys('id', ids, columns, lovelace)
+
+    @query_operation
+    def find_by_keys(self, names, keys, columns=None, lovelace=False, chunk_size=LOOKUP_SIZE):
+        # names is a unique column or the columns of a unique constraint,
+        # keys are values or tuples of values. Keys are looked up a chunk at
+        # a time, one query per chunk rather than one per key
+        frames = [
+            self._read_sql(sql, columns, lovelace)
+            for sql in self._keys_statements(names, keys, columns, chunk_size)
+        ]
+
+        if not frames:
+            return self.empty_frame(columns)
+
+        return pd.concat(frames, ignore_index=True)
+
+    @query_operation
+    def find_by_values(self, name, values, columns=None, lovelace=False, chunk_size=LOOKUP_SIZE):
+        # rows whose indexed, not necessarily unique, column is in values
+        def statement(chunk):
+            return self._values_statement(name, chunk, columns)
+
+        return self._read_chunks(statement, values, columns, lovelace, chunk_size)
+
+    def in_array(self, column, values):
+        # = ANY(array) with a single array parameter, served by the index.
+        # column is the name of an indexed column, or a column of a table
+        # joined in
+        if isinstance(column, str):
+            column = self._indexed_column(column)
+
+        return column == any_(literal(list(values), ARRAY(column.type)))
+
+    def with_block(self, query):
+        # subclasses join their way to the block a row was included in
+        raise ValueError(f'{self.entity.__tablename__} rows have no block')
 
-    def __init__(self):
-        self.connection = db_connect()
+    def with_epoch(self, query):
+        # adds the epoch a row belongs to as an `epoch` column, used to
+        # partition exports
+        return self.with_block(query).add_columns(Block.epoch_no.label('epoch'))
 
-    def find_all(self):
-        session = Session(bind=self.connection)
+    @query_operation
+    def find_epoch(self, epoch, columns=None, lovelace=False):
+        # rows of one epoch as assigned by with_epoch, the filter is pushed
+        # down into the joins
+        if columns is not None and 'id' not in columns:
+            columns = ['id', *columns]
 
-        sql = session.query(self.entity) \
+        return self._read_sql(self._epoch_statement(epoch, columns), columns, lovelace)
+
+    @query_operation
+    def find_pages(self, last_id=None, limit=PAGE_SIZE, columns=None, lovelace=False, **ranges):
+        # the id column is needed to seek to the next page
+        if columns is not None and 'id' not in columns:
+            columns = ['id', *columns]
+
+        while True:
+            df = self.find_page(last_id=last_id, limit=limit, columns=columns, lovelace=lovelace, **ranges)
+
+            if df.empty:
+                return
+
+            yield df
+
+            if len(df) < limit:
+                return
+
+            last_id = int(df['id'].iloc[-1])
+
+    @query_operation
+    def find_aggregate(self, aggregates, group_by=(), bucket=None, lovelace=False, **ranges):
+        # GROUP BY run in Postgres, only the groups are read back.
+        # aggregates are name=(function, column) with a function of
+        # AGGREGATES, or name=('percentile', column, fraction). group_by are
+        # table columns, bucket adds a leading group: 'epoch' as assigned by
+        # with_epoch, or a TIME_BUCKETS unit the block time is truncated to,
+        # as a `time` column. ranges are column=(start, end) filters as in
+        # find_page, epoch and time included
+        sql = self._aggregate_statement(aggregates, group_by, bucket, ranges)
+
+        return self._read_sql(sql, self._aggregate_columns(aggregates, group_by, bucket), lovelace)
+
+    def _read_sql(self, sql, columns=None, lovelace=False):
+        scope = query_scope(self)
+        start = perf_counter()
+
+        with scope.active(), scope.connect(self.engine) as connection, self._numeric(connection, lovelace):
+            df = pd.read_sql(
+                sql=sql,
+                con=connection,
+                coerce_float=not lovelace,
+                dtype=self._dtypes(columns)
+            )
+
+        df = self._lovelace(df, columns, lovelace)
+        scope.observe(perf_counter() - start, df)
+
+        return df
+
+    def _numeric(self, connection, lovelace):
+        # lovelace mode decodes Numeric amounts straight to int instead of
+        # Decimal, so they end up as int64 columns
+        return lovelace_numeric(connection) if lovelace else nullcontext()
+
+    def _lovelace(self, df, columns, lovelace):
+        if not lovelace:
+            return df
+
+        return lovelace_frame(df, numeric_columns(self.table_columns(columns)))
+
+    def _page_statement(self, last_id, limit, columns, ranges):
+        # keyset pagination: seek past last_id on the primary key instead of
+        # OFFSET, so every page costs the same regardless of its depth.
+        # ranges are column=(start, end) filters, start inclusive, end
+        # exclusive, either bound may be None
+        query = self._query(columns)
+
+        if last_id is not None:
+            query = query.filter(self.entity.id > last_id)
+
+        for name, (start, end) in ranges.items():
+            column = self._indexed_column(name)
+
+            if start is not None:
+                query = query.filter(column >= start)
+            if end is not None:
+                query = query.filter(column < end)
+
+        return query \
             .order_by(self.entity.id.asc()) \
+            .limit(limit) \
             .statement
 
-        df = pd.read_sql(
-            sql=sql,
-            con=self.connection
-        )
+    def _values_statement(self, name, values, columns=None):
+        return self._query(columns).filter(self.in_array(name, values)).statement
 
-        return df
+    def _epoch_statement(self, epoch, columns=None):
+        query = self.with_epoch(self._query(columns)).subquery()
+        names = [table_column.name for table_column in self.table_columns(columns)]
+
+        return select(*[query.columns[name] for name in names]) \
+            .where(query.columns.epoch == epoch) \
+            .order_by(query.columns.id.asc())
+
+    def _aggregate_columns(self, aggregates, group_by, bucket):
+        return [
+            *self._bucket_columns(bucket),
+            *self.table_columns(group_by),
+            *[self._aggregate_column(name, aggregate) for name, aggregate in aggregates.items()],
+        ]
+
+    def _aggregate_statement(self, aggregates, group_by, bucket, ranges):
+        if bucket is not None and bucket != 'epoch' and bucket not in TIME_BUCKETS:
+            raise ValueError(f'unknown bucket {bucket}')
+
+        epoch = bucket == 'epoch' or 'epoch' in ranges
+        time = bucket in TIME_BUCKETS or 'time' in ranges
+
+        # epoch and time come from the block unless the table has them
+        block_names = [name for name in ('epoch', 'time') if name not in self.entity.__table__.columns]
+        names = [*group_by, *[aggregate[1] for aggregate in aggregates.values()], *ranges, *(['time'] if time else [])]
+        names = [name for name in dict.fromkeys(names) if name not in block_names]
+
+        # the rows are selected and joined to their block in a subquery,
+        # Postgres pushes the filters down into it
+        query = self._with_block_columns(self._query(names), epoch, time).subquery()
+
+        groups = [query.columns[name] for name in group_by]
+
+        if bucket == 'epoch':
+            groups.insert(0, query.columns.epoch)
+        elif bucket is not None:
+            groups.insert(0, func.date_trunc(bucket, query.columns.time).label('time'))
+
+        sql = select(*groups, *[
+            self._aggregate(query, aggregate).label(name)
+            for name, aggregate in aggregates.items()
+        ])
+
+        for name, (start, end) in ranges.items():
+            if start is not None:
+                sql = sql.where(query.columns[name] >= start)
+            if end is not None:
+                sql = sql.where(query.columns[name] < end)
+
+        return sql \
+            .group_by(*groups) \
+            .order_by(*groups)
+
+    def _with_block_columns(self, query, epoch, time):
+        if time and 'time' not in self.entity.__table__.columns:
+            query = self.with_block(query).add_columns(Block.time.label('time'))
+
+            # the default with_epoch would join the block a second time
+            if epoch and type(self).with_epoch is BaseRepository.with_epoch:
+                return query.add_columns(Block.epoch_no.label('epoch'))
+
+        if epoch:
+            query = self.with_epoch(query)
+
+        return query
+
+    def _aggregate(self, query, aggregate):
+        function, name = aggregate[0], aggregate[1]
+
+        if function == 'percentile':
+            return func.percentile_cont(aggregate[2]).within_group(query.columns[name])
+
+        if function not in AGGREGATES:
+            raise ValueError(f'unknown aggregate {function}')
+
+        if function == 'avg':
+            return cast(func.avg(query.columns[name]), Float)
+
+        return AGGREGATES[function](query.columns[name])
+
+    def _aggregate_column(self, name, aggregate):
+        # result column types, for dtypes and lovelace decoding: sums of
+        # bigint and numeric columns are numeric in Postgres
+        function = aggregate[0]
+        column_type = self._column_type(aggregate[1])
+
+        if function == 'count':
+            return Column(name, BigInteger, nullable=False)
+        if function in ('avg', 'percentile') or isinstance(column_type, Float):
+            return Column(name, Float)
+        if function == 'sum' and isinstance(column_type, (BigInteger, Numeric)):
+            return Column(name, Numeric)
+        if function == 'sum':
+            return Column(name, BigInteger)
+
+        return Column(name, column_type)
+
+    def _bucket_columns(self, bucket):
+        if bucket == 'epoch':
+            return [Column('epoch', Integer)]
+        if bucket is not None:
+            return [Column('time', DateTime)]
+
+        return []
+
+    def _column_type(self, name):
+        if name == 'epoch':
+            return Integer()
+        if name == 'time':
+            return DateTime()
+
+        return self.entity.__table__.columns[name].type
+
+    def _read_chunks(self, statement, values, columns=None, lovelace=False, chunk_size=LOOKUP_SIZE):
+        values = list(dict.fromkeys(values))
+
+        frames = [
+            self._read_sql(statement(values[start:start + chunk_size]), columns, lovelace)
+            for start in range(0, len(values), chunk_size)
+        ]
+
+        if not frames:
+            return self.empty_frame(columns)
+
+        return pd.concat(frames, ignore_index=True)
+
+    def _keys_statements(self, names, keys, columns=None, chunk_size=LOOKUP_SIZE):
+        keys = list(dict.fromkeys(keys))
+
+        for start in range(0, len(keys), chunk_size):
+            yield self._keys_statement(names, keys[start:start + chunk_size], columns)
+
+    def _keys_statement(self, names, keys, columns=None):
+        names = self._unique_key(names)
+        query = self._query(columns)
+
+        if len(names) == 1:
+            return query \
+                .filter(self.in_array(names[0], keys)) \
+                .statement
+
+        key_table = values(
+            *[column(name, self.entity.__table__.columns[name].type) for name in names],
+            name='keys'
+        ).data([tuple(key) for key in keys])
+
+        return query \
+            .join(key_table, and_(*[self._column(name) == key_table.columns[name] for name in names])) \
+            .statement
+
+    def _unique_key(self, names):
+        names = (names,) if isinstance(names, str) else tuple(names)
+
+        for constraint in self.entity.__table__.constraints:
+            if not isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)):
+                continue
+
+            if set(constraint.columns.keys()) == set(names):
+                return names
+
+        if len(names) == 1 and self.entity.__table__.columns[names[0]].unique:
+            return names
+
+        raise ValueError(f'{self.entity.__tablename__} has no unique key on {", ".join(names)}')
+
+    def empty_frame(self, columns=None):
+        names = [table_column.name for table_column in self.table_columns(columns)]
+
+        return pd.DataFrame(columns=names).astype(self._dtypes(columns))
+
+    def _query(self, columns=None):
+        session = Session(bind=self.engine)
+
+        if columns is None:
+            return session.query(self.entity)
+
+        return session.query(*[self._column(name) for name in columns])
+
+    def _find_all_statement(self, columns=None):
+        return self._query(columns) \
+            .order_by(self.entity.id.asc()) \
+            .statement
+
+    def _dtypes(self, columns=None):
+        return table_dtypes(self.table_columns(columns))
+
+    def table_columns(self, columns=None):
+        table_columns = self.entity.__table__.columns
+
+        if columns is None:
+            return list(table_columns)
+
+        # Column objects pass through, for statements joining other tables
+        return [
+            name if isinstance(name, Column) else table_columns[name]
+            for name in columns
+        ]
+
+    def _column(self, name):
+        if name not in self.entity.__table__.columns:
+            raise ValueError(f'{self.entity.__tablename__} has no column {name}')
+
+        return getattr(self.entity, name)
+
+    def _indexed_column(self, name):
+        attribute = self._column(name)
+        column = self.entity.__table__.columns[name]
+
+        if not (column.primary_key or column.index or column.unique):
+            raise ValueError(f'{self.entity.__tablename__}.{name} is not indexed')
+
+        return attribute
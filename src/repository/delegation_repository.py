@@ -0,0 +1,22 @@
+from src.entity.cardano import Block, Delegation, Tx
+from src.metrics.query_metrics import query_operation
+from src.parameters import LOOKUP_SIZE
+from src.repository.base_repository import BaseRepository
+
+
+class DelegationRepository(BaseRepository):
+    entity = Delegation
+
+    def with_block(self, query):
+        return query \
+            .join(Tx, Tx.id == Delegation.tx_id) \
+            .join(Block, Block.id == Tx.block_id)
+
+    @query_operation
+    def find_delegations(self, addr_ids, chunk_size=LOOKUP_SIZE):
+        return self.find_by_values(
+            'addr_id',
+            addr_ids,
+            columns=['addr_id', 'pool_hash_id', 'active_epoch_no', 'tx_id', 'cert_index'],
+            chunk_size=chunk_size
+        )
@@ -1,6 +1,32 @@
 from src.entity.cardano import Epoch
+from src.metrics.query_metrics import query_operation
+from src.parameters import DB_URL, ROLLUP_PATH
 from src.repository.base_repository import BaseRepository
+from src.rollup.epoch_rollup import EpochRollup
 
 
 class EpochRepository(BaseRepository):
     entity = Epoch
+    rollup = None
+
+    def __init__(self, url=DB_URL['dev'], cache_path=None, rollup_path=ROLLUP_PATH):
+        super().__init__(url, cache_path)
+
+        self.rollup = EpochRollup(url, rollup_path)
+
+    def with_epoch(self, query):
+        return query.add_columns(Epoch.no.label('epoch'))
+
+    @query_operation
+    def find_rollups(self, epochs=None):
+        # fees, tx and block counts per epoch, read from the rollup store
+        return self.rollup.find_epochs(epochs)
+
+    @query_operation
+    def find_pool_rollups(self, epoch):
+        # blocks, stake, delegators and rewards per pool for one epoch
+        return self.rollup.find_pools(epoch)
+
+    def refresh_rollups(self):
+        # run once per new block or on a schedule, reads never hit the db
+        self.rollup.refresh()
@@ -0,0 +1,35 @@
+from collections import namedtuple
+
+import numpy as np
+
+from src.entity.cardano import EpochStake
+from src.metrics.query_metrics import query_operation
+from src.repository.base_repository import BaseRepository
+
+EpochStakeArrays = namedtuple('EpochStakeArrays', ['addr_ids', 'pool_ids', 'amounts'])
+
+
+class EpochStakeRepository(BaseRepository):
+    entity = EpochStake
+
+    @query_operation
+    def find_epoch_arrays(self, epoch_no):
+        # one epoch as compact arrays: int32 ids and int64 lovelace, built
+        # page by page so no full DataFrame of the epoch is ever held
+        addr_ids, pool_ids, amounts = [], [], []
+
+        pages = self.find_pages(
+            columns=['addr_id', 'pool_id', 'amount'],
+            lovelace=True,
+            epoch_no=(epoch_no, epoch_no + 1)
+        )
+
+        for df in pages:
+            addr_ids.append(df['addr_id'].to_numpy(np.int32))
+            pool_ids.append(df['pool_id'].to_numpy(np.int32))
+            amounts.append(df['amount'].to_numpy(np.int64))
+
+        if not amounts:
+            return EpochStakeArrays(np.empty(0, np.int32), np.empty(0, np.int32), np.empty(0, np.int64))
+
+        return EpochStakeArrays(np.concatenate(addr_ids), np.concatenate(pool_ids), np.concatenate(amounts))
@@ -0,0 +1,11 @@
+from src.entity.cardano import Block, MaTxMint, Tx
+from src.repository.base_repository import BaseRepository
+
+
+class MaTxMintRepository(BaseRepository):
+    entity = MaTxMint
+
+    def with_block(self, query):
+        return query \
+            .join(Tx, Tx.id == MaTxMint.tx_id) \
+            .join(Block, Block.id == Tx.block_id)
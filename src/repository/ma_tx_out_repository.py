@@ -0,0 +1,12 @@
+from src.entity.cardano import Block, MaTxOut, Tx, TxOut
+from src.repository.base_repository import BaseRepository
+
+
+class MaTxOutRepository(BaseRepository):
+    entity = MaTxOut
+
+    def with_block(self, query):
+        return query \
+            .join(TxOut, TxOut.id == MaTxOut.tx_out_id) \
+            .join(Tx, Tx.id == TxOut.tx_id) \
+            .join(Block, Block.id == Tx.block_id)
@@ -0,0 +1,52 @@
+from src.entity.cardano import MultiAsset
+from src.metrics.query_metrics import query_operation
+from src.parameters import DB_URL, TOKEN_PATH
+from src.repository.base_repository import BaseRepository
+from src.token.token_index import TokenIndex
+
+
+class MultiAssetRepository(BaseRepository):
+    entity = MultiAsset
+    index = None
+
+    def __init__(self, url=DB_URL['dev'], cache_path=None, token_path=TOKEN_PATH):
+        super().__init__(url, cache_path)
+
+        self.index = TokenIndex(url, token_path)
+
+    @query_operation
+    def find_by_policy(self, policy, columns=None):
+        # served by the (policy, name) unique index
+        sql = self._query(columns) \
+            .filter(MultiAsset.policy == policy) \
+            .statement
+
+        return self._read_sql(sql, columns)
+
+    @query_operation
+    def find_holders(self, idents, by='address'):
+        # current holders per asset, read from the token index
+        return self.index.find_holders(idents, by)
+
+    @query_operation
+    def find_policy_holders(self, policy, by='address'):
+        # holders of any asset of the policy, e.g. an NFT collection
+        idents = self.find_by_policy(policy, columns=['id'])['id'].tolist()
+
+        return self.index.find_holders(idents, by) \
+            .groupby(by, sort=False, dropna=False) \
+            .agg(quantity=('quantity', 'sum'), utxo_count=('utxo_count', 'sum'), assets=('ident', 'nunique')) \
+            .reset_index() \
+            .sort_values('quantity', ascending=False, ignore_index=True)
+
+    @query_operation
+    def find_mints(self, idents):
+        return self.index.find_mints(idents)
+
+    @query_operation
+    def find_supply(self, idents):
+        return self.index.find_supply(idents)
+
+    def refresh_index(self):
+        # run once per new block or on a schedule, reads never hit the db
+        return self.index.refresh()
@@ -0,0 +1,29 @@
+from src.entity.cardano import PoolHash
+from src.metrics.query_metrics import query_operation
+from src.parameters import DB_URL, POOL_REGISTRY_PATH
+from src.registry.pool_registry import PoolRegistry
+from src.repository.base_repository import BaseRepository
+
+
+class PoolHashRepository(BaseRepository):
+    entity = PoolHash
+    registry = None
+
+    def __init__(self, url=DB_URL['dev'], cache_path=None, registry_path=POOL_REGISTRY_PATH):
+        super().__init__(url, cache_path)
+
+        self.registry = PoolRegistry(url, registry_path)
+
+    @query_operation
+    def find_snapshot(self, epoch, pool_ids=None):
+        # pledge, margin, fixed cost, owners, relays, metadata and
+        # retirement status per pool as in effect in the epoch
+        if pool_ids is None:
+            return self.registry.find_epoch(epoch)
+
+        return self.registry.find_pools(epoch, pool_ids)
+
+    def refresh_registry(self):
+        # builds the closed epochs not stored yet, from one read of the
+        # pool tables
+        self.registry.refresh()
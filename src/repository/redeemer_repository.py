@@ -0,0 +1,33 @@
+from src.entity.cardano import Block, Redeemer, Tx
+from src.metrics.query_metrics import query_operation
+from src.parameters import DB_URL, SCRIPT_COST_PATH
+from src.repository.base_repository import BaseRepository
+from src.rollup.script_cost_rollup import ScriptCostRollup
+
+
+class RedeemerRepository(BaseRepository):
+    entity = Redeemer
+    cost_rollup = None
+
+    def __init__(self, url=DB_URL['dev'], cache_path=None, cost_path=SCRIPT_COST_PATH):
+        super().__init__(url, cache_path)
+
+        self.cost_rollup = ScriptCostRollup(url, cost_path)
+
+    def with_block(self, query):
+        return query \
+            .join(Tx, Tx.id == Redeemer.tx_id) \
+            .join(Block, Block.id == Tx.block_id)
+
+    @query_operation
+    def find_script_costs(self, epochs=None, script_hashes=None):
+        # redeemers and mem, steps and fee percentiles per script
+        return self.cost_rollup.find_scripts(epochs, script_hashes)
+
+    @query_operation
+    def find_epoch_costs(self, epochs=None, script_hashes=None):
+        return self.cost_rollup.find_epochs(epochs, script_hashes)
+
+    def refresh_costs(self):
+        # rolls up the redeemers of blocks added since the last refresh
+        return self.cost_rollup.refresh()
@@ -0,0 +1,59 @@
+from sqlalchemy import BigInteger, Column, func
+from sqlalchemy.orm import Session
+from src.entity.cardano import Reward
+from src.metrics.query_metrics import query_operation
+from src.parameters import LOOKUP_SIZE
+from src.repository.base_repository import BaseRepository
+
+
+class RewardRepository(BaseRepository):
+    entity = Reward
+
+    def with_epoch(self, query):
+        return query.add_columns(Reward.earned_epoch.label('epoch'))
+
+    @query_operation
+    def find_earned(self, addr_ids, chunk_size=LOOKUP_SIZE):
+        # rewards summed per address and epoch in Postgres, walking the
+        # (addr_id, type, earned_epoch, pool_id) unique index
+        columns = Reward.__table__.columns
+
+        def statement(chunk):
+            return Session(bind=self.engine).query(
+                Reward.addr_id,
+                Reward.earned_epoch,
+                Reward.spendable_epoch,
+                func.sum(Reward.amount).label('amount'),
+            ).filter(self.in_array('addr_id', chunk)) \
+                .group_by(Reward.addr_id, Reward.earned_epoch, Reward.spendable_epoch) \
+                .statement
+
+        return self._read_chunks(
+            statement,
+            addr_ids,
+            [columns.addr_id, columns.earned_epoch, columns.spendable_epoch, columns.amount],
+            lovelace=True,
+            chunk_size=chunk_size
+        )
+
+    @query_operation
+    def find_pool_earned(self, pool_ids, chunk_size=LOOKUP_SIZE):
+        columns = Reward.__table__.columns
+
+        def statement(chunk):
+            return Session(bind=self.engine).query(
+                Reward.pool_id,
+                Reward.earned_epoch,
+                func.sum(Reward.amount).label('amount'),
+                func.count(Reward.addr_id.distinct()).label('addresses'),
+            ).filter(self.in_array('pool_id', chunk)) \
+                .group_by(Reward.pool_id, Reward.earned_epoch) \
+                .statement
+
+        return self._read_chunks(
+            statement,
+            pool_ids,
+            [columns.pool_id, columns.earned_epoch, columns.amount, Column('addresses', BigInteger, nullable=False)],
+            lovelace=True,
+            chunk_size=chunk_size
+        )
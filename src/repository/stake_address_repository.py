@@ -0,0 +1,44 @@
+from src.entity.cardano import StakeAddres
+from src.metrics.query_metrics import query_operation
+from src.parameters import DB_URL, RESOLVER_CAPACITY
+from src.repository.base_repository import BaseRepository
+from src.resolver.address_resolver import AddressResolver
+
+
+class StakeAddressRepository(BaseRepository):
+    entity = StakeAddres
+    resolver = None
+
+    def __init__(self, url=DB_URL['dev'], cache_path=None, resolver_capacity=RESOLVER_CAPACITY):
+        super().__init__(url, cache_path)
+
+        self.resolver = AddressResolver(url, resolver_capacity)
+
+    @query_operation
+    def find_by_addresses(self, addresses):
+        # payment credential, stake address id, view and hash_raw per
+        # address, one row per address given
+        return self.resolver.resolve(addresses)
+
+    @query_operation
+    def find_stake_keys(self, stake_address_ids):
+        return self.resolver.find_stake_keys(stake_address_ids)
+
+    @query_operation
+    def find_by_views(self, views):
+        return self.resolver.find_stake_address_ids(views=views)
+
+    @query_operation
+    def find_by_hashes(self, hashes):
+        return self.resolver.find_stake_address_ids(hashes=hashes)
+
+    @query_operation
+    def find_addresses(self, stake_address_ids=None, payment_creds=None):
+        return self.resolver.find_addresses(stake_address_ids, payment_creds)
+
+    def warm_resolver(self, outputs=None):
+        # bulk load from the latest outputs before attributing flows
+        self.resolver.warm(outputs)
+
+    def refresh_resolver(self):
+        self.resolver.refresh()
@@ -0,0 +1,11 @@
+from src.entity.cardano import Block, Tx, TxIn
+from src.repository.base_repository import BaseRepository
+
+
+class TxInRepository(BaseRepository):
+    entity = TxIn
+
+    def with_block(self, query):
+        return query \
+            .join(Tx, Tx.id == TxIn.tx_in_id) \
+            .join(Block, Block.id == Tx.block_id)
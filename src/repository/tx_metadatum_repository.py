@@ -0,0 +1,120 @@
+from sqlalchemy import Column, String, cast, func, text, tuple_
+from sqlalchemy.dialects.postgresql import JSONPATH
+from sqlalchemy.orm import Session
+from src.entity.cardano import Block, Tx, TxMetadatum
+from src.metrics.query_metrics import query_operation
+from src.parameters import PAGE_SIZE
+from src.repository.base_repository import BaseRepository
+
+# bytes holds the raw CBOR and is only read when asked for
+METADATA_COLUMNS = ['id', 'key', 'json', 'tx_id']
+JSON_INDEX = 'tx_metadata_json_path_idx'
+# labels are Numeric up to 2^64 - 1, read as text so they stay exact
+# whether or not amounts are read in lovelace mode
+KEY_COLUMN = Column('key', String)
+
+
+class TxMetadatumRepository(BaseRepository):
+    # Metadata search by label, JSON containment, jsonpath and block range.
+    # Label lookups walk the (key, tx_id) unique index, JSON lookups the GIN
+    # jsonb_path_ops index from create_indexes, which Postgres keeps up to
+    # date as db-sync inserts. Pages are keyset on (tx_id, key).
+    entity = TxMetadatum
+
+    def with_block(self, query):
+        return query \
+            .join(Tx, Tx.id == TxMetadatum.tx_id) \
+            .join(Block, Block.id == Tx.block_id)
+
+    def create_indexes(self):
+        # built concurrently, so db-sync keeps inserting meanwhile
+        sql = text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {JSON_INDEX} ON tx_metadata USING gin (json jsonb_path_ops)')
+
+        with self.engine.connect() as connection:
+            connection.execution_options(isolation_level='AUTOCOMMIT').execute(sql)
+
+    @query_operation
+    def find_metadata(self, key=None, contains=None, path=None, blocks=None, last=None, limit=PAGE_SIZE,
+                      with_bytes=False, lovelace=False):
+        # one page, key is a metadata label (e.g. 721), contains a JSON
+        # document the metadata includes, path a jsonpath that must match,
+        # e.g. '$.*.*.name ? (@ like_regex "^Space")', blocks a [start, end)
+        # block_no range and last the (tx_id, key) of the previous page
+        columns = METADATA_COLUMNS + ['bytes'] if with_bytes else METADATA_COLUMNS
+        columns = [KEY_COLUMN if name == 'key' else name for name in columns]
+        query = self._metadata_query(columns)
+
+        if key is not None:
+            query = query.filter(TxMetadatum.key == key)
+        if contains is not None:
+            query = query.filter(TxMetadatum.json.contains(contains))
+        if path is not None:
+            query = query.filter(TxMetadatum.json.path_exists(cast(path, JSONPATH)))
+
+        if blocks is not None:
+            tx_ids = self._tx_range(*blocks)
+
+            if tx_ids is None:
+                return self._exact_key(self.empty_frame(columns))
+
+            query = query.filter(TxMetadatum.tx_id >= tx_ids[0], TxMetadatum.tx_id < tx_ids[1])
+
+        if last is not None:
+            # with a fixed key the cursor is tx_id alone, as in the index
+            if key is not None:
+                query = query.filter(TxMetadatum.tx_id > last[0])
+            else:
+                query = query.filter(tuple_(TxMetadatum.tx_id, TxMetadatum.key) > tuple_(*last))
+
+        sql = query \
+            .order_by(TxMetadatum.tx_id.asc(), TxMetadatum.key.asc()) \
+            .limit(limit) \
+            .statement
+
+        return self._exact_key(self._read_sql(sql, columns, lovelace))
+
+    @query_operation
+    def find_metadata_pages(self, key=None, contains=None, path=None, blocks=None, limit=PAGE_SIZE,
+                            with_bytes=False, lovelace=False):
+        last = None
+
+        while True:
+            df = self.find_metadata(key, contains, path, blocks, last, limit, with_bytes, lovelace)
+
+            if df.empty:
+                return
+
+            yield df
+
+            if len(df) < limit:
+                return
+
+            last = (int(df['tx_id'].iloc[-1]), int(df['key'].iloc[-1]))
+
+    def _metadata_query(self, columns):
+        return Session(bind=self.engine).query(*[
+            cast(TxMetadatum.key, String).label('key') if name is KEY_COLUMN else self._column(name)
+            for name in columns
+        ])
+
+    def _exact_key(self, df):
+        # uint64 holds every label exactly, unlike the float64 pandas makes
+        # of Numeric
+        df['key'] = df['key'].map(int).astype('uint64')
+
+        return df
+
+    def _tx_range(self, start, end):
+        # the [first, last + 1) tx ids of a block_no range, through the
+        # block_no and tx.block_id indexes
+        with Session(self.engine) as session:
+            first, last = session \
+                .query(func.min(Tx.id), func.max(Tx.id)) \
+                .join(Block, Block.id == Tx.block_id) \
+                .filter(Block.block_no >= start, Block.block_no < end) \
+                .one()
+
+        if first is None:
+            return None
+
+        return first, last + 1
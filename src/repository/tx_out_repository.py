@@ -1,6 +1,17 @@
-from src.entity.cardano import TxOut
+from src.entity.cardano import Block, Tx, TxOut
+from src.metrics.query_metrics import query_operation
 from src.repository.base_repository import BaseRepository
 
 
 class TxOutRepository(BaseRepository):
     entity = TxOut
+
+    def with_block(self, query):
+        return query \
+            .join(Tx, Tx.id == TxOut.tx_id) \
+            .join(Block, Block.id == Tx.block_id)
+
+    @query_operation
+    def find_by_refs(self, refs, columns=None, lovelace=False):
+        # refs are (tx_id, index) pairs
+        return self.find_by_keys(('tx_id', 'index'), refs, columns, lovelace)
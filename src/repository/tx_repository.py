@@ -0,0 +1,14 @@
+from src.entity.cardano import Block, Tx
+from src.metrics.query_metrics import query_operation
+from src.repository.base_repository import BaseRepository
+
+
+class TxRepository(BaseRepository):
+    entity = Tx
+
+    def with_block(self, query):
+        return query.join(Block, Block.id == Tx.block_id)
+
+    @query_operation
+    def find_by_hashes(self, hashes, columns=None, lovelace=False):
+        return self.find_by_keys('hash', hashes, columns, lovelace)
@@ -0,0 +1,123 @@
+import pandas as pd
+
+from sqlalchemy import exists
+from sqlalchemy.orm import Session, aliased
+from src.entity.cardano import Block, MaTxOut, MultiAsset, Tx, TxIn, TxOut, t_utxo_view
+from src.metrics.query_metrics import query_operation
+from src.parameters import LOOKUP_SIZE
+from src.repository.base_repository import BaseRepository
+
+UTXO_COLUMNS = ['id', 'tx_id', 'index', 'address', 'payment_cred', 'stake_address_id', 'value']
+UTXO_KEYS = ['address', 'payment_cred', 'stake_address_id']
+
+
+class UtxoRepository(BaseRepository):
+    # Unspent outputs per address, payment credential or stake address,
+    # either at the tip (through utxo_view) or as of a given block_no
+    entity = TxOut
+
+    @query_operation
+    def find_unspent(self, by, keys, block_no=None, lovelace=False, chunk_size=LOOKUP_SIZE):
+        if by not in UTXO_KEYS:
+            raise ValueError(f'unspent outputs can not be looked up by {by}')
+
+        keys = list(dict.fromkeys(keys))
+        block_id = None if block_no is None else self._block_id(block_no)
+
+        frames = []
+
+        for start in range(0, len(keys), chunk_size):
+            sql = self._unspent_statement(by, keys[start:start + chunk_size], block_id)
+
+            frames.append(self._read_sql(sql, UTXO_COLUMNS, lovelace))
+
+        if not frames:
+            return self.empty_frame(UTXO_COLUMNS)
+
+        return pd.concat(frames, ignore_index=True)
+
+    @query_operation
+    def find_assets(self, tx_out_ids, lovelace=False, chunk_size=LOOKUP_SIZE):
+        ma_tx_out = MaTxOut.__table__.columns
+        multi_asset = MultiAsset.__table__.columns
+        columns = [
+            ma_tx_out.tx_out_id, ma_tx_out.ident, ma_tx_out.quantity,
+            multi_asset.policy, multi_asset.name, multi_asset.fingerprint,
+        ]
+        tx_out_ids = list(dict.fromkeys(tx_out_ids))
+        frames = []
+
+        for start in range(0, len(tx_out_ids), chunk_size):
+            chunk = tx_out_ids[start:start + chunk_size]
+
+            sql = Session(bind=self.engine).query(*columns) \
+                .join(MultiAsset, multi_asset.id == ma_tx_out.ident) \
+                .filter(self.in_array(ma_tx_out.tx_out_id, chunk)) \
+                .statement
+
+            frames.append(self._read_sql(sql, columns, lovelace))
+
+        if not frames:
+            return self.empty_frame(columns)
+
+        return pd.concat(frames, ignore_index=True)
+
+    @query_operation
+    def find_balances(self, by, keys, block_no=None):
+        # lovelace and per asset balances, summed vectorized over int64
+        utxos = self.find_unspent(by, keys, block_no, lovelace=True)
+        assets = self.find_assets(utxos['id'].tolist(), lovelace=True)
+
+        lovelace = utxos \
+            .groupby(by, sort=False)['value'] \
+            .agg(['sum', 'count']) \
+            .rename(columns={'sum': 'value', 'count': 'utxo_count'}) \
+            .reset_index()
+
+        assets = assets \
+            .merge(utxos[['id', by]], left_on='tx_out_id', right_on='id') \
+            .groupby([by, 'ident', 'policy', 'name', 'fingerprint'], sort=False)['quantity'] \
+            .sum() \
+            .reset_index()
+
+        return lovelace, assets
+
+    def _unspent_statement(self, by, keys, block_id=None):
+        session = Session(bind=self.engine)
+
+        if block_id is None:
+            view = t_utxo_view.columns
+
+            return session.query(*[view[name] for name in UTXO_COLUMNS]) \
+                .filter(self.in_array(view[by], keys)) \
+                .statement
+
+        # as of block_id: created at or before it and not spent by then,
+        # the spend check is a lookup on the tx_in (tx_out_id, tx_out_index)
+        # unique index
+        spending_tx = aliased(Tx)
+
+        spent = exists() \
+            .where(TxIn.tx_out_id == TxOut.tx_id) \
+            .where(TxIn.tx_out_index == TxOut.index) \
+            .where(spending_tx.id == TxIn.tx_in_id) \
+            .where(spending_tx.block_id <= block_id)
+
+        return session.query(*[getattr(TxOut, name) for name in UTXO_COLUMNS]) \
+            .join(Tx, Tx.id == TxOut.tx_id) \
+            .filter(self.in_array(by, keys)) \
+            .filter(Tx.block_id <= block_id) \
+            .filter(~spent) \
+            .statement
+
+    def _block_id(self, block_no):
+        with Session(self.engine) as session:
+            block_id = session \
+                .query(Block.id) \
+                .filter(Block.block_no == block_no) \
+                .scalar()
+
+        if block_id is None:
+            raise ValueError(f'no block {block_no}')
+
+        return block_id
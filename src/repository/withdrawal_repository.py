@@ -0,0 +1,40 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from src.entity.cardano import Block, Tx, Withdrawal
+from src.metrics.query_metrics import query_operation
+from src.parameters import LOOKUP_SIZE
+from src.repository.base_repository import BaseRepository
+
+
+class WithdrawalRepository(BaseRepository):
+    entity = Withdrawal
+
+    def with_block(self, query):
+        return query \
+            .join(Tx, Tx.id == Withdrawal.tx_id) \
+            .join(Block, Block.id == Tx.block_id)
+
+    @query_operation
+    def find_withdrawn(self, addr_ids, chunk_size=LOOKUP_SIZE):
+        # withdrawals summed per address and the epoch they were made in
+        columns = Withdrawal.__table__.columns
+
+        def statement(chunk):
+            query = Session(bind=self.engine).query(
+                Withdrawal.addr_id,
+                Block.epoch_no,
+                func.sum(Withdrawal.amount).label('amount'),
+            )
+
+            return self.with_block(query) \
+                .filter(self.in_array('addr_id', chunk)) \
+                .group_by(Withdrawal.addr_id, Block.epoch_no) \
+                .statement
+
+        return self._read_chunks(
+            statement,
+            addr_ids,
+            [columns.addr_id, Block.__table__.columns.epoch_no, columns.amount],
+            lovelace=True,
+            chunk_size=chunk_size
+        )
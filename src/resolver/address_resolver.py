@@ -0,0 +1,356 @@
+import numpy as np
+import pandas as pd
+
+from sqlalchemy import any_, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from src.connector.db_connector import db_connect
+from src.connector.db_reader import read_frame
+from src.entity.cardano import StakeAddres, TxOut
+from src.metrics.query_metrics import query_operation
+from src.parameters import DB_URL, LOOKUP_SIZE, RESOLVER_BATCH_SIZE, RESOLVER_CAPACITY
+
+# two independent 64 bit hashes of an address make its 128 bit key
+HASH_KEYS = ('address-key-hi-0', 'address-key-lo-1')
+
+# payment credentials are key or script hashes, stake address hash_raw is
+# a header byte and the hash. numpy drops trailing zero bytes of fixed width
+# bytes, values are padded back to their width when read.
+PAYMENT_CRED_WIDTH = 28
+STAKE_HASH_WIDTH = 29
+
+RESOLVED_COLUMNS = ['address', 'payment_cred', 'stake_address_id', 'view', 'hash_raw']
+
+
+def address_keys(addresses):
+    values = np.asarray(addresses, dtype=object)
+
+    return (
+        pd.util.hash_array(values, hash_key=HASH_KEYS[0]),
+        pd.util.hash_array(values, hash_key=HASH_KEYS[1]),
+    )
+
+
+def padded(values, width):
+    return [value.ljust(width, b'\0') if value else None for value in values]
+
+
+class AddressTable():
+    # Open addressing hash table from 128 bit address keys to the payment
+    # credential and stake address id of the address, every column a fixed
+    # width array, 61 bytes per slot and at least two slots per address.
+    # Lookups stamp the rows they hit. When the table outgrows its capacity
+    # the least recently used rows are dropped, a quarter of the capacity at
+    # once, and the rest is rehashed.
+    capacity = None
+    size = None
+    clock = None
+
+    def __init__(self, capacity=RESOLVER_CAPACITY):
+        self.capacity = capacity
+        self.size = 0
+        self.clock = 0
+
+        self._allocate(1 << int(max(2 * capacity, 1) - 1).bit_length())
+
+    def find(self, hi, lo):
+        # slot per key, -1 where the key is not in the table
+        found = np.full(len(lo), -1, np.int64)
+        pending = np.arange(len(lo))
+        slot = (lo & np.uint64(self.mask)).astype(np.int64)
+
+        while len(pending):
+            used = self.used[slot]
+            hit = used & (self.lo[slot] == lo[pending]) & (self.hi[slot] == hi[pending])
+
+            found[pending[hit]] = slot[hit]
+
+            more = used & ~hit
+            pending = pending[more]
+            slot = (slot[more] + 1) & self.mask
+
+        self.clock += 1
+        self.stamps[found[found >= 0]] = self.clock
+
+        return found
+
+    def insert(self, hi, lo, payment_creds, stake_ids):
+        # keys must be unique and not in the table yet
+        if len(lo) > self.capacity:
+            hi, lo = hi[-self.capacity:], lo[-self.capacity:]
+            payment_creds, stake_ids = payment_creds[-self.capacity:], stake_ids[-self.capacity:]
+
+        if self.size + len(lo) > self.capacity:
+            self._evict(min(self.capacity * 3 // 4, self.capacity - len(lo)))
+
+        self.clock += 1
+        self._place(hi, lo, payment_creds, stake_ids, np.full(len(lo), self.clock, np.int64))
+
+    def payment_creds(self, slots):
+        return padded(self._payment_creds[slots].tolist(), PAYMENT_CRED_WIDTH)
+
+    def stake_ids(self, slots):
+        return self._stake_ids[slots]
+
+    def _evict(self, keep):
+        occupied = np.flatnonzero(self.used)
+        occupied = occupied[np.argsort(self.stamps[occupied], kind='stable')]
+        occupied = occupied[len(occupied) - max(keep, 0):]
+
+        rows = (
+            self.hi[occupied], self.lo[occupied], self._payment_creds[occupied],
+            self._stake_ids[occupied], self.stamps[occupied]
+        )
+
+        self._allocate(len(self.used))
+        self._place(*rows)
+
+    def _place(self, hi, lo, payment_creds, stake_ids, stamps):
+        pending = np.arange(len(lo))
+        slot = (lo & np.uint64(self.mask)).astype(np.int64)
+
+        while len(pending):
+            # one row per free slot, the rows that lost it probe on
+            free = np.flatnonzero(~self.used[slot])
+            _, first = np.unique(slot[free], return_index=True)
+            placed = free[first]
+
+            rows = pending[placed]
+            target = slot[placed]
+
+            self.used[target] = True
+            self.hi[target] = hi[rows]
+            self.lo[target] = lo[rows]
+            self._payment_creds[target] = payment_creds[rows]
+            self._stake_ids[target] = stake_ids[rows]
+            self.stamps[target] = stamps[rows]
+
+            more = np.ones(len(pending), bool)
+            more[placed] = False
+
+            pending = pending[more]
+            slot = (slot[more] + 1) & self.mask
+
+        self.size += len(lo)
+
+    def _allocate(self, slots):
+        self.mask = slots - 1
+        self.size = 0
+        self.used = np.zeros(slots, bool)
+        self.hi = np.zeros(slots, np.uint64)
+        self.lo = np.zeros(slots, np.uint64)
+        self._payment_creds = np.zeros(slots, f'S{PAYMENT_CRED_WIDTH}')
+        self._stake_ids = np.full(slots, -1, np.int64)
+        self.stamps = np.zeros(slots, np.int64)
+
+
+class AddressResolver():
+    # Address to payment credential and stake address, and stake address id
+    # to stake key (view, hash_raw) and back, without a tx_out to
+    # stake_address join per lookup. Stake addresses are kept whole as fixed
+    # width arrays sorted by id. Addresses go through an AddressTable: warm
+    # loads those of the latest outputs, refresh adds those of the outputs
+    # since, and misses are read in one query per batch and cached, so the
+    # long tail cycles through the LRU while hot addresses stay.
+    engine = None
+    batch_size = None
+    tx_out_id = None
+
+    def __init__(self, url=DB_URL['dev'], capacity=RESOLVER_CAPACITY, batch_size=RESOLVER_BATCH_SIZE):
+        self.engine = db_connect(url)
+        self.batch_size = batch_size
+        self.tx_out_id = 0
+        self.addresses = AddressTable(capacity)
+
+        self.stake_address_ids = np.empty(0, np.int64)
+        self.views = np.empty(0, 'S1')
+        self.hashes = np.empty(0, f'S{STAKE_HASH_WIDTH}')
+        self._view_order = np.empty(0, np.int64)
+        self._hash_order = np.empty(0, np.int64)
+
+    def warm(self, outputs=None):
+        # bulk load from the latest outputs, all of them when None
+        tip = self._tip()
+        self.tx_out_id = 0 if outputs is None else max(0, tip - outputs)
+
+        self.refresh(tip)
+
+    @query_operation
+    def refresh(self, tip=None):
+        self._load_stake_addresses()
+
+        tip = self._tip() if tip is None else tip
+
+        # oldest first, so the newest addresses are the last to be evicted
+        for start in range(self.tx_out_id, tip, self.batch_size):
+            self._cache(self._output_addresses(start, min(start + self.batch_size, tip)))
+
+        self.tx_out_id = max(self.tx_out_id, tip)
+
+    @query_operation
+    def resolve(self, addresses):
+        # one row per address given, in order, duplicates included
+        codes, uniques = pd.factorize(np.asarray(addresses, dtype=object))
+        hi, lo = address_keys(uniques)
+
+        slots = self.addresses.find(hi, lo)
+        known = slots >= 0
+
+        # values of hits are taken before caching the misses can evict them
+        stake_ids = np.full(len(uniques), -1, np.int64)
+        stake_ids[known] = self.addresses.stake_ids(slots[known])
+
+        payment_creds = np.full(len(uniques), None, dtype=object)
+        payment_creds[known] = self.addresses.payment_creds(slots[known])
+
+        misses = np.flatnonzero(~known)
+
+        for start in range(0, len(misses), LOOKUP_SIZE):
+            chunk = misses[start:start + LOOKUP_SIZE]
+            found = self._lookup(uniques[chunk].tolist())
+
+            self._cache(found)
+
+            rows = pd.Index(found['address']).get_indexer(uniques[chunk])
+            chunk, rows = chunk[rows >= 0], rows[rows >= 0]
+
+            stake_ids[chunk] = found['stake_address_id'].fillna(-1).to_numpy(np.int64)[rows]
+            payment_creds[chunk] = found['payment_cred'].to_numpy(object)[rows]
+
+        resolved = pd.DataFrame({
+            'address': uniques,
+            'payment_cred': payment_creds,
+            'stake_address_id': pd.array(np.where(stake_ids >= 0, stake_ids, None), dtype='Int64'),
+        }).join(self._stake_keys(stake_ids).drop(columns='stake_address_id'))
+
+        return resolved.iloc[codes].reset_index(drop=True)[RESOLVED_COLUMNS]
+
+    @query_operation
+    def find_stake_keys(self, stake_address_ids):
+        return self._stake_keys(np.asarray(stake_address_ids, dtype=np.int64))
+
+    @query_operation
+    def find_stake_address_ids(self, views=None, hashes=None):
+        # stake address id per view or hash_raw, NA when unknown
+        if views is not None:
+            keys, values, order = np.asarray(views, dtype=object).astype('S'), 'views', '_view_order'
+        else:
+            keys, values, order = np.asarray(hashes, dtype=object).astype(f'S{STAKE_HASH_WIDTH}'), 'hashes', '_hash_order'
+
+        rows = self._search(getattr(self, values), getattr(self, order), keys)
+
+        if (rows < 0).any() and self._load_stake_addresses():
+            rows = self._search(getattr(self, values), getattr(self, order), keys)
+
+        return self._stake_keys(np.where(rows >= 0, self.stake_address_ids[rows], -1))
+
+    @query_operation
+    def find_addresses(self, stake_address_ids=None, payment_creds=None):
+        # the reverse direction lists every address of a stake key or
+        # payment credential, read from the indexed tx_out columns
+        if stake_address_ids is not None:
+            condition = TxOut.stake_address_id == any_(literal(list(stake_address_ids), ARRAY(TxOut.stake_address_id.type)))
+        else:
+            condition = TxOut.payment_cred == any_(literal(list(payment_creds), ARRAY(TxOut.payment_cred.type)))
+
+        sql = Session(bind=self.engine) \
+            .query(TxOut.address, TxOut.payment_cred, TxOut.stake_address_id) \
+            .filter(condition) \
+            .distinct() \
+            .statement
+
+        addresses = self._read(sql)
+        self._cache(addresses)
+
+        return addresses
+
+    def _stake_keys(self, stake_ids):
+        rows = self._search(self.stake_address_ids, None, stake_ids)
+
+        # stake addresses registered since the last load
+        if ((rows < 0) & (stake_ids >= 0)).any() and self._load_stake_addresses():
+            rows = self._search(self.stake_address_ids, None, stake_ids)
+
+        known = rows >= 0
+        views = np.full(len(stake_ids), None, dtype=object)
+        hashes = np.full(len(stake_ids), None, dtype=object)
+
+        views[known] = self.views[rows[known]].astype(str)
+        hashes[known] = padded(self.hashes[rows[known]].tolist(), STAKE_HASH_WIDTH)
+
+        return pd.DataFrame({
+            'stake_address_id': pd.array(np.where(known, stake_ids, None), dtype='Int64'),
+            'view': views,
+            'hash_raw': hashes,
+        })
+
+    def _search(self, values, order, keys):
+        # row of each key in values sorted by order, -1 when missing
+        if not len(values):
+            return np.full(len(keys), -1, np.int64)
+
+        rows = np.searchsorted(values, keys, sorter=order).clip(max=len(values) - 1)
+        rows = rows if order is None else order[rows]
+
+        return np.where(values[rows] == keys, rows, -1)
+
+    def _cache(self, df):
+        if df.empty:
+            return
+
+        hi, lo = address_keys(df['address'].to_numpy(object))
+        new = self.addresses.find(hi, lo) < 0
+
+        payment_creds = np.array([value or b'' for value in df['payment_cred']], dtype=f'S{PAYMENT_CRED_WIDTH}')
+        stake_ids = df['stake_address_id'].fillna(-1).to_numpy(np.int64)
+
+        self.addresses.insert(hi[new], lo[new], payment_creds[new], stake_ids[new])
+
+    def _load_stake_addresses(self):
+        # stake address ids only grow, read the ones added since
+        last_id = int(self.stake_address_ids[-1]) if len(self.stake_address_ids) else 0
+
+        sql = Session(bind=self.engine) \
+            .query(StakeAddres.id, StakeAddres.view, StakeAddres.hash_raw) \
+            .filter(StakeAddres.id > last_id) \
+            .order_by(StakeAddres.id.asc()) \
+            .statement
+
+        df = self._read(sql)
+
+        if df.empty:
+            return False
+
+        self.stake_address_ids = np.concatenate([self.stake_address_ids, df['id'].to_numpy(np.int64)])
+        self.views = np.concatenate([self.views, df['view'].to_numpy(object).astype('S')])
+        self.hashes = np.concatenate([self.hashes, np.array(df['hash_raw'].tolist(), dtype=f'S{STAKE_HASH_WIDTH}')])
+
+        self._view_order = np.argsort(self.views, kind='stable')
+        self._hash_order = np.argsort(self.hashes, kind='stable')
+
+        return True
+
+    def _output_addresses(self, start, end):
+        sql = Session(bind=self.engine) \
+            .query(TxOut.address, TxOut.payment_cred, TxOut.stake_address_id) \
+            .filter(TxOut.id > start, TxOut.id <= end) \
+            .distinct() \
+            .statement
+
+        return self._read(sql)
+
+    def _lookup(self, addresses):
+        sql = Session(bind=self.engine) \
+            .query(TxOut.address, TxOut.payment_cred, TxOut.stake_address_id) \
+            .filter(TxOut.address == any_(literal(addresses, ARRAY(TxOut.address.type)))) \
+            .distinct() \
+            .statement
+
+        return self._read(sql)
+
+    def _tip(self):
+        with self.engine.connect() as connection:
+            return connection.scalar(select(func.max(TxOut.id))) or 0
+
+    def _read(self, sql):
+        return read_frame(self, self.engine, sql)
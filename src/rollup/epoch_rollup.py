@@ -0,0 +1,278 @@
+import json
+import os
+
+import pandas as pd
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from src.connector.db_connector import db_connect
+from src.connector.db_reader import read_frame
+from src.entity.cardano import Block, EpochStake, Reward, SlotLeader, Tx
+from src.metrics.query_metrics import query_operation
+from src.parameters import DB_URL, ROLLBACK_WINDOW, ROLLUP_PATH
+
+EPOCH_COLUMNS = ['epoch_no', 'blk_count', 'tx_count', 'fees', 'out_sum', 'start_time', 'end_time']
+POOL_COLUMNS = ['epoch_no', 'pool_id', 'blk_count', 'stake', 'delegators', 'rewards']
+
+# rewards earned in epoch N are only known at the start of epoch N + 2
+REWARD_DELAY = 2
+
+
+class EpochRollup():
+    # Per epoch and per pool aggregates kept as Parquet files. An epoch is
+    # written once it is closed, its pool file once its rewards are in. Until
+    # then the pool file is provisional and rewritten on every refresh. The
+    # open epoch is kept up to date by aggregating only blocks added since the
+    # last refresh. Only blocks deeper than the rollback window are added
+    # up, the ones above them can still be replaced and are aggregated again
+    # on every refresh. Every aggregation runs as a GROUP BY in Postgres.
+    engine = None
+    path = None
+    rollback_window = None
+
+    def __init__(self, url=DB_URL['dev'], path=ROLLUP_PATH, rollback_window=ROLLBACK_WINDOW):
+        self.engine = db_connect(url)
+        self.path = path
+        self.rollback_window = rollback_window
+
+    def find_epochs(self, epochs=None):
+        frames = [pd.read_parquet(self._path('epoch', epoch)) for epoch in self._stored('epoch', epochs)]
+
+        open_epochs = self._open_epochs()
+
+        if open_epochs is not None:
+            frames.append(open_epochs[open_epochs['epoch_no'].isin(epochs)] if epochs is not None else open_epochs)
+
+        if not frames:
+            return pd.DataFrame(columns=EPOCH_COLUMNS)
+
+        return pd.concat(frames, ignore_index=True).sort_values('epoch_no', ignore_index=True)
+
+    def find_pools(self, epoch):
+        # the last epochs still receive rewards, their provisional files are
+        # as of the last refresh
+        for kind in ('pool', 'provisional'):
+            if os.path.exists(self._path(kind, epoch)):
+                return pd.read_parquet(self._path(kind, epoch))
+
+        return pd.DataFrame(columns=POOL_COLUMNS)
+
+    @query_operation
+    def refresh(self):
+        with Session(self.engine) as session:
+            tip = session \
+                .query(Block.epoch_no, Block.block_no) \
+                .order_by(Block.id.desc()) \
+                .limit(1) \
+                .first()
+
+            if tip is None:
+                return
+
+            tip_epoch, tip_block_no = tip
+
+            # the last block deeper than the rollback window, epochs before
+            # its epoch can no longer change
+            stable = session \
+                .query(Block.id, Block.epoch_no) \
+                .filter(Block.block_no <= tip_block_no - self.rollback_window) \
+                .order_by(Block.id.desc()) \
+                .limit(1) \
+                .first()
+
+        for kind in ('epoch', 'pool', 'provisional'):
+            os.makedirs(os.path.join(self.path, kind), exist_ok=True)
+
+        stable_block_id, stable_epoch = stable if stable is not None else (0, 0)
+
+        stored = set(self._stored('epoch'))
+        pools = set(self._stored('pool'))
+
+        for epoch in range(0, stable_epoch):
+            if epoch not in stored:
+                self._epochs(Block.epoch_no == epoch).to_parquet(self._path('epoch', epoch), index=False)
+
+            if epoch <= tip_epoch - REWARD_DELAY and epoch not in pools:
+                self._pools(epoch).to_parquet(self._path('pool', epoch), index=False)
+                pools.add(epoch)
+
+        # the epochs the loop above leaves open, only these are aggregated
+        # again on every refresh
+        first_open = max(0, min(stable_epoch, tip_epoch - REWARD_DELAY + 1))
+
+        self._refresh_provisional(first_open, tip_epoch)
+        self._refresh_open(stable_epoch, stable_block_id)
+
+    def _refresh_provisional(self, first_open, tip_epoch):
+        # superseded once the epoch's rewards are in
+        for epoch in self._stored('provisional'):
+            if epoch < first_open:
+                os.remove(self._path('provisional', epoch))
+
+        for epoch in range(first_open, tip_epoch + 1):
+            path = self._path('provisional', epoch)
+
+            self._pools(epoch).to_parquet(path + '.tmp', index=False)
+            os.replace(path + '.tmp', path)
+
+    def _refresh_open(self, epoch, stable_block_id):
+        state = self._state()
+        open_epoch = self._open_epoch()
+
+        if state.get('epoch') != epoch or open_epoch is None:
+            if open_epoch is not None:
+                os.remove(self._path('open', state['epoch']))
+
+            state = {'epoch': epoch, 'block_id': 0}
+            open_epoch = None
+
+        delta = self._epochs(
+            Block.epoch_no == epoch,
+            Block.id > state['block_id'],
+            Block.id <= stable_block_id
+        )
+
+        open_epoch = self._merge(open_epoch, delta)
+
+        if open_epoch is not None:
+            open_epoch.to_parquet(self._path('open', epoch), index=False)
+
+        state['block_id'] = max(state['block_id'], stable_block_id)
+
+        with open(os.path.join(self.path, 'open.json'), 'w') as file:
+            json.dump(state, file)
+
+        # blocks inside the rollback window are never added to the state, a
+        # fork replacing them is picked up by the next refresh
+        tail = self._epochs(Block.epoch_no >= epoch, Block.id > state['block_id'])
+
+        frames = [self._merge(open_epoch, tail[tail['epoch_no'] == epoch]), tail[tail['epoch_no'] > epoch]]
+        open_epochs = pd.concat([frame for frame in frames if frame is not None], ignore_index=True)
+        path = os.path.join(self.path, 'tip.parquet')
+
+        open_epochs.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+    def _merge(self, rollup, delta):
+        if delta.empty:
+            return rollup
+        if rollup is None:
+            return delta
+
+        merged = rollup.copy()
+
+        for name in ['blk_count', 'tx_count', 'fees', 'out_sum']:
+            merged[name] = merged[name] + delta[name].values
+
+        merged['start_time'] = min(rollup['start_time'].iloc[0], delta['start_time'].iloc[0])
+        merged['end_time'] = max(rollup['end_time'].iloc[0], delta['end_time'].iloc[0])
+
+        return merged
+
+    def _epochs(self, *filters):
+        # the session only builds the statements
+        with Session(self.engine) as session:
+            blocks = session.query(
+                Block.epoch_no,
+                func.count(Block.id).label('blk_count'),
+                func.sum(Block.tx_count).label('tx_count'),
+                func.min(Block.time).label('start_time'),
+                func.max(Block.time).label('end_time'),
+            ).filter(*filters).group_by(Block.epoch_no).statement
+
+            txs = session.query(
+                Block.epoch_no,
+                func.coalesce(func.sum(Tx.fee), 0).label('fees'),
+                func.coalesce(func.sum(Tx.out_sum), 0).label('out_sum'),
+            ).join(Block, Block.id == Tx.block_id).filter(*filters).group_by(Block.epoch_no).statement
+
+        # nullable ints so blocks without txs do not go through float64
+        txs = self._read(txs, ['fees', 'out_sum']).astype('Int64')
+
+        df = self._read(blocks, ['tx_count']).merge(txs, on='epoch_no', how='left')
+        df[['fees', 'out_sum']] = df[['fees', 'out_sum']].fillna(0).astype('int64')
+
+        return df[EPOCH_COLUMNS]
+
+    def _pools(self, epoch):
+        with Session(self.engine) as session:
+            blocks = session.query(
+                SlotLeader.pool_hash_id.label('pool_id'),
+                func.count(Block.id).label('blk_count'),
+            ).join(SlotLeader, SlotLeader.id == Block.slot_leader_id) \
+                .filter(Block.epoch_no == epoch, SlotLeader.pool_hash_id.isnot(None)) \
+                .group_by(SlotLeader.pool_hash_id) \
+                .statement
+
+            stake = session.query(
+                EpochStake.pool_id,
+                func.sum(EpochStake.amount).label('stake'),
+                func.count(EpochStake.id).label('delegators'),
+            ).filter(EpochStake.epoch_no == epoch).group_by(EpochStake.pool_id).statement
+
+            rewards = session.query(
+                Reward.pool_id,
+                func.sum(Reward.amount).label('rewards'),
+            ).filter(Reward.earned_epoch == epoch, Reward.pool_id.isnot(None)).group_by(Reward.pool_id).statement
+
+        # nullable ints so the outer joins do not go through float64
+        df = self._read(stake, ['stake']).astype('Int64') \
+            .merge(self._read(blocks, []).astype('Int64'), on='pool_id', how='outer') \
+            .merge(self._read(rewards, ['rewards']).astype('Int64'), on='pool_id', how='outer')
+
+        df[['blk_count', 'stake', 'delegators', 'rewards']] = \
+            df[['blk_count', 'stake', 'delegators', 'rewards']].fillna(0).astype('int64')
+        df['epoch_no'] = epoch
+
+        return df[POOL_COLUMNS]
+
+    def _read(self, sql, numeric):
+        return read_frame(self, self.engine, sql, numeric)
+
+    def _open_epoch(self):
+        # the stable part of the open epoch
+        epoch = self._state().get('epoch')
+
+        if epoch is None or not os.path.exists(self._path('open', epoch)):
+            return None
+
+        return pd.read_parquet(self._path('open', epoch))
+
+    def _open_epochs(self):
+        # the open epoch and any after it up to the tip, as of the last refresh
+        path = os.path.join(self.path, 'tip.parquet')
+
+        if not os.path.exists(path):
+            return None
+
+        return pd.read_parquet(path)
+
+    def _state(self):
+        path = os.path.join(self.path, 'open.json')
+
+        if not os.path.exists(path):
+            return {}
+
+        with open(path) as file:
+            return json.load(file)
+
+    def _stored(self, kind, epochs=None):
+        if not os.path.isdir(os.path.join(self.path, kind)):
+            return []
+
+        stored = sorted(
+            int(name[len('epoch='):-len('.parquet')])
+            for name in os.listdir(os.path.join(self.path, kind))
+            if name.endswith('.parquet')
+        )
+
+        if epochs is None:
+            return stored
+
+        return [epoch for epoch in stored if epoch in epochs]
+
+    def _path(self, kind, epoch):
+        if kind == 'open':
+            return os.path.join(self.path, f'open-epoch={epoch}.parquet')
+
+        return os.path.join(self.path, kind, f'epoch={epoch}.parquet')
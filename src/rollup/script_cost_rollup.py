@@ -0,0 +1,267 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from sqlalchemy import any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from src.connector.chain_tip import stable_max_id
+from src.connector.db_connector import db_connect
+from src.connector.db_reader import read_chunks, read_frame
+from src.entity.cardano import Block, Redeemer, Script, Tx
+from src.metrics.query_metrics import query_operation
+from src.parameters import DB_URL, LOOKUP_SIZE, ROLLBACK_WINDOW, SCRIPT_COST_BATCH_SIZE, \
+    SCRIPT_COST_PATH
+
+METRICS = ['unit_mem', 'unit_steps', 'fee']
+PERCENTILES = (50, 90, 99)
+
+# a cost v falls in bucket 1 + ceil(log_gamma(v)), zero costs in bucket 0,
+# and a percentile is reported as its bucket's midpoint: within 1% of the
+# exact value, clamped to the exact min and max
+ACCURACY = 0.01
+GAMMA = (1 + ACCURACY) / (1 - ACCURACY)
+
+KEY_COLUMNS = ['epoch_no', 'script_hash', 'metric', 'bucket']
+BUCKET_COLUMNS = KEY_COLUMNS + ['count', 'total', 'low', 'high']
+SCRIPT_COLUMNS = ['script_hash', 'type', 'serialised_size', 'tx_id']
+
+BUCKET_AGGREGATIONS = {'count': 'sum', 'total': 'sum', 'low': 'min', 'high': 'max'}
+BUCKET_DTYPES = {name: 'int64' for name in ['epoch_no', 'bucket', 'count', 'total', 'low', 'high']}
+
+
+def cost_buckets(values):
+    values = np.asarray(values, dtype=np.float64)
+    buckets = np.zeros(len(values), np.int64)
+
+    positive = values > 0
+    buckets[positive] = np.ceil(np.log(values[positive]) / np.log(GAMMA)).astype(np.int64) + 1
+
+    return buckets
+
+
+def bucket_values(buckets):
+    buckets = np.asarray(buckets, dtype=np.float64)
+
+    return np.where(buckets > 0, 2 * GAMMA ** (buckets - 1) / (GAMMA + 1), 0.0)
+
+
+class ScriptCostRollup():
+    # Plutus execution cost distributions per epoch: for every script and
+    # metric (unit_mem, unit_steps, fee) the redeemer count of each log
+    # spaced cost bucket with the bucket's sum, min and max. Buckets add
+    # up, so a refresh streams only the redeemers of blocks added since the
+    # last one into the epoch files, and a report over any epochs or
+    # scripts sums buckets instead of rescanning redeemers. Only blocks
+    # deeper than the rollback window are rolled up. Epoch files are named
+    # after the last block they include, so a batch replayed after an
+    # interrupted refresh is not counted twice.
+    engine = None
+    path = None
+    rollback_window = None
+    batch_size = None
+
+    def __init__(self, url=DB_URL['dev'], path=SCRIPT_COST_PATH, rollback_window=ROLLBACK_WINDOW,
+                 batch_size=SCRIPT_COST_BATCH_SIZE):
+        self.engine = db_connect(url)
+        self.path = path
+        self.rollback_window = rollback_window
+        self.batch_size = batch_size
+        self._scripts = pd.DataFrame(columns=SCRIPT_COLUMNS)
+
+    @query_operation
+    def find_scripts(self, epochs=None, script_hashes=None):
+        # cost distribution per script over the epochs, with script details
+        costs = self._distribution(self.find_buckets(epochs, script_hashes), ['script_hash'])
+
+        return costs.merge(self._script_details(costs['script_hash'].dropna().tolist()), on='script_hash', how='left')
+
+    def find_epochs(self, epochs=None, script_hashes=None):
+        # cost distribution per epoch over all scripts, or the given ones
+        return self._distribution(self.find_buckets(epochs, script_hashes), ['epoch_no'])
+
+    def find_buckets(self, epochs=None, script_hashes=None):
+        frames = [pd.read_parquet(self._path(epoch, block_id)) for epoch, block_id in self._stored(epochs)]
+
+        if not frames:
+            return pd.DataFrame(columns=BUCKET_COLUMNS).astype(BUCKET_DTYPES)
+
+        buckets = pd.concat(frames, ignore_index=True)
+
+        if script_hashes is not None:
+            buckets = buckets[buckets['script_hash'].isin(script_hashes)]
+
+        return buckets.reset_index(drop=True)
+
+    @query_operation
+    def refresh(self):
+        block_id = self._state().get('block_id', 0)
+        stable_block_id = self._stable_block_id()
+
+        if stable_block_id <= block_id:
+            return block_id
+
+        os.makedirs(self.path, exist_ok=True)
+
+        for start in range(block_id, stable_block_id, self.batch_size):
+            end = min(start + self.batch_size, stable_block_id)
+            stored = dict(self._stored())
+
+            for epoch, delta in self._redeemer_buckets(start, end).groupby('epoch_no'):
+                if stored.get(epoch, 0) < end:
+                    self._merge(epoch, stored.get(epoch), delta, end)
+
+            with open(os.path.join(self.path, 'state.json'), 'w') as file:
+                json.dump({'block_id': end}, file)
+
+        return stable_block_id
+
+    def _merge(self, epoch, block_id, delta, end):
+        if block_id is not None:
+            delta = pd.concat([pd.read_parquet(self._path(epoch, block_id)), delta], ignore_index=True)
+
+        buckets = self._reduce(delta)
+
+        path = self._path(epoch, end)
+        buckets.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+        if block_id is not None:
+            os.remove(self._path(epoch, block_id))
+
+    def _redeemer_buckets(self, start, end):
+        # streamed in chunks, each reduced to buckets before the next
+        sql = Session(bind=self.engine) \
+            .query(Block.epoch_no, Redeemer.script_hash, Redeemer.unit_mem, Redeemer.unit_steps, Redeemer.fee) \
+            .join(Tx, Tx.id == Redeemer.tx_id) \
+            .join(Block, Block.id == Tx.block_id) \
+            .filter(Block.id > start, Block.id <= end) \
+            .statement
+
+        frames = [self._buckets(chunk) for chunk in read_chunks(self, self.engine, sql, ['fee'])]
+
+        if not frames:
+            return pd.DataFrame(columns=BUCKET_COLUMNS).astype(BUCKET_DTYPES)
+
+        return self._reduce(pd.concat(frames, ignore_index=True))
+
+    def _buckets(self, redeemers):
+        frames = []
+
+        for metric in METRICS:
+            values = redeemers[metric].to_numpy(np.int64)
+
+            frames.append(pd.DataFrame({
+                'epoch_no': redeemers['epoch_no'].to_numpy(np.int64),
+                'script_hash': redeemers['script_hash'].to_numpy(object),
+                'metric': metric,
+                'bucket': cost_buckets(values),
+                'count': 1,
+                'total': values,
+                'low': values,
+                'high': values,
+            }))
+
+        return self._reduce(pd.concat(frames, ignore_index=True))
+
+    def _reduce(self, buckets):
+        return buckets \
+            .groupby(KEY_COLUMNS, dropna=False, sort=True) \
+            .agg(BUCKET_AGGREGATIONS) \
+            .reset_index()[BUCKET_COLUMNS]
+
+    def _distribution(self, buckets, keys):
+        groups = keys + ['metric']
+
+        # buckets of the dropped dimension add up, sorted by bucket per group
+        buckets = buckets \
+            .groupby(groups + ['bucket'], dropna=False, sort=True) \
+            .agg(BUCKET_AGGREGATIONS) \
+            .reset_index()
+
+        stats = buckets.groupby(groups, dropna=False, sort=True).agg(BUCKET_AGGREGATIONS).reset_index()
+        stats['mean'] = stats['total'] / stats['count'].where(stats['count'] > 0)
+
+        cumulative = buckets.groupby(groups, dropna=False)['count'].cumsum()
+        count = buckets.groupby(groups, dropna=False)['count'].transform('sum')
+
+        for q in PERCENTILES:
+            # the first bucket per group reaching the q-th percentile
+            reached = buckets[cumulative >= count * q / 100].drop_duplicates(groups)
+            reached = reached[groups].assign(**{f'p{q}': bucket_values(reached['bucket'])})
+
+            stats = stats.merge(reached, on=groups, how='left')
+            stats[f'p{q}'] = stats[f'p{q}'].clip(stats['low'], stats['high'])
+
+        report = None
+
+        for metric in METRICS:
+            part = stats[stats['metric'] == metric].drop(columns='metric')
+
+            if metric == METRICS[0]:
+                part = part.rename(columns={'count': 'redeemers'})
+            else:
+                part = part.drop(columns='count')
+
+            part = part.rename(columns={
+                name: f'{metric}_{name}'
+                for name in ['total', 'low', 'high', 'mean', *[f'p{q}' for q in PERCENTILES]]
+            })
+
+            report = part if report is None else report.merge(part, on=keys, how='outer')
+
+        return report.sort_values(keys, ignore_index=True)
+
+    def _script_details(self, script_hashes):
+        # scripts are joined by hash in batches, each hash read once
+        known = set(self._scripts['script_hash'])
+        missing = [value for value in dict.fromkeys(script_hashes) if value not in known]
+
+        for start in range(0, len(missing), LOOKUP_SIZE):
+            sql = Session(bind=self.engine) \
+                .query(Script.hash.label('script_hash'), Script.type, Script.serialised_size, Script.tx_id) \
+                .filter(Script.hash == any_(literal(missing[start:start + LOOKUP_SIZE], ARRAY(Script.hash.type)))) \
+                .statement
+
+            scripts = read_frame(self, self.engine, sql)
+
+            self._scripts = pd.concat([self._scripts, scripts], ignore_index=True)
+
+        return self._scripts[self._scripts['script_hash'].isin(script_hashes)]
+
+    def _stable_block_id(self):
+        return stable_max_id(self.engine, Block.id, self.rollback_window)
+
+    def _state(self):
+        path = os.path.join(self.path, 'state.json')
+
+        if not os.path.exists(path):
+            return {}
+
+        with open(path) as file:
+            return json.load(file)
+
+    def _stored(self, epochs=None):
+        # (epoch, last block id) per epoch file, sorted by epoch
+        stored = {}
+
+        if not os.path.isdir(self.path):
+            return []
+
+        for name in os.listdir(self.path):
+            if not name.startswith('epoch=') or not name.endswith('.parquet'):
+                continue
+
+            epoch, block_id = name[len('epoch='):-len('.parquet')].split('-')
+            stored[int(epoch)] = max(stored.get(int(epoch), 0), int(block_id))
+
+        return [
+            (epoch, block_id)
+            for epoch, block_id in sorted(stored.items())
+            if epochs is None or epoch in epochs
+        ]
+
+    def _path(self, epoch, block_id):
+        return os.path.join(self.path, f'epoch={epoch}-{block_id:012d}.parquet')
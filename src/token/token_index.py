@@ -0,0 +1,264 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from sqlalchemy import and_, exists
+from sqlalchemy.orm import Session
+from src.connector.chain_tip import stable_max_id
+from src.connector.db_connector import db_connect
+from src.connector.db_reader import read_chunks
+from src.entity.cardano import Block, MaTxMint, MaTxOut, Tx, TxIn, TxOut
+from src.entity.dtypes import table_dtypes
+from src.metrics.query_metrics import query_operation
+from src.parameters import DB_URL, ROLLBACK_WINDOW, TOKEN_BATCH_SIZE, TOKEN_PATH
+
+HOLDING_COLUMNS = [
+    MaTxOut.__table__.columns.ident,
+    MaTxOut.__table__.columns.tx_out_id,
+    TxOut.__table__.columns.address,
+    TxOut.__table__.columns.stake_address_id,
+    MaTxOut.__table__.columns.quantity,
+]
+MINT_COLUMNS = [
+    MaTxMint.__table__.columns.ident,
+    MaTxMint.__table__.columns.tx_id,
+    Block.__table__.columns.block_no,
+    Block.__table__.columns.epoch_no,
+    Block.__table__.columns.time,
+    MaTxMint.__table__.columns.quantity,
+]
+
+
+def quantities(values, dtype):
+    # lovelace mode leaves quantities beyond int64 as Decimal objects,
+    # output quantities are word64 and mint quantities int64
+    if values.dtype == object:
+        return np.fromiter((int(value) for value in values), dtype, len(values))
+
+    return values.to_numpy(dtype)
+
+
+class TokenIndex():
+    # Unspent native asset holdings and mint history per asset, kept as
+    # Parquet and brought forward from the tx ids added since the last
+    # refresh. Only txs of blocks deeper than the rollback window are
+    # indexed, so nothing indexed can be rolled back. Both tables are sorted
+    # by ident and a query slices its assets out with a binary search.
+    engine = None
+    path = None
+    rollback_window = None
+    batch_size = None
+
+    def __init__(self, url=DB_URL['dev'], path=TOKEN_PATH, rollback_window=ROLLBACK_WINDOW, batch_size=TOKEN_BATCH_SIZE):
+        self.engine = db_connect(url)
+        self.path = path
+        self.rollback_window = rollback_window
+        self.batch_size = batch_size
+        self._holdings = None
+        self._mints = None
+
+    def find_holders(self, idents, by='address'):
+        # quantity and utxo count per asset and holder, largest first
+        holdings = self._slice(self.holdings(), idents)
+
+        return holdings \
+            .groupby(['ident', by], sort=False, dropna=False)['quantity'] \
+            .agg(['sum', 'count']) \
+            .rename(columns={'sum': 'quantity', 'count': 'utxo_count'}) \
+            .reset_index() \
+            .sort_values(['ident', 'quantity'], ascending=[True, False], ignore_index=True)
+
+    def find_mints(self, idents):
+        return self._slice(self.mints(), idents)
+
+    def find_supply(self, idents):
+        # minted less burned per asset and epoch, with the running supply
+        supply = self.find_mints(idents) \
+            .groupby(['ident', 'epoch_no'])['quantity'] \
+            .sum() \
+            .rename('minted') \
+            .reset_index()
+
+        supply['supply'] = supply.groupby('ident')['minted'].cumsum()
+
+        return supply
+
+    def holdings(self):
+        tx_id = self.indexed_tx_id()
+
+        if self._holdings is None or self._holdings[0] != tx_id:
+            if tx_id:
+                holdings = pd.read_parquet(self._holdings_path(tx_id))
+            else:
+                holdings = self._frame(pd.DataFrame(columns=[column.name for column in HOLDING_COLUMNS]), HOLDING_COLUMNS, np.uint64)
+
+            self._holdings = (tx_id, holdings)
+
+        return self._holdings[1]
+
+    def mints(self):
+        tx_id = self.indexed_tx_id()
+
+        if self._mints is None or self._mints[0] != tx_id:
+            frames = [
+                pd.read_parquet(self._mint_path(start, end))
+                for start, end in self._segments()
+                if end <= tx_id
+            ]
+
+            if frames:
+                mints = pd.concat(frames, ignore_index=True).sort_values('ident', kind='stable', ignore_index=True)
+            else:
+                mints = self._frame(pd.DataFrame(columns=[column.name for column in MINT_COLUMNS]), MINT_COLUMNS, np.int64)
+
+            self._mints = (tx_id, mints)
+
+        return self._mints[1]
+
+    @query_operation
+    def refresh(self):
+        tx_id = self.indexed_tx_id()
+        stable_tx_id = self._stable_tx_id()
+
+        # mint segments past the holdings were left by an interrupted refresh
+        for start, end in self._segments():
+            if end > tx_id:
+                os.remove(self._mint_path(start, end))
+
+        if stable_tx_id <= tx_id:
+            return tx_id
+
+        os.makedirs(os.path.join(self.path, 'mint'), exist_ok=True)
+
+        created, spent = [], []
+
+        for start in range(tx_id, stable_tx_id, self.batch_size):
+            end = min(start + self.batch_size, stable_tx_id)
+
+            mints = self._read(self._mints_statement(start, end), MINT_COLUMNS, np.int64)
+
+            if not mints.empty:
+                mints.to_parquet(self._mint_path(start + 1, end), index=False)
+
+            # the first refresh reads what is unspent in one pass instead
+            if tx_id:
+                created.append(self._read(self._outputs_statement(start, end), HOLDING_COLUMNS, np.uint64))
+                spent.append(self._read(self._spent_statement(start, end), [TxOut.__table__.columns.id])['id'].to_numpy(np.int64))
+
+        if tx_id:
+            holdings = pd.concat([self.holdings(), *created], ignore_index=True)
+            holdings = holdings[~np.isin(holdings['tx_out_id'].to_numpy(np.int64), np.concatenate(spent))]
+        else:
+            holdings = self._read(self._unspent_statement(stable_tx_id), HOLDING_COLUMNS, np.uint64)
+
+        holdings = holdings.sort_values(['ident', 'tx_out_id'], ignore_index=True)
+
+        path = self._holdings_path(stable_tx_id)
+        holdings.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+        if tx_id:
+            os.remove(self._holdings_path(tx_id))
+
+        return stable_tx_id
+
+    def indexed_tx_id(self):
+        # the holdings file is named after the last tx it includes
+        if not os.path.isdir(self.path):
+            return 0
+
+        names = [name for name in os.listdir(self.path) if name.startswith('holdings-') and name.endswith('.parquet')]
+
+        if not names:
+            return 0
+
+        return max(int(name[len('holdings-'):-len('.parquet')]) for name in names)
+
+    def _stable_tx_id(self):
+        return stable_max_id(self.engine, Tx.id, self.rollback_window, lambda query: query.join(Block, Block.id == Tx.block_id))
+
+    def _holdings_query(self):
+        return Session(bind=self.engine) \
+            .query(MaTxOut.ident, MaTxOut.tx_out_id, TxOut.address, TxOut.stake_address_id, MaTxOut.quantity) \
+            .join(TxOut, TxOut.id == MaTxOut.tx_out_id)
+
+    def _unspent_statement(self, tx_id):
+        spent = exists() \
+            .where(TxIn.tx_out_id == TxOut.tx_id) \
+            .where(TxIn.tx_out_index == TxOut.index) \
+            .where(TxIn.tx_in_id <= tx_id)
+
+        return self._holdings_query() \
+            .filter(TxOut.tx_id <= tx_id) \
+            .filter(~spent) \
+            .statement
+
+    def _outputs_statement(self, start, end):
+        return self._holdings_query() \
+            .filter(TxOut.tx_id > start, TxOut.tx_id <= end) \
+            .statement
+
+    def _spent_statement(self, start, end):
+        # only outputs holding assets, through the tx_in (tx_out_id,
+        # tx_out_index) and ma_tx_out tx_out_id indexes
+        return Session(bind=self.engine) \
+            .query(TxOut.id) \
+            .join(TxIn, and_(TxIn.tx_out_id == TxOut.tx_id, TxIn.tx_out_index == TxOut.index)) \
+            .filter(TxIn.tx_in_id > start, TxIn.tx_in_id <= end) \
+            .filter(exists().where(MaTxOut.tx_out_id == TxOut.id)) \
+            .statement
+
+    def _mints_statement(self, start, end):
+        return Session(bind=self.engine) \
+            .query(MaTxMint.ident, MaTxMint.tx_id, Block.block_no, Block.epoch_no, Block.time, MaTxMint.quantity) \
+            .join(Tx, Tx.id == MaTxMint.tx_id) \
+            .join(Block, Block.id == Tx.block_id) \
+            .filter(MaTxMint.tx_id > start, MaTxMint.tx_id <= end) \
+            .order_by(MaTxMint.tx_id.asc()) \
+            .statement
+
+    def _read(self, sql, columns, quantity_dtype=None):
+        frames = list(read_chunks(self, self.engine, sql, []))
+
+        if not frames:
+            frames = [pd.DataFrame(columns=[column.name for column in columns])]
+
+        return self._frame(pd.concat(frames, ignore_index=True), columns, quantity_dtype)
+
+    def _frame(self, df, columns, quantity_dtype=None):
+        df = df.astype(table_dtypes(columns))
+
+        if quantity_dtype is not None:
+            df['quantity'] = quantities(df['quantity'], quantity_dtype)
+
+        return df
+
+    def _slice(self, df, idents):
+        idents = np.unique(np.asarray(idents, dtype=np.int64))
+        keys = df['ident'].to_numpy(np.int64)
+
+        starts = np.searchsorted(keys, idents, side='left')
+        ends = np.searchsorted(keys, idents, side='right')
+        rows = [np.arange(start, end) for start, end in zip(starts, ends)]
+
+        return df.iloc[np.concatenate(rows) if rows else []].reset_index(drop=True)
+
+    def _segments(self):
+        segments = []
+
+        if not os.path.isdir(os.path.join(self.path, 'mint')):
+            return segments
+
+        for name in os.listdir(os.path.join(self.path, 'mint')):
+            if name.endswith('.parquet'):
+                start, end = name[:-len('.parquet')].split('-')
+                segments.append((int(start), int(end)))
+
+        return sorted(segments)
+
+    def _holdings_path(self, tx_id):
+        return os.path.join(self.path, f'holdings-{tx_id:012d}.parquet')
+
+    def _mint_path(self, start, end):
+        return os.path.join(self.path, 'mint', f'{start:012d}-{end:012d}.parquet')
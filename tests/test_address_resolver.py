@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from src.connector.db_connector import db_dispose
+from src.resolver.address_resolver import PAYMENT_CRED_WIDTH, STAKE_HASH_WIDTH, AddressResolver, AddressTable
+
+
+def keys(count, start=0):
+    # every key lands on the same home slot, so inserts and finds probe
+    hi = np.arange(start, start + count, dtype=np.uint64)
+    lo = np.arange(start, start + count, dtype=np.uint64) * np.uint64(1 << 10) + np.uint64(3)
+
+    return hi, lo
+
+
+def credentials(hi):
+    # trailing zero bytes, which fixed width numpy bytes drop
+    return np.array([bytes([int(value) + 1]) + b'\0' * (PAYMENT_CRED_WIDTH - 1) for value in hi], f'S{PAYMENT_CRED_WIDTH}')
+
+
+def test_find_after_colliding_inserts():
+    table = AddressTable(8)
+    hi, lo = keys(8)
+
+    table.insert(hi, lo, credentials(hi), hi.astype(np.int64) * 10)
+    slots = table.find(hi, lo)
+
+    assert (slots >= 0).all()
+    assert len(np.unique(slots)) == 8
+    assert table.stake_ids(slots).tolist() == [value * 10 for value in range(8)]
+    assert table.payment_creds(slots) == [bytes([value + 1]) + b'\0' * (PAYMENT_CRED_WIDTH - 1) for value in range(8)]
+    assert (table.find(*keys(2, start=100)) == -1).all()
+
+
+def test_least_recently_used_keys_are_evicted_on_rehash():
+    table = AddressTable(8)
+    hi, lo = keys(8)
+    table.insert(hi, lo, credentials(hi), hi.astype(np.int64))
+
+    # keys 0 and 1 are used again, the new keys push the table past capacity
+    table.find(hi[:2], lo[:2])
+    new_hi, new_lo = keys(4, start=8)
+    table.insert(new_hi, new_lo, credentials(new_hi), new_hi.astype(np.int64))
+
+    assert table.size == 8
+    assert (table.find(hi[:2], lo[:2]) >= 0).all()
+    assert table.stake_ids(table.find(new_hi, new_lo)).tolist() == [8, 9, 10, 11]
+    assert (table.find(hi[2:], lo[2:]) >= 0).sum() == 2
+
+
+class FakeAddressResolver(AddressResolver):
+    # tx_out rows by address instead of the tx_out table
+    outputs = None
+    lookups = None
+
+    def _lookup(self, addresses):
+        self.lookups.append(addresses)
+
+        return self.outputs[self.outputs['address'].isin(addresses)].reset_index(drop=True)
+
+    def _load_stake_addresses(self):
+        return False
+
+
+def test_resolve_keeps_duplicates_and_pads_values(tmp_path):
+    resolver = FakeAddressResolver(f'sqlite:///{tmp_path}/chain.db', capacity=4)
+
+    try:
+        payment_cred = b'\x07' + b'\0' * (PAYMENT_CRED_WIDTH - 1)
+        hash_raw = b'\xe1' + b'\x05' * 20 + b'\0' * (STAKE_HASH_WIDTH - 21)
+
+        resolver.lookups = []
+        resolver.outputs = pd.DataFrame({
+            'address': ['addr_a', 'addr_b'],
+            'payment_cred': [payment_cred, None],
+            'stake_address_id': pd.array([5, None], dtype='Int64'),
+        })
+        resolver.stake_address_ids = np.array([5], np.int64)
+        resolver.views = np.array([b'stake_a'], 'S')
+        resolver.hashes = np.array([hash_raw], f'S{STAKE_HASH_WIDTH}')
+
+        resolved = resolver.resolve(['addr_a', 'addr_b', 'addr_a', 'addr_c'])
+
+        assert resolved['address'].tolist() == ['addr_a', 'addr_b', 'addr_a', 'addr_c']
+        assert resolved['payment_cred'].tolist() == [payment_cred, None, payment_cred, None]
+        assert resolved['stake_address_id'].tolist() == [5, pd.NA, 5, pd.NA]
+        assert resolved['view'].fillna('').tolist() == ['stake_a', '', 'stake_a', '']
+        assert resolved['hash_raw'].tolist() == [hash_raw, None, hash_raw, None]
+
+        # the known addresses are served from the table the second time
+        again = resolver.resolve(['addr_a', 'addr_b'])
+
+        assert again['payment_cred'].tolist() == [payment_cred, None]
+        assert resolver.lookups == [['addr_a', 'addr_b', 'addr_c']]
+    finally:
+        db_dispose()
@@ -0,0 +1,186 @@
+import asyncio
+
+from datetime import datetime
+from decimal import Decimal
+
+import pandas as pd
+
+from sqlalchemy import Boolean, DateTime, Enum, Float, Integer, LargeBinary, Numeric, String
+from sqlalchemy.dialects import postgresql
+from src.connector.async_db_connector import async_db_connect, async_db_dispose
+from src.metrics.query_metrics import _scope
+from src.repository.async_repositories import AsyncTxOutRepository
+
+
+def fake_value(column_type):
+    if isinstance(column_type, Enum):
+        return column_type.enums[0]
+    if isinstance(column_type, Boolean):
+        return True
+    if isinstance(column_type, Float):
+        return 1.5
+    if isinstance(column_type, Numeric):
+        return Decimal('1000000')
+    if isinstance(column_type, Integer):
+        return 1
+    if isinstance(column_type, DateTime):
+        return datetime(2022, 1, 1)
+    if isinstance(column_type, String):
+        return 'addr1'
+    if isinstance(column_type, LargeBinary):
+        return b'\x01'
+
+    return None
+
+
+class FakeResult():
+    def __init__(self, sql):
+        # statements must compile for Postgres, one row per statement
+        sql.compile(dialect=postgresql.dialect())
+
+        self.names = list(sql.selected_columns.keys())
+        self.scopes = []
+        self.rows = [tuple(fake_value(column.type) for column in sql.selected_columns)]
+
+    def keys(self):
+        return self.names
+
+    def fetchall(self):
+        return self.rows
+
+    async def partitions(self, size):
+        # two chunks, each fetched with the scope of the read active
+        for _ in range(2):
+            self.scopes.append(_scope.get())
+            yield self.rows
+
+
+class FakeConnection():
+    def __init__(self, statements, results):
+        self.statements = statements
+        self.results = results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, sql):
+        self.statements.append(sql)
+
+        return FakeResult(sql)
+
+    async def stream(self, sql):
+        self.results.append(await self.execute(sql))
+
+        return self.results[-1]
+
+
+class FakeEngine():
+    def __init__(self):
+        self.statements = []
+        self.results = []
+
+    def connect(self):
+        return FakeConnection(self.statements, self.results)
+
+
+def repository():
+    repository = AsyncTxOutRepository('postgresql+psycopg2://test@localhost/test')
+    repository.engine = FakeEngine()
+
+    return repository
+
+
+async def collect(generator):
+    return [df async for df in generator]
+
+
+def test_every_finder_is_async_and_honours_lovelace():
+    tx_outs = repository()
+    columns = ['id', 'tx_id', 'value']
+
+    async def run():
+        return {
+            'find_all': await tx_outs.find_all(columns, lovelace=True),
+            'find_all_chunked': (await collect(tx_outs.find_all_chunked(columns=columns, lovelace=True)))[0],
+            'find_page': await tx_outs.find_page(columns=columns, lovelace=True, id=(0, 10)),
+            'find_pages': (await collect(tx_outs.find_pages(columns=columns, lovelace=True)))[0],
+            'find_by_ids': await tx_outs.find_by_ids([1, 2], columns, lovelace=True),
+            'find_by_keys': await tx_outs.find_by_keys(('tx_id', 'index'), [(1, 0)], columns, lovelace=True),
+            'find_by_refs': await tx_outs.find_by_refs([(1, 0)], columns, lovelace=True),
+            'find_by_values': await tx_outs.find_by_values('stake_address_id', [1], columns, lovelace=True),
+            'find_epoch': await tx_outs.find_epoch(300, columns, lovelace=True),
+            'find_aggregate': await tx_outs.find_aggregate(
+                {'value': ('sum', 'value'), 'outputs': ('count', 'id')},
+                bucket='epoch',
+                lovelace=True,
+                epoch=(300, None)
+            ),
+        }
+
+    frames = asyncio.run(run())
+
+    for name, df in frames.items():
+        assert isinstance(df, pd.DataFrame), name
+        assert df['value'].dtype == 'int64', name
+        assert df['value'].iloc[0] == 1000000, name
+
+    assert len(tx_outs.engine.statements) == len(frames)
+
+
+def test_amounts_are_floats_without_lovelace():
+    tx_outs = repository()
+
+    df = asyncio.run(tx_outs.find_all(['id', 'value']))
+
+    assert df['value'].dtype == 'float64'
+    assert df['id'].dtype == 'int64'
+
+
+def test_chunks_are_fetched_within_the_scope_only():
+    tx_outs = repository()
+
+    async def run():
+        scopes = []
+
+        async for _ in tx_outs.find_all_chunked(columns=['id', 'value']):
+            scopes.append(_scope.get())
+
+        return scopes
+
+    assert asyncio.run(run()) == [None, None]
+
+    fetched = tx_outs.engine.results[0].scopes
+
+    assert len(fetched) == 2
+    assert all(scope is not None and scope.operation == 'find_all_chunked' for scope in fetched)
+
+
+def test_engines_are_not_shared_between_event_loops():
+    url = 'postgresql+psycopg2://test@localhost/test'
+
+    async def connect():
+        engine = async_db_connect(url)
+
+        assert async_db_connect(url) is engine
+
+        await async_db_dispose()
+
+        return engine
+
+    first, second = asyncio.run(connect()), asyncio.run(connect())
+
+    assert first is not second
+    assert async_db_connect(url) is async_db_connect(url) is not first
+
+    asyncio.run(async_db_dispose())
+
+    # a repository made outside a loop uses the engine of the loop it runs on
+    tx_outs = AsyncTxOutRepository(url)
+
+    async def engine():
+        return tx_outs.engine
+
+    assert asyncio.run(engine()) is not asyncio.run(engine())
@@ -0,0 +1,200 @@
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from sqlalchemy.dialects import postgresql
+from src.connector.db_connector import db_dispose
+from src.connector.lovelace import cast_lovelace
+from src.entity.dtypes import lovelace_frame, table_dtypes
+from src.entity.model.utxo_view import t_utxo_view
+from src.repository.block_repository import BlockRepository
+from src.repository.tx_out_repository import TxOutRepository
+
+
+@pytest.fixture
+def url(tmp_path):
+    try:
+        yield f'sqlite:///{tmp_path}/chain.db'
+    finally:
+        db_dispose()
+
+
+def add_tx_outs(repository, count):
+    # outputs 1 to count of tx 1 to count // 2, every third without a stake address
+    with repository.engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE tx_out (id INTEGER PRIMARY KEY, tx_id INTEGER, "index" INTEGER, address TEXT, '
+            'address_has_script BOOLEAN, stake_address_id INTEGER, value INTEGER)'
+        )
+
+        for id in range(1, count + 1):
+            connection.exec_driver_sql(
+                'INSERT INTO tx_out VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (id, (id + 1) // 2, (id + 1) % 2, f'addr{id % 3}', id % 2 == 0, None if id % 3 == 0 else id, id * 1000)
+            )
+
+
+def compiled(sql):
+    return ' '.join(str(sql.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True})).split())
+
+
+def test_aggregate_by_epoch_with_a_percentile(url):
+    sql = TxOutRepository(url)._aggregate_statement(
+        {'value': ('sum', 'value'), 'outputs': ('count', 'id'), 'p99': ('percentile', 'value', 0.99)},
+        (), 'epoch', {'epoch': (10, 12)}
+    )
+
+    assert compiled(sql) == (
+        'SELECT anon_1.epoch, sum(anon_1.value) AS value, count(anon_1.id) AS outputs, '
+        'percentile_cont(0.99) WITHIN GROUP (ORDER BY anon_1.value) AS p99 '
+        'FROM (SELECT tx_out.value AS value, tx_out.id AS id, block.epoch_no AS epoch '
+        'FROM tx_out JOIN tx ON tx.id = tx_out.tx_id JOIN block ON block.id = tx.block_id) AS anon_1 '
+        'WHERE anon_1.epoch >= 10 AND anon_1.epoch < 12 GROUP BY anon_1.epoch ORDER BY anon_1.epoch'
+    )
+
+
+def test_aggregate_by_time_and_column(url):
+    sql = TxOutRepository(url)._aggregate_statement(
+        {'value': ('avg', 'value')}, ['address'], 'day', {'time': ('2022-01-01', None)}
+    )
+
+    assert compiled(sql) == (
+        "SELECT date_trunc('day', anon_1.time) AS time, anon_1.address, CAST(avg(anon_1.value) AS FLOAT) AS value "
+        'FROM (SELECT tx_out.address AS address, tx_out.value AS value, block.time AS time '
+        'FROM tx_out JOIN tx ON tx.id = tx_out.tx_id JOIN block ON block.id = tx.block_id) AS anon_1 '
+        "WHERE anon_1.time >= '2022-01-01' GROUP BY date_trunc('day', anon_1.time), anon_1.address "
+        'ORDER BY time, anon_1.address'
+    )
+
+
+def test_aggregate_time_of_a_table_with_one(url):
+    sql = BlockRepository(url)._aggregate_statement({'txs': ('sum', 'tx_count')}, (), 'month', {})
+
+    assert compiled(sql) == (
+        "SELECT date_trunc('month', anon_1.time) AS time, sum(anon_1.tx_count) AS txs "
+        'FROM (SELECT block.tx_count AS tx_count, block.time AS time FROM block) AS anon_1 '
+        "GROUP BY date_trunc('month', anon_1.time) ORDER BY time"
+    )
+
+
+def test_aggregate_rejects_unknown_buckets_and_functions(url):
+    repository = TxOutRepository(url)
+
+    with pytest.raises(ValueError, match='unknown bucket fortnight'):
+        repository.find_aggregate({'value': ('sum', 'value')}, bucket='fortnight')
+
+    with pytest.raises(ValueError, match='unknown aggregate median'):
+        repository._aggregate_statement({'value': ('median', 'value')}, (), None, {})
+
+
+def test_aggregate_runs_grouped_by_epoch(url):
+    repository = TxOutRepository(url)
+
+    with repository.engine.begin() as connection:
+        for statement in [
+            'CREATE TABLE block (id INTEGER PRIMARY KEY, epoch_no INTEGER)',
+            'CREATE TABLE tx (id INTEGER PRIMARY KEY, block_id INTEGER)',
+            'CREATE TABLE tx_out (id INTEGER PRIMARY KEY, tx_id INTEGER, address TEXT, value INTEGER)',
+            'INSERT INTO block (id, epoch_no) VALUES (1, 0), (2, 1)',
+            'INSERT INTO tx (id, block_id) VALUES (1, 1), (2, 2)',
+            "INSERT INTO tx_out (id, tx_id, address, value) VALUES (1, 1, 'a', 10), (2, 1, 'b', 20), (3, 2, 'a', 5)",
+        ]:
+            connection.exec_driver_sql(statement)
+
+    df = repository.find_aggregate({'value': ('sum', 'value'), 'outputs': ('count', 'id')}, bucket='epoch')
+
+    assert df.values.tolist() == [[0, 30, 2], [1, 5, 1]]
+    assert df['outputs'].dtype == 'int64'
+
+
+@pytest.mark.parametrize('count, chunk_size, sizes', [(10, 5, [5, 5]), (11, 5, [5, 5, 1]), (4, 5, [4]), (0, 5, [0])])
+def test_find_all_chunked_splits_at_chunk_size(url, count, chunk_size, sizes):
+    repository = TxOutRepository(url)
+    add_tx_outs(repository, count)
+
+    # an empty table reads as one empty chunk, typed like the others
+    chunks = list(repository.find_all_chunked(chunk_size=chunk_size, columns=['id', 'value']))
+
+    assert [len(chunk) for chunk in chunks] == sizes
+    assert [id for chunk in chunks for id in chunk['id']] == list(range(1, count + 1))
+    assert all(chunk['id'].dtype == 'int64' for chunk in chunks)
+    assert repository.engine.pool.checkedout() == 0
+
+
+def test_find_pages_seeks_through_a_range(url):
+    repository = TxOutRepository(url)
+    add_tx_outs(repository, 12)
+
+    # outputs 3 to 8 belong to txs 2 to 4, a full last page ends on an empty one
+    pages = list(repository.find_pages(limit=3, columns=['value'], tx_id=(2, 5)))
+
+    assert [page['id'].tolist() for page in pages] == [[3, 4, 5], [6, 7, 8]]
+    assert pages[0].columns.tolist() == ['id', 'value']
+
+    pages = list(repository.find_pages(last_id=9, limit=2, columns=['id'], tx_id=(2, None)))
+
+    assert [page['id'].tolist() for page in pages] == [[10, 11], [12]]
+
+    page = repository.find_page(last_id=4, limit=10, columns=['id'], tx_id=(None, 4), id=(2, 7))
+
+    assert page['id'].tolist() == [5, 6]
+
+
+def test_ranges_are_limited_to_indexed_columns(url):
+    repository = TxOutRepository(url)
+
+    with pytest.raises(ValueError, match='tx_out.value is not indexed'):
+        repository.find_page(value=(0, 1000))
+
+
+def test_nullable_columns_map_to_nullable_dtypes():
+    # the columns of a view are all nullable
+    columns = [t_utxo_view.columns[name] for name in ['id', 'index', 'address', 'address_has_script', 'stake_address_id', 'value']]
+
+    assert table_dtypes(columns) == {
+        'id': 'Int64', 'index': 'Int16', 'address_has_script': 'boolean', 'stake_address_id': 'Int64',
+    }
+
+
+def test_loads_keep_integers_with_nulls_exact(url):
+    repository = TxOutRepository(url)
+    add_tx_outs(repository, 3)
+
+    with repository.engine.begin() as connection:
+        connection.exec_driver_sql('INSERT INTO tx_out VALUES (4, 2, 1, ?, 1, ?, 0)', ('addr1', 2**40 + 1))
+
+    df = repository.find_all(['id', 'index', 'address_has_script', 'stake_address_id'])
+
+    assert df.dtypes.astype(str).tolist() == ['int64', 'int16', 'bool', 'Int64']
+    assert df['stake_address_id'].tolist() == [1, 2, pd.NA, 2**40 + 1]
+
+
+@pytest.mark.parametrize('text, value', [
+    ('0', 0),
+    ('-45000000', -45000000),
+    ('999999999999999999', 10**18 - 1),
+    ('9223372036854775807', 2**63 - 1),
+    ('-9223372036854775808', -2**63),
+    ('9223372036854775808', Decimal(2**63)),
+    ('18446744073709551615', Decimal(2**64 - 1)),
+    ('1.50', Decimal('1.50')),
+    ('2.000', 2),
+])
+def test_lovelace_casts_whole_amounts_in_int64_to_int(text, value):
+    cast = cast_lovelace(text, None)
+
+    assert cast == value
+    assert type(cast) is type(value)
+    assert cast_lovelace(None, None) is pd.NA
+
+
+def test_lovelace_columns_are_int64_unless_out_of_range():
+    df = lovelace_frame(pd.DataFrame({
+        'fee': [cast_lovelace(text, None) for text in ['170000', '2000000']],
+        'deposit': [cast_lovelace(text, None) for text in ['2000000', None]],
+        'quantity': [cast_lovelace(text, None) for text in ['1', '18446744073709551615']],
+    }).astype(object), ['fee', 'deposit', 'quantity'])
+
+    assert df.dtypes.astype(str).tolist() == ['int64', 'Int64', 'object']
+    assert df['quantity'].tolist() == [1, Decimal(2**64 - 1)]
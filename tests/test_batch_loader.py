@@ -0,0 +1,129 @@
+import asyncio
+
+import pandas as pd
+
+from src.loader.batch_loader import BatchLoader
+
+
+class FakeRepository():
+    def __init__(self):
+        self.calls = []
+        self.release = None
+        self.failures = 0
+
+    async def find_by_keys(self, names, keys, columns=None):
+        self.calls.append(list(keys))
+        fail = len(self.calls) <= self.failures
+
+        if self.release is not None:
+            await self.release.wait()
+
+        if fail:
+            raise ValueError('connection lost')
+
+        return pd.DataFrame({'id': keys, 'value': [key * 10 for key in keys]})
+
+
+def test_load_coalesces_keys():
+    async def run():
+        repository = FakeRepository()
+        loader = BatchLoader(repository, 'id')
+
+        rows = await loader.load_many([1, 2, 3])
+
+        return repository.calls, rows
+
+    calls, rows = asyncio.run(run())
+
+    assert calls == [[1, 2, 3]]
+    assert [row['value'] for row in rows] == [10, 20, 30]
+
+
+def test_cancelled_caller_does_not_cancel_other_waiters():
+    async def run():
+        repository = FakeRepository()
+        repository.release = asyncio.Event()
+        loader = BatchLoader(repository, 'id')
+
+        cancelled = asyncio.ensure_future(loader.load(1))
+        waiting = asyncio.ensure_future(loader.load(1))
+        other = asyncio.ensure_future(loader.load(2))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        repository.release.set()
+
+        results = await asyncio.wait_for(asyncio.gather(waiting, other), 1)
+        again = await loader.load(1)
+
+        return cancelled.cancelled(), results, again, repository.calls
+
+    cancelled, results, again, calls = asyncio.run(run())
+
+    assert cancelled
+    assert [row['value'] for row in results] == [10, 20]
+    assert again['value'] == 10
+    assert calls == [[1, 2]]
+
+
+def test_cancelled_future_is_fetched_again():
+    async def run():
+        repository = FakeRepository()
+        repository.release = asyncio.Event()
+        loader = BatchLoader(repository, 'id')
+
+        waiting = asyncio.ensure_future(loader.load(1))
+        other = asyncio.ensure_future(loader.load(2))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        # the shared future itself cancelled, e.g. by loop shutdown code
+        loader._futures[1].cancel()
+        repository.release.set()
+
+        result = await asyncio.wait_for(other, 1)
+        await asyncio.gather(waiting, return_exceptions=True)
+
+        repository.release = None
+        again = await asyncio.wait_for(loader.load(1), 1)
+
+        return result, again, repository.calls
+
+    result, again, calls = asyncio.run(run())
+
+    assert result['value'] == 20
+    assert again['value'] == 10
+    assert calls == [[1, 2], [1]]
+
+
+def test_failed_batch_leaves_a_newer_batch_alone():
+    async def run():
+        repository = FakeRepository()
+        repository.release = asyncio.Event()
+        repository.failures = 1
+        loader = BatchLoader(repository, 'id')
+
+        failing = asyncio.ensure_future(loader.load(1))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        # key 1 is queued again with a new future while the first batch,
+        # which is about to fail, is still running
+        loader._futures[1].cancel()
+        again = asyncio.ensure_future(loader.load(1))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        repository.release.set()
+        await asyncio.gather(failing, return_exceptions=True)
+        result = await asyncio.wait_for(again, 1)
+
+        return result, loader._futures[1].result(), repository.calls
+
+    result, memoized, calls = asyncio.run(run())
+
+    assert result['value'] == 10
+    assert memoized['value'] == 10
+    assert calls == [[1], [1]]
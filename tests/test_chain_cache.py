@@ -0,0 +1,104 @@
+from decimal import Decimal
+
+import pandas as pd
+
+from src.cache.chain_cache import ChainCache
+from src.connector.db_connector import db_connect, db_dispose
+from src.repository.ma_tx_out_repository import MaTxOutRepository
+from src.repository.tx_out_repository import TxOutRepository
+
+WORD64_MAX = 2 ** 64 - 1
+
+
+def cache(tmp_path, rows):
+    repository = MaTxOutRepository('postgresql+psycopg2://test@localhost/test')
+
+    def find_pages(last_id=None, limit=None, columns=None, lovelace=False, **ranges):
+        df = rows[rows['id'] > (last_id or 0)]
+        end = ranges.get('id', (None, None))[1]
+
+        if end is not None:
+            df = df[df['id'] < end]
+
+        df = df[columns].reset_index(drop=True)
+
+        # outside lovelace mode amounts are read as floats
+        if not lovelace and 'quantity' in df:
+            df['quantity'] = df['quantity'].astype('float64')
+
+        if not df.empty:
+            yield df
+
+    repository.find_pages = find_pages
+
+    chain_cache = ChainCache(repository, str(tmp_path))
+    chain_cache.stable_id = lambda: 2
+
+    return chain_cache
+
+
+def test_word64_quantities_are_cached(tmp_path):
+    # lovelace mode rows: int where it fits int64, exact int beyond
+    rows = pd.DataFrame({
+        'id': [1, 2, 3],
+        'quantity': pd.Series([1, WORD64_MAX, 5], dtype=object),
+        'tx_out_id': [10, 11, 12],
+        'ident': [1, 1, 2],
+    })
+    chain_cache = cache(tmp_path, rows)
+
+    lovelace = chain_cache.find_all(['id', 'quantity'], lovelace=True)
+
+    assert chain_cache.segments() == [(1, 2)]
+    assert lovelace['quantity'].tolist() == [1, Decimal(WORD64_MAX), 5]
+
+    floats = chain_cache.find_all(['id', 'quantity'])
+
+    assert floats['quantity'].dtype == 'float64'
+
+
+def test_lovelace_flag_is_honoured(tmp_path):
+    rows = pd.DataFrame({'id': [1, 2, 3], 'quantity': [100, 200, 300], 'tx_out_id': [10, 11, 12], 'ident': [1, 1, 2]})
+    chain_cache = cache(tmp_path, rows)
+
+    lovelace = chain_cache.find_all(['id', 'quantity'], lovelace=True)
+    floats = chain_cache.find_all(['id', 'quantity'], lovelace=False)
+
+    assert lovelace['quantity'].dtype == 'int64'
+    assert lovelace['quantity'].tolist() == [100, 200, 300]
+    assert floats['quantity'].dtype == 'float64'
+    assert floats['id'].dtype == 'int64'
+
+
+def test_stable_id_is_below_the_rollback_window(tmp_path):
+    repository = TxOutRepository(f'sqlite:///{tmp_path}/chain.db')
+
+    try:
+        repository.engine = db_connect(repository.engine.url, pool_size=1, max_overflow=0, pool_timeout=1)
+        chain_cache = ChainCache(repository, str(tmp_path / 'cache'), rollback_window=2)
+
+        with repository.engine.begin() as connection:
+            for statement in [
+                'CREATE TABLE block (id INTEGER PRIMARY KEY, block_no INTEGER)',
+                'CREATE TABLE tx (id INTEGER PRIMARY KEY, block_id INTEGER)',
+                'CREATE TABLE tx_out (id INTEGER PRIMARY KEY, tx_id INTEGER)',
+            ]:
+                connection.exec_driver_sql(statement)
+
+        assert chain_cache.stable_id() == 0
+
+        with repository.engine.begin() as connection:
+            for statement in [
+                'INSERT INTO block (id, block_no) VALUES (1, 1), (2, 2), (3, 3), (4, 4), (5, 5)',
+                'INSERT INTO tx (id, block_id) VALUES (1, 1), (2, 2), (3, 3), (4, 4), (5, 5)',
+                'INSERT INTO tx_out (id, tx_id) VALUES (1, 1), (2, 1), (3, 2), (4, 3), (5, 3), (6, 4), (7, 5)',
+            ]:
+                connection.exec_driver_sql(statement)
+
+        # block 3 is the last one deeper than the window, repeated reads
+        # hand their connection back
+        assert chain_cache.stable_id() == 5
+        assert chain_cache.stable_id() == 5
+        assert repository.engine.pool.checkedout() == 0
+    finally:
+        db_dispose()
@@ -0,0 +1,98 @@
+import pandas as pd
+
+from src.follower.chain_follower import ChainFollower, RollBack, RollForward
+
+
+class FakeRepository():
+    # rows of one table, read like the repositories read them
+    def __init__(self, rows):
+        self.rows = rows
+
+    def find_page(self, last_id=None, limit=None, lovelace=False):
+        rows = self.rows[self.rows['id'] > (last_id or 0)].sort_values('id')
+
+        return rows.head(limit).reset_index(drop=True)
+
+    def find_pages(self, lovelace=False, **ranges):
+        rows = self.rows
+
+        for name, (start, end) in ranges.items():
+            rows = rows[(rows[name] >= start) & (rows[name] < end)]
+
+        if not rows.empty:
+            yield rows.sort_values('id').reset_index(drop=True)
+
+    def find_by_ids(self, ids, columns=None):
+        return self.rows[self.rows['id'].isin(ids)][columns].reset_index(drop=True)
+
+    def empty_frame(self, columns=None):
+        return self.rows.iloc[:0]
+
+
+class FakeChain():
+    def __init__(self):
+        self.blocks = FakeRepository(pd.DataFrame(columns=['id', 'block_no', 'hash', 'previous_id']))
+        self.txs = FakeRepository(pd.DataFrame(columns=['id', 'block_id']))
+        self.tx_outs = FakeRepository(pd.DataFrame(columns=['id', 'tx_id']))
+        self.tx_ins = FakeRepository(pd.DataFrame(columns=['id', 'tx_in_id']))
+
+    def add_block(self, block_id, block_no, previous_id):
+        # one tx per block, spending and creating one output
+        self.blocks.rows = self._append(self.blocks.rows, [block_id, block_no, f'hash{block_id}', previous_id])
+        self.txs.rows = self._append(self.txs.rows, [block_id * 10, block_id])
+        self.tx_outs.rows = self._append(self.tx_outs.rows, [block_id * 100, block_id * 10])
+        self.tx_ins.rows = self._append(self.tx_ins.rows, [block_id * 100, block_id * 10])
+
+    def delete_block(self, block_id):
+        # db-sync deletes the rows of orphaned blocks, ids are not reused
+        self.blocks.rows = self.blocks.rows[self.blocks.rows['id'] != block_id]
+        self.txs.rows = self.txs.rows[self.txs.rows['block_id'] != block_id]
+        self.tx_outs.rows = self.tx_outs.rows[self.tx_outs.rows['tx_id'] != block_id * 10]
+        self.tx_ins.rows = self.tx_ins.rows[self.tx_ins.rows['tx_in_id'] != block_id * 10]
+
+    def _append(self, rows, row):
+        return pd.concat([rows, pd.DataFrame([row], columns=rows.columns)], ignore_index=True).astype(
+            {name: 'Int64' for name in rows.columns if name != 'hash'}
+        )
+
+
+def follower(chain):
+    chain_follower = ChainFollower('postgresql+psycopg2://test@localhost/test', block_id=0)
+    chain_follower.blocks = chain.blocks
+    chain_follower.txs = chain.txs
+    chain_follower.tx_outs = chain.tx_outs
+    chain_follower.tx_ins = chain.tx_ins
+
+    return chain_follower
+
+
+def test_blocks_orphaned_by_a_fork_are_rolled_back():
+    chain = FakeChain()
+
+    for block_id in [1, 2, 3]:
+        chain.add_block(block_id, block_id, block_id - 1 or None)
+
+    chain_follower = follower(chain)
+    events = chain_follower.poll()
+
+    assert len(events) == 1
+    assert events[0].blocks['id'].tolist() == [1, 2, 3]
+
+    # a fork replaces block 3: while db-sync has not deleted it yet, the new
+    # blocks do not link to the cursor and are left for the next poll
+    chain.add_block(4, 3, 2)
+    chain.add_block(5, 4, 4)
+
+    assert chain_follower.poll() == []
+
+    chain.delete_block(3)
+    events = chain_follower.poll()
+
+    assert events[0] == RollBack(2, 2, 'hash2')
+    assert isinstance(events[1], RollForward)
+    assert events[1].blocks['id'].tolist() == [4, 5]
+    assert events[1].txs['block_id'].tolist() == [4, 5]
+    assert events[1].tx_outs['tx_id'].tolist() == [40, 50]
+    assert events[1].tx_ins['tx_in_id'].tolist() == [40, 50]
+    assert chain_follower.cursor == (5, 4, 'hash5')
+    assert len(events) == 2
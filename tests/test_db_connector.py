@@ -0,0 +1,15 @@
+from src.connector.db_connector import db_connect, db_dispose
+
+
+def test_engines_are_shared_per_pool_arguments(tmp_path):
+    url = f'sqlite:///{tmp_path}/chain.db'
+
+    try:
+        engine = db_connect(url, pool_size=2)
+
+        assert db_connect(url, pool_size=2) is engine
+        assert db_connect(url, pool_size=3) is not engine
+        assert db_connect(url, pool_size=3).pool.size() == 3
+        assert engine.pool.size() == 2
+    finally:
+        db_dispose()
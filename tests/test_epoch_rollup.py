@@ -0,0 +1,178 @@
+import pandas as pd
+
+from src.connector.db_connector import db_connect, db_dispose
+from src.rollup.epoch_rollup import EpochRollup
+
+
+class SqliteEpochRollup(EpochRollup):
+    # the lovelace caster is psycopg2 only, sqlite returns ints already
+    def _read(self, sql, numeric):
+        with self.engine.connect() as connection:
+            return pd.read_sql(sql=sql, con=connection)
+
+
+def execute(rollup, *statements):
+    with rollup.engine.begin() as connection:
+        for statement in statements:
+            connection.exec_driver_sql(statement)
+
+
+def add_block(rollup, block_id, epoch_no, block_no, fee):
+    execute(
+        rollup,
+        f"INSERT INTO block (id, epoch_no, block_no, time, tx_count) "
+        f"VALUES ({block_id}, {epoch_no}, {block_no}, '2022-01-01 00:00:{block_no:02d}', 1)",
+        f"INSERT INTO tx (id, block_id, fee, out_sum) VALUES ({block_id}, {block_id}, {fee}, 1000)",
+    )
+
+
+def create_tables(rollup):
+    execute(
+        rollup,
+        'CREATE TABLE block (id INTEGER PRIMARY KEY, epoch_no INTEGER, block_no INTEGER, time TEXT, '
+        'tx_count INTEGER, slot_leader_id INTEGER)',
+        'CREATE TABLE tx (id INTEGER PRIMARY KEY, block_id INTEGER, fee INTEGER, out_sum INTEGER)',
+        'CREATE TABLE slot_leader (id INTEGER PRIMARY KEY, pool_hash_id INTEGER)',
+        'CREATE TABLE epoch_stake (id INTEGER PRIMARY KEY, pool_id INTEGER, amount INTEGER, epoch_no INTEGER)',
+        'CREATE TABLE reward (id INTEGER PRIMARY KEY, pool_id INTEGER, amount INTEGER, earned_epoch INTEGER)',
+        'INSERT INTO slot_leader (id, pool_hash_id) VALUES (1, 7)',
+    )
+
+
+def add_pool_block(rollup, block_id, epoch_no):
+    add_block(rollup, block_id, epoch_no, block_id, 10)
+    execute(
+        rollup,
+        f'UPDATE block SET slot_leader_id = 1 WHERE id = {block_id}',
+        f'INSERT INTO epoch_stake (pool_id, amount, epoch_no) VALUES (7, 100, {epoch_no})',
+    )
+
+
+def test_blocks_replaced_by_a_fork_are_not_counted(tmp_path):
+    rollup = SqliteEpochRollup(f'sqlite:///{tmp_path}/chain.db', str(tmp_path / 'rollup'), rollback_window=2)
+
+    try:
+        create_tables(rollup)
+
+        for block_id, epoch_no in [(1, 0), (2, 0), (3, 0), (4, 1), (5, 1)]:
+            add_block(rollup, block_id, epoch_no, block_id, 10)
+
+        rollup.refresh()
+
+        assert rollup.find_epochs()[['epoch_no', 'blk_count', 'fees']].values.tolist() == [[0, 3, 30], [1, 2, 20]]
+
+        # block 5 is rolled back and replaced by blocks 6 and 7
+        execute(rollup, 'DELETE FROM tx WHERE block_id = 5', 'DELETE FROM block WHERE id = 5')
+        add_block(rollup, 6, 1, 5, 100)
+        add_block(rollup, 7, 1, 6, 100)
+
+        rollup.refresh()
+
+        assert rollup.find_epochs()[['epoch_no', 'blk_count', 'fees']].values.tolist() == [[0, 3, 30], [1, 3, 210]]
+        assert rollup.find_epochs([1])['blk_count'].tolist() == [3]
+    finally:
+        db_dispose()
+
+
+def test_an_empty_chain_leaves_nothing_behind(tmp_path):
+    path = tmp_path / 'rollup'
+    rollup = SqliteEpochRollup(f'sqlite:///{tmp_path}/chain.db', str(path))
+
+    try:
+        assert not path.exists()
+
+        create_tables(rollup)
+        rollup.refresh()
+
+        assert rollup.find_epochs().empty
+        assert rollup.find_pools(0).empty
+    finally:
+        db_dispose()
+
+
+def test_pools_still_receiving_rewards_are_stored_provisionally(tmp_path):
+    rollup = SqliteEpochRollup(f'sqlite:///{tmp_path}/chain.db', str(tmp_path / 'rollup'), rollback_window=0)
+
+    try:
+        create_tables(rollup)
+
+        for epoch_no in range(4):
+            add_pool_block(rollup, epoch_no + 1, epoch_no)
+
+        rollup.refresh()
+
+        # epochs 2 and 3 are read back without aggregating again
+        rollup._pools = None
+
+        assert rollup.find_pools(3)[['pool_id', 'blk_count', 'stake', 'rewards']].values.tolist() == [[7, 1, 100, 0]]
+        assert rollup.find_pools(2)['rewards'].tolist() == [0]
+        assert (tmp_path / 'rollup' / 'provisional' / 'epoch=2.parquet').exists()
+
+        del rollup._pools
+
+        # the rewards of epoch 2 are in once epoch 4 starts
+        execute(rollup, 'INSERT INTO reward (pool_id, amount, earned_epoch) VALUES (7, 5, 2)')
+        add_pool_block(rollup, 5, 4)
+        add_pool_block(rollup, 6, 4)
+
+        # closed epochs are not aggregated again
+        aggregated = []
+        pools = rollup._pools
+        rollup._pools = lambda epoch: aggregated.append(epoch) or pools(epoch)
+
+        rollup.refresh()
+
+        del rollup._pools
+
+        assert aggregated == [2, 3, 4]
+
+        assert rollup.find_pools(2)['rewards'].tolist() == [5]
+        assert (tmp_path / 'rollup' / 'pool' / 'epoch=2.parquet').exists()
+        assert not (tmp_path / 'rollup' / 'provisional' / 'epoch=2.parquet').exists()
+    finally:
+        db_dispose()
+
+
+def test_blocks_without_txs_keep_amounts_exact(tmp_path):
+    rollup = SqliteEpochRollup(f'sqlite:///{tmp_path}/chain.db', str(tmp_path / 'rollup'), rollback_window=0)
+    # sqlite reads sums of Numeric through float, the dtypes tell whether
+    # the rollup did too
+    out_sum = 2 ** 40 + 1
+
+    try:
+        create_tables(rollup)
+        add_block(rollup, 1, 0, 1, 10)
+        execute(rollup, f'UPDATE tx SET out_sum = {out_sum}')
+
+        rollup.refresh()
+
+        # a delta of blocks without txs, then one with a tx again
+        execute(rollup, "INSERT INTO block (id, epoch_no, block_no, time, tx_count) VALUES (2, 0, 2, '2022-01-01', 0)")
+        rollup.refresh()
+        add_block(rollup, 3, 0, 3, 10)
+        rollup.refresh()
+
+        epochs = rollup.find_epochs()
+
+        assert epochs[['blk_count', 'fees', 'out_sum']].values.tolist() == [[3, 20, out_sum + 1000]]
+        assert epochs['out_sum'].dtype == 'int64'
+        assert pd.read_parquet(rollup._path('open', 0))[['fees', 'out_sum']].dtypes.tolist() == ['int64', 'int64']
+        assert pd.read_parquet(tmp_path / 'rollup' / 'tip.parquet')['out_sum'].dtype == 'int64'
+    finally:
+        db_dispose()
+
+
+def test_refresh_returns_its_connections(tmp_path):
+    rollup = SqliteEpochRollup(f'sqlite:///{tmp_path}/chain.db', str(tmp_path / 'rollup'))
+
+    try:
+        rollup.engine = db_connect(rollup.engine.url, pool_size=1, max_overflow=0, pool_timeout=1)
+        create_tables(rollup)
+        add_pool_block(rollup, 1, 0)
+
+        rollup.refresh()
+        rollup.refresh()
+
+        assert rollup.engine.pool.checkedout() == 0
+    finally:
+        db_dispose()
@@ -0,0 +1,97 @@
+import pandas as pd
+
+from sqlalchemy import create_engine
+from src.entity.cardano import Block
+from src.extractor.parallel_extractor import ParallelExtractor
+
+# the table read by the workers, ids 100 to 199 spread over epochs 0 to 4
+ROWS = pd.DataFrame({'id': range(100, 200), 'epoch_no': [id // 20 - 5 for id in range(100, 200)]})
+
+
+class FakeRepository():
+    entity = Block
+
+    def __init__(self, url):
+        # never connected, the workers are handed its url
+        self.engine = create_engine(url)
+
+    def find_page(self, limit=None, columns=None, lovelace=False, id=None):
+        start, end = id
+
+        return ROWS[(ROWS['id'] >= start) & (ROWS['id'] < end)].reset_index(drop=True)
+
+    def find_epoch(self, epoch, columns=None, lovelace=False):
+        return ROWS[ROWS['epoch_no'] == epoch].reset_index(drop=True)
+
+    def empty_frame(self, columns=None):
+        return ROWS.iloc[:0]
+
+
+class FakeParallelExtractor(ParallelExtractor):
+    def __init__(self, repository, bounds=(), min_max=(100, 199), epochs=(0, 4)):
+        super().__init__(repository, workers=2)
+        self.bounds = list(bounds)
+        self.min_max = {'id': min_max, 'epoch_no': epochs}
+
+    def _min_max(self, column):
+        return self.min_max[column.name]
+
+    def _histogram_bounds(self):
+        return self.bounds
+
+
+def repository(tmp_path):
+    return FakeRepository(f'sqlite:///{tmp_path}/chain.db')
+
+
+def test_id_ranges_are_cut_at_the_histogram_bounds(tmp_path):
+    # rows are dense up to 130 and sparse above it, each range holds as many
+    # of them
+    bounds = [100, 105, 110, 115, 120, 125, 130, 160, 199]
+    extractor = FakeParallelExtractor(repository(tmp_path), bounds)
+
+    assert extractor.id_ranges(4) == [(100, 110), (110, 120), (120, 130), (130, 200)]
+
+
+def test_id_ranges_fall_back_to_even_ranges(tmp_path):
+    extractor = FakeParallelExtractor(repository(tmp_path), bounds=[100, 150, 199])
+
+    assert extractor.id_ranges(4) == [(100, 125), (125, 150), (150, 175), (175, 200)]
+    assert extractor.id_ranges(200) == [(id, id + 1) for id in range(100, 200)]
+
+    extractor.min_max['id'] = (None, None)
+
+    assert extractor.id_ranges(4) == []
+
+
+def test_epochs_run_from_the_first_to_the_last(tmp_path):
+    extractor = FakeParallelExtractor(repository(tmp_path), epochs=(2, 5))
+
+    assert extractor.partitions('epoch') == [2, 3, 4, 5]
+    assert extractor.partitions('epoch', [7]) == [7]
+
+    extractor.min_max['epoch_no'] = (None, None)
+
+    assert extractor.epochs() == []
+
+
+def test_worker_output_is_merged_in_partition_order(tmp_path):
+    extractor = FakeParallelExtractor(repository(tmp_path), bounds=range(100, 200, 3))
+
+    assert extractor.extract(partitions=7)['id'].tolist() == list(range(100, 200))
+    assert extractor.extract(by='epoch', partitions=[3, 0])['id'].tolist() == \
+        list(range(160, 180)) + list(range(100, 120))
+
+    extractor.min_max['id'] = (None, None)
+
+    assert extractor.extract().empty
+
+
+def test_partitions_are_written_one_file_each(tmp_path):
+    extractor = FakeParallelExtractor(repository(tmp_path))
+
+    rows = extractor.extract_to(str(tmp_path / 'block'), by='epoch')
+
+    assert list(rows.values()) == [20] * 5
+    assert pd.read_parquet(str(tmp_path / 'block' / 'epoch=4' / 'part-00000.parquet'))['id'].tolist() == \
+        list(range(180, 200))
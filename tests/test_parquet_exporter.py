@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from sqlalchemy.dialects import postgresql
+from src.exporter.parquet_exporter import ParquetExporter
+from src.repository.tx_out_repository import TxOutRepository
+
+
+class FakeCursor():
+    def __init__(self, output, error):
+        self.output = output
+        self.error = error
+
+    def copy_expert(self, sql, file):
+        file.write(self.output)
+
+        if self.error is not None:
+            raise self.error
+
+
+class FakeConnection():
+    def __init__(self, output, error):
+        cursor = FakeCursor(output, error)
+
+        self.connection = type('Pool', (), {
+            'dbapi_connection': type('Dbapi', (), {'cursor': lambda self: cursor})()
+        })()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class FakeEngine():
+    dialect = postgresql.dialect()
+
+    def __init__(self, output=b'', error=None):
+        self.output = output
+        self.error = error
+
+    def connect(self):
+        return FakeConnection(self.output, self.error)
+
+
+def exporter(output=b'', error=None):
+    repository = TxOutRepository('postgresql+psycopg2://test@localhost/test')
+    repository.engine = FakeEngine(output, error)
+
+    return ParquetExporter(repository)
+
+
+def test_empty_copy_writes_zero_row_file(tmp_path):
+    batches = list(exporter().batches(['id', 'value']))
+
+    assert [batch.num_rows for batch in batches] == [0]
+    assert batches[0].schema.names == ['id', 'value']
+
+    exporter().export(str(tmp_path), ['id', 'value'], by_epoch=False)
+    df = pd.read_parquet(tmp_path)
+
+    assert df.empty
+    assert list(df.columns) == ['id', 'value']
+
+
+def test_copy_error_is_raised():
+    # the pipe closes without rows, the db error is raised, not an empty CSV
+    with pytest.raises(RuntimeError, match='relation does not exist'):
+        list(exporter(error=RuntimeError('relation does not exist')).batches(['id', 'value']))
+
+
+def test_copy_error_midway_is_raised():
+    error = RuntimeError('canceling statement due to statement timeout')
+
+    with pytest.raises(RuntimeError, match='statement timeout'):
+        list(exporter(b'1,1000000\n2,"', error).batches(['id', 'value']))
+
+
+def test_rows_are_exported(tmp_path):
+    exporter(b'1,1000000\n2,18446744073709551615\n').export(str(tmp_path), ['id', 'value'], by_epoch=False)
+    df = pd.read_parquet(tmp_path)
+
+    assert df['id'].tolist() == [1, 2]
+    assert [int(value) for value in df['value']] == [1000000, 18446744073709551615]
@@ -0,0 +1,69 @@
+import pandas as pd
+
+from src.registry.pool_registry import PoolRegistry
+
+UPDATES = pd.DataFrame({
+    'id': [1, 2],
+    'hash_id': [10, 20],
+    'pledge': [100, 200],
+    'margin': [0.01, 0.02],
+    'fixed_cost': [340, 340],
+    'reward_addr': ['stake1', 'stake2'],
+    'vrf_key_hash': [b'\x01', b'\x02'],
+    'active_epoch_no': [3, 3],
+    'meta_id': [None, None],
+    'registered_tx_id': [500, 500],
+    'registered_epoch_no': [1, 1],
+})
+
+# one tx registers both pools, each with its own owners
+TABLES = [
+    UPDATES,
+    pd.DataFrame(columns=['hash_id', 'announced_tx_id', 'retiring_epoch', 'announced_epoch_no']).astype('int64'),
+    pd.DataFrame({'pool_id': [10, 10, 20], 'registered_tx_id': [500, 500, 500], 'addr_id': [7, 8, 9]}),
+    pd.DataFrame(columns=['update_id', 'ipv4', 'ipv6', 'dns_name', 'dns_srv_name', 'port']),
+    pd.DataFrame(columns=['meta_id', 'meta_url', 'meta_hash']),
+    pd.DataFrame(columns=['meta_id', 'ticker_name']),
+]
+
+
+class FakePoolRegistry(PoolRegistry):
+    def __init__(self, tables=TABLES):
+        self.engine = None
+        self.tables = tables
+
+    def _read(self, sql, numeric=()):
+        names = list(sql.selected_columns.keys())
+
+        # the table read by the statement, matched on its columns
+        for table in self.tables:
+            if list(table.columns) == names:
+                return table.copy()
+
+
+def test_owners_of_pools_registered_in_one_tx():
+    snapshot = FakePoolRegistry().snapshots([3])[3]
+
+    assert snapshot['pool_id'].tolist() == [10, 20]
+    assert snapshot['owners'].tolist() == [[7, 8], [9]]
+    assert snapshot['status'].tolist() == ['registered', 'registered']
+
+
+def test_pools_without_retirements_read_as_object_columns():
+    # an empty result of read_sql has object columns
+    retires = pd.DataFrame(columns=['hash_id', 'announced_tx_id', 'retiring_epoch', 'announced_epoch_no'])
+    snapshot = FakePoolRegistry([UPDATES, retires, *TABLES[2:]]).snapshots([3])[3]
+
+    assert snapshot['status'].tolist() == ['registered', 'registered']
+    assert snapshot['retiring_epoch'].isna().all()
+    assert snapshot['retiring_epoch'].dtype == 'Int64'
+
+
+def test_retiring_and_retired_pools():
+    retires = pd.DataFrame({
+        'hash_id': [10, 20], 'announced_tx_id': [600, 700], 'retiring_epoch': [5, 3], 'announced_epoch_no': [2, 2],
+    })
+    registry = FakePoolRegistry([UPDATES, retires, *TABLES[2:]])
+
+    assert registry.snapshots([3])[3]['status'].tolist() == ['retiring', 'retired']
+    assert registry.snapshots([1])[1].empty
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from src.connector.db_reader import read_chunks, read_frame
+from src.metrics.query_metrics import METRICS, instrument_engine, query_operation, query_scope
+
+
+class FakeRepository():
+    def __init__(self):
+        self.reads = []
+
+    def _read_sql(self):
+        self.reads.append(query_scope(self).operation)
+
+    @query_operation
+    def find_page(self):
+        self._read_sql()
+
+    @query_operation
+    def find_pages(self):
+        for _ in range(2):
+            self.find_page()
+            yield
+
+    @query_operation
+    async def find_async(self):
+        await asyncio.gather(*[asyncio.sleep(0, self._read_sql()) for _ in range(2)])
+
+
+def test_reads_are_named_after_the_outermost_finder():
+    repository = FakeRepository()
+
+    repository.find_page()
+
+    for _ in repository.find_pages():
+        # the caller's own reads between pages are not part of find_pages
+        repository._read_sql()
+
+    asyncio.run(repository.find_async())
+
+    assert repository.reads == ['find_page', 'find_pages', 'query', 'find_pages', 'query', 'find_async', 'find_async']
+
+
+class FakeRollup():
+    def __init__(self, engine):
+        self.engine = engine
+
+    @query_operation
+    def refresh(self):
+        return read_frame(self, self.engine, 'SELECT 1 AS one'), \
+            list(read_chunks(self, self.engine, 'SELECT 1 AS one UNION ALL SELECT 2', chunk_size=1))
+
+
+def test_rollup_reads_are_named_after_their_operation():
+    engine = instrument_engine(create_engine('sqlite://'))
+    METRICS.reset()
+
+    try:
+        frame, chunks = FakeRollup(engine).refresh()
+
+        assert frame['one'].tolist() == [1]
+        assert [chunk['one'].tolist() for chunk in chunks] == [[1], [2]]
+        rows = [row for row in METRICS.snapshot() if row['metric'] == 'rows']
+
+        assert [(row['repository'], row['operation'], row['count'], row['sum']) for row in rows] == \
+            [('FakeRollup', 'refresh', 3, 3)]
+    finally:
+        METRICS.reset()
+        engine.dispose()
+
+
+def test_failed_executions_are_not_left_timed():
+    engine = instrument_engine(create_engine('sqlite://'))
+
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text('SELECT * FROM missing'))
+
+        assert connection.info['query_start'] == []
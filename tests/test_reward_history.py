@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics.reward_history import RewardHistory
+
+
+class FakeRewards():
+    def __init__(self, earned, pool_earned=None):
+        self.earned = earned
+        self.pool_earned = pool_earned
+
+    def find_earned(self, addr_ids):
+        return self.earned[self.earned['addr_id'].isin(addr_ids)]
+
+    def find_pool_earned(self, pool_ids):
+        return self.pool_earned[self.pool_earned['pool_id'].isin(pool_ids)]
+
+
+class FakeWithdrawals():
+    def __init__(self, withdrawn):
+        self.withdrawn = withdrawn
+
+    def find_withdrawn(self, addr_ids):
+        return self.withdrawn[self.withdrawn['addr_id'].isin(addr_ids)]
+
+
+class FakeDelegations():
+    def __init__(self, delegations):
+        self.delegations = delegations
+
+    def find_delegations(self, addr_ids):
+        return self.delegations[self.delegations['addr_id'].isin(addr_ids)]
+
+
+def test_latest_certificate_wins_per_epoch():
+    # address 1 redelegates twice within epoch 5 and twice before epoch 3,
+    # in shuffled order
+    delegations = pd.DataFrame({
+        'addr_id': [1, 1, 1, 1, 2],
+        'active_epoch_no': [5, 1, 5, 2, 4],
+        'tx_id': [30, 10, 20, 15, 40],
+        'cert_index': [0, 0, 0, 0, 0],
+        'pool_hash_id': [303, 101, 202, 150, 404],
+    })
+    history = RewardHistory(None, None, FakeDelegations(delegations))
+
+    pools = history._delegated_pools(np.array([1, 2]), np.arange(3, 7))
+
+    assert pools.tolist() == [[150, 150, 303, 303], [-1, 404, 404, 404]]
+
+
+def test_balances_start_from_the_opening_balance():
+    # address 1 earned 100 and withdrew 30 before epoch 3, address 3 has no
+    # rewards and is not asked for
+    earned = pd.DataFrame({
+        'addr_id': [1, 1, 1, 2, 3],
+        'spendable_epoch': [1, 3, 5, 4, 3],
+        'amount': [100, 10, 20, 7, 1000],
+    })
+    withdrawn = pd.DataFrame({'addr_id': [1, 1, 2], 'epoch_no': [2, 4, 7], 'amount': [30, 50, 7]})
+    delegations = pd.DataFrame({
+        'addr_id': [1, 2], 'active_epoch_no': [2, 4], 'tx_id': [1, 2], 'cert_index': [0, 0], 'pool_hash_id': [101, 202],
+    })
+    history = RewardHistory(FakeRewards(earned), FakeWithdrawals(withdrawn), FakeDelegations(delegations))
+
+    rewards, withdrawals, balances, pools = history.addresses([2, 1, 2], [3, 6])
+
+    assert balances.index.tolist() == [1, 2]
+    assert balances.columns.tolist() == [3, 4, 5, 6]
+    assert rewards.values.tolist() == [[10, 0, 20, 0], [0, 7, 0, 0]]
+    assert withdrawals.values.tolist() == [[0, 50, 0, 0], [0, 0, 0, 0]]
+    assert balances.values.tolist() == [[80, 30, 50, 50], [0, 7, 7, 7]]
+    assert pools.values.tolist() == [[101, 101, 101, 101], [-1, 202, 202, 202]]
+    assert all(frame[3].dtype == 'int64' for frame in [rewards, withdrawals, balances, pools])
+
+
+def test_pool_rewards_per_earned_epoch():
+    pool_earned = pd.DataFrame({
+        'pool_id': [20, 10, 10, 10],
+        'earned_epoch': [3, 3, 4, 9],
+        'amount': [5, 2**40, 3, 1],
+        'addresses': [1, 2, 3, 4],
+    })
+    history = RewardHistory(FakeRewards(None, pool_earned), None, None)
+
+    amounts, addresses = history.pools([10, 20, 30], [3, 4])
+
+    assert amounts.index.name == 'pool_id'
+    assert amounts.values.tolist() == [[2**40, 3], [5, 0], [0, 0]]
+    assert addresses.values.tolist() == [[2, 3], [1, 0], [0, 0]]
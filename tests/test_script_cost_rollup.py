@@ -0,0 +1,94 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.connector.db_connector import db_dispose
+from src.rollup.script_cost_rollup import ACCURACY, PERCENTILES, ScriptCostRollup, bucket_values, cost_buckets
+
+
+class FakeScriptCostRollup(ScriptCostRollup):
+    # redeemers of (block_id, epoch_no, script_hash, cost) rows instead of
+    # the redeemer table, every metric costs the same
+    redeemers = None
+    stable_block_id = 0
+
+    def _redeemer_buckets(self, start, end):
+        rows = self.redeemers[(self.redeemers['block_id'] > start) & (self.redeemers['block_id'] <= end)]
+
+        return self._buckets(pd.DataFrame({
+            'epoch_no': rows['epoch_no'],
+            'script_hash': rows['script_hash'],
+            'unit_mem': rows['cost'],
+            'unit_steps': rows['cost'],
+            'fee': rows['cost'],
+        }))
+
+    def _stable_block_id(self):
+        return self.stable_block_id
+
+
+def redeemers(costs, epoch_no=0, script_hash='a'):
+    return pd.DataFrame({
+        'block_id': np.arange(1, len(costs) + 1),
+        'epoch_no': epoch_no,
+        'script_hash': script_hash,
+        'cost': costs,
+    })
+
+
+def test_bucket_midpoints_are_within_the_accuracy():
+    values = np.unique(np.geomspace(1, 10 ** 12, 10000).astype(np.int64))
+    midpoints = bucket_values(cost_buckets(values))
+
+    assert np.all(np.abs(midpoints - values) <= (ACCURACY + 1e-9) * values)
+    assert cost_buckets([0]).tolist() == [0]
+    assert bucket_values([0]).tolist() == [0.0]
+
+
+def test_percentiles_are_within_the_accuracy(tmp_path):
+    rollup = FakeScriptCostRollup(f'sqlite:///{tmp_path}/chain.db', str(tmp_path / 'script_cost'))
+
+    try:
+        costs = np.random.default_rng(7).lognormal(14, 2, 5000).astype(np.int64) + 1
+        rollup.redeemers = redeemers(costs)
+
+        report = rollup._distribution(rollup._redeemer_buckets(0, len(costs)), ['epoch_no'])
+
+        for q in PERCENTILES:
+            exact = np.percentile(costs, q, method='inverted_cdf')
+
+            assert abs(report[f'unit_mem_p{q}'].iloc[0] - exact) <= ACCURACY * exact
+
+        assert report['redeemers'].tolist() == [len(costs)]
+        assert report['unit_mem_low'].tolist() == [costs.min()]
+        assert report['unit_mem_high'].tolist() == [costs.max()]
+    finally:
+        db_dispose()
+
+
+def test_replayed_batch_is_not_counted_twice(tmp_path):
+    path = tmp_path / 'script_cost'
+    rollup = FakeScriptCostRollup(f'sqlite:///{tmp_path}/chain.db', str(path), batch_size=2)
+
+    try:
+        rollup.redeemers = pd.concat([redeemers([10, 20, 30]), redeemers([40], 1, 'b').assign(block_id=4)])
+
+        assert rollup.refresh() == 0
+        assert not path.exists()
+
+        rollup.stable_block_id = 4
+
+        assert rollup.refresh() == 4
+
+        # interrupted after the epoch files were written, before the state
+        with open(path / 'state.json', 'w') as file:
+            json.dump({'block_id': 0}, file)
+
+        assert rollup.refresh() == 4
+
+        report = rollup.find_epochs()
+
+        assert report[['epoch_no', 'redeemers', 'fee_total']].values.tolist() == [[0, 3, 60], [1, 1, 40]]
+    finally:
+        db_dispose()
@@ -0,0 +1,54 @@
+import numpy as np
+
+from src.analytics.stake_analytics import StakeAnalytics, gini, nakamoto
+from src.repository.epoch_stake_repository import EpochStakeArrays
+
+
+def stake(rows):
+    # (addr_id, pool_id, amount) rows
+    addr_ids, pool_ids, amounts = zip(*rows) if rows else ((), (), ())
+
+    return EpochStakeArrays(np.array(addr_ids, np.int32), np.array(pool_ids, np.int32), np.array(amounts, np.int64))
+
+
+def test_gini():
+    assert gini(np.array([], np.int64)) == 0.0
+    assert gini(np.array([0, 0, 0], np.int64)) == 0.0
+    assert gini(np.array([5], np.int64)) == 0.0
+    assert gini(np.array([1, 1, 1, 1], np.int64)) == 0.0
+    assert gini(np.array([0, 0, 0, 10], np.int64)) == 0.75
+
+
+def test_nakamoto():
+    assert nakamoto(np.array([], np.int64)) == 0
+    assert nakamoto(np.array([0, 0, 0], np.int64)) == 0
+    assert nakamoto(np.array([5], np.int64)) == 1
+    assert nakamoto(np.array([10, 40, 20, 30], np.int64)) == 2
+    # exactly half is not more than half
+    assert nakamoto(np.array([50, 50], np.int64)) == 2
+
+
+def test_migration():
+    analytics = StakeAnalytics(None)
+
+    previous = stake([(1, 1, 10), (2, 1, 20), (3, 2, 5)])
+    current = stake([(1, 2, 10), (2, 1, 20), (3, 1, 5), (4, 3, 7)])
+
+    moved = analytics.migration(previous, current)
+
+    assert moved.values.tolist() == [[1, 2, 1, 10], [2, 1, 1, 5]]
+
+
+def test_migration_within_a_single_pool():
+    analytics = StakeAnalytics(None)
+
+    moved = analytics.migration(stake([(1, 1, 10), (2, 1, 20)]), stake([(1, 1, 10), (2, 1, 25)]))
+
+    assert moved.empty
+    assert list(moved.columns) == ['from_pool_id', 'to_pool_id', 'delegators', 'amount']
+
+
+def test_summary_of_an_epoch_without_stake():
+    summary = StakeAnalytics(None).summary(stake([(1, 1, 0), (2, 2, 0)]))
+
+    assert summary == {'stake': 0, 'pools': 2, 'delegators': 2, 'gini': 0.0, 'nakamoto': 0}
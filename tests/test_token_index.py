@@ -0,0 +1,152 @@
+import pandas as pd
+import pytest
+
+from src.token.token_index import TokenIndex
+
+# tx id -> block_no, one tx per block
+BLOCKS = {tx_id: tx_id for tx_id in range(1, 9)}
+
+# asset outputs: tx 1 mints and sends asset 5 to a, tx 3 sends part of it on
+# to b, tx 6 mints asset 9 to c and tx 7 spends b's output
+OUTPUTS = pd.DataFrame({
+    'tx_id': [1, 3, 3, 6],
+    'tx_out_id': [10, 30, 31, 60],
+    'ident': [5, 5, 5, 9],
+    'address': ['a', 'b', 'a', 'c'],
+    'stake_address_id': [1, 2, 1, None],
+    'quantity': [100, 40, 60, 2**63 + 1],
+})
+SPENT = pd.DataFrame({'tx_in_id': [3, 7], 'tx_out_id': [10, 30]})
+MINTS = pd.DataFrame({'ident': [5, 9, 5], 'tx_id': [1, 6, 8], 'quantity': [100, 2**63 - 1, -10]})
+
+
+class FakeTokenIndex(TokenIndex):
+    def __init__(self, path, tip, batch_size=2):
+        self.engine = None
+        self.path = str(path)
+        self.rollback_window = 2
+        self.batch_size = batch_size
+        self.tip = tip
+        self.reads = []
+        self._holdings = None
+        self._mints = None
+
+    def _stable_tx_id(self):
+        return max([tx_id for tx_id, block_no in BLOCKS.items() if block_no <= self.tip - self.rollback_window], default=0)
+
+    def _unspent_statement(self, tx_id):
+        return 'unspent', 0, tx_id
+
+    def _outputs_statement(self, start, end):
+        return 'outputs', start, end
+
+    def _spent_statement(self, start, end):
+        return 'spent', start, end
+
+    def _mints_statement(self, start, end):
+        return 'mints', start, end
+
+    def _read(self, sql, columns, quantity_dtype=None):
+        name, start, end = sql
+        self.reads.append(sql)
+
+        if name == 'mints':
+            df = MINTS[(MINTS['tx_id'] > start) & (MINTS['tx_id'] <= end)]
+            df = df.assign(
+                block_no=df['tx_id'].map(BLOCKS),
+                epoch_no=0,
+                time=pd.Timestamp('2024-01-01'),
+            )
+        elif name == 'spent':
+            df = SPENT[(SPENT['tx_in_id'] > start) & (SPENT['tx_in_id'] <= end)].rename(columns={'tx_out_id': 'id'})
+        else:
+            df = OUTPUTS[(OUTPUTS['tx_id'] > start) & (OUTPUTS['tx_id'] <= end)]
+
+            if name == 'unspent':
+                df = df[~df['tx_out_id'].isin(SPENT[SPENT['tx_in_id'] <= end]['tx_out_id'])]
+
+        df = df[[column.name for column in columns]].reset_index(drop=True)
+
+        if quantity_dtype is not None:
+            df['quantity'] = df['quantity'].astype(object)
+
+        return self._frame(df, columns, quantity_dtype)
+
+
+def holdings(index):
+    return [tuple(row) for row in index.holdings()[['ident', 'tx_out_id', 'address', 'quantity']].itertuples(index=False)]
+
+
+def test_incremental_refresh_matches_a_full_refresh(tmp_path):
+    index = FakeTokenIndex(tmp_path / 'incremental', tip=5)
+
+    assert index.refresh() == 3
+    assert holdings(index) == [(5, 30, 'b', 40), (5, 31, 'a', 60)]
+
+    index.tip = 10
+
+    assert index.refresh() == 8
+    assert index.indexed_tx_id() == 8
+
+    full = FakeTokenIndex(tmp_path / 'full', tip=10)
+    full.refresh()
+
+    assert holdings(index) == holdings(full) == [(5, 31, 'a', 60), (9, 60, 'c', 2**63 + 1)]
+    assert index.holdings()['quantity'].dtype == 'uint64'
+    assert index.find_mints([5, 9])[['ident', 'tx_id', 'quantity']].values.tolist() == \
+        full.find_mints([5, 9])[['ident', 'tx_id', 'quantity']].values.tolist() == \
+        [[5, 1, 100], [5, 8, -10], [9, 6, 2**63 - 1]]
+    assert index.find_supply([5])['supply'].tolist() == [90]
+
+
+def test_txs_within_the_rollback_window_are_not_indexed(tmp_path):
+    index = FakeTokenIndex(tmp_path, tip=2)
+
+    assert index.refresh() == 0
+    assert index.indexed_tx_id() == 0
+    assert index.reads == []
+    assert index.holdings().empty
+
+    index.tip = 7
+
+    assert index.refresh() == 5
+    assert holdings(index) == [(5, 30, 'b', 40), (5, 31, 'a', 60)]
+    assert index.find_mints([9]).empty
+
+    # nothing has become stable since
+    reads = len(index.reads)
+
+    assert index.refresh() == 5
+    assert len(index.reads) == reads
+
+
+def test_an_interrupted_refresh_is_replayed(tmp_path):
+    index = FakeTokenIndex(tmp_path, tip=5)
+    index.refresh()
+
+    read = index._read
+
+    def interrupted(sql, columns, quantity_dtype=None):
+        # the mints of the batch are written before its spent read fails
+        if sql[0] == 'spent' and sql[1] >= 5:
+            raise ConnectionError('connection lost')
+
+        return read(sql, columns, quantity_dtype)
+
+    index._read = interrupted
+    index.tip = 10
+
+    with pytest.raises(ConnectionError):
+        index.refresh()
+
+    assert index.indexed_tx_id() == 3
+    assert index._segments()[-1][1] > 3
+    assert index.find_mints([9]).empty
+
+    # replayed in other batches, the segment left behind would repeat tx 6
+    del index._read
+    index.batch_size = 5
+
+    assert index.refresh() == 8
+    assert holdings(index) == [(5, 31, 'a', 60), (9, 60, 'c', 2**63 + 1)]
+    assert index.find_mints([5, 9])['tx_id'].tolist() == [1, 8, 6]
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics.tx_lineage import TxLineage
+
+
+class FakeRepository():
+    # rows of one table, looked up like the repositories look them up
+    def __init__(self, rows):
+        self.rows = pd.DataFrame(rows)
+
+    def find_by_ids(self, ids, columns=None, lovelace=False):
+        return self.find_by_values('id', ids, columns)
+
+    def find_by_values(self, name, values, columns=None, lovelace=False):
+        return self.rows[self.rows[name].isin(values)][columns].reset_index(drop=True)
+
+    def find_by_keys(self, names, keys, columns=None, lovelace=False):
+        rows = self.rows.set_index(list(names))
+
+        return rows[rows.index.isin(keys)].reset_index()[columns]
+
+    def find_by_refs(self, refs, columns=None, lovelace=False):
+        return self.find_by_keys(('tx_id', 'index'), refs, columns)
+
+
+def lineage(extra_tx_ins=()):
+    # tx 1 creates outputs 1 and 2, tx 2 spends both and creates 3 and 4,
+    # tx 3 spends 3 and creates 5, tx 4 spends 5 and creates 6
+    tx_outs = FakeRepository({
+        'id': [1, 2, 3, 4, 5, 6],
+        'tx_id': [1, 1, 2, 2, 3, 4],
+        'index': [0, 1, 0, 1, 0, 0],
+        'address': ['a', 'b', 'c', 'd', 'e', 'f'],
+        'value': [100, 50, 140, 10, 130, 120],
+    })
+    tx_ins = [(2, 1, 0), (2, 1, 1), (3, 2, 0), (4, 3, 0), *extra_tx_ins]
+    tx_ins = FakeRepository({
+        'tx_in_id': [tx_in[0] for tx_in in tx_ins],
+        'tx_out_id': [tx_in[1] for tx_in in tx_ins],
+        'tx_out_index': [tx_in[2] for tx_in in tx_ins],
+    })
+
+    return TxLineage(tx_outs, tx_ins)
+
+
+def test_forward_stops_at_the_depth_limit():
+    result = lineage().forward([1, 2], max_depth=2)
+
+    assert result.outputs[['id', 'depth']].values.tolist() == [[1, 0], [2, 0], [3, 1], [4, 1], [5, 2]]
+    assert result.spent_by['tx_out_id'].tolist() == [1, 2, 3]
+    assert result.spent_by['tx_id'].tolist() == [2, 2, 3]
+    assert result.created_by['tx_id'].tolist() == [2, 2, 3]
+    assert result.created_by['tx_out_id'].tolist() == [3, 4, 5]
+
+
+def test_backward_reaches_shared_parents_once():
+    result = lineage().backward([3, 4], max_depth=5)
+
+    assert result.outputs[['id', 'depth']].values.tolist() == [[3, 0], [4, 0], [1, 1], [2, 1]]
+    assert result.spent_by['tx_out_id'].tolist() == [1, 2]
+    assert result.created_by['tx_out_id'].tolist() == [1, 2, 3, 4]
+
+
+def test_cycles_visit_every_output_once():
+    # tx 1 spending output 6 closes a cycle
+    result = lineage([(1, 4, 0)]).forward([1], max_depth=10)
+
+    ids = result.outputs['id'].to_numpy()
+
+    assert sorted(ids.tolist()) == [1, 2, 3, 4, 5, 6]
+    assert len(np.unique(ids)) == len(ids)
+    assert result.outputs[['id', 'depth']].values.tolist()[-1] == [2, 4]
+
+
+def test_min_value_and_max_outputs_prune_the_walk():
+    # output 5 is reached but holds too little to be followed
+    assert lineage().forward([3], max_depth=10, min_value=135).outputs['id'].tolist() == [3, 5]
+    assert lineage().forward([1], max_depth=10, max_outputs=2).outputs['id'].tolist() == [1, 3]
@@ -0,0 +1,32 @@
+from itertools import islice
+
+from src.connector.db_connector import db_dispose
+from src.repository.tx_metadatum_repository import TxMetadatumRepository
+
+LABEL = 2 ** 53 + 1
+
+
+def test_pages_past_labels_float64_cannot_hold(tmp_path):
+    repository = TxMetadatumRepository(f'sqlite:///{tmp_path}/chain.db')
+
+    try:
+        with repository.engine.begin() as connection:
+            connection.exec_driver_sql(
+                'CREATE TABLE tx_metadata (id INTEGER PRIMARY KEY, key NUMERIC, json TEXT, bytes BLOB, '
+                'tx_id INTEGER)'
+            )
+
+            for row_id, (tx_id, key) in enumerate([(1, LABEL), (1, LABEL + 1), (1, LABEL + 2), (2, LABEL)]):
+                connection.exec_driver_sql(
+                    f"INSERT INTO tx_metadata (id, key, bytes, tx_id) VALUES ({row_id}, {key}, x'', {tx_id})"
+                )
+
+        # a page cursor rounded to 2^53 would repeat the first page forever
+        pages = list(islice(repository.find_metadata_pages(limit=1), 5))
+
+        assert [(page['tx_id'].iloc[0], page['key'].iloc[0]) for page in pages] == [
+            (1, LABEL), (1, LABEL + 1), (1, LABEL + 2), (2, LABEL),
+        ]
+        assert pages[0]['key'].dtype == 'uint64'
+    finally:
+        db_dispose()
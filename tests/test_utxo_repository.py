@@ -0,0 +1,77 @@
+from contextlib import nullcontext
+
+from src.connector.db_connector import db_dispose
+from src.repository.utxo_repository import UtxoRepository
+
+
+class SqliteUtxoRepository(UtxoRepository):
+    # sqlite has no arrays and no psycopg2 lovelace caster
+    def in_array(self, column, values):
+        if isinstance(column, str):
+            column = self._indexed_column(column)
+
+        return column.in_(list(values))
+
+    def _numeric(self, connection, lovelace):
+        return nullcontext()
+
+
+def execute(repository, *statements):
+    with repository.engine.begin() as connection:
+        for statement in statements:
+            connection.exec_driver_sql(statement)
+
+
+def create_chain(repository):
+    # tx 1 creates two outputs of A, tx 2 spends the first in block 2 and
+    # tx 3 the second in block 3, paying it back to A
+    execute(
+        repository,
+        'CREATE TABLE block (id INTEGER PRIMARY KEY, block_no INTEGER)',
+        'CREATE TABLE tx (id INTEGER PRIMARY KEY, block_id INTEGER)',
+        'CREATE TABLE tx_out (id INTEGER PRIMARY KEY, tx_id INTEGER, "index" INTEGER, address TEXT, '
+        'payment_cred BLOB, stake_address_id INTEGER, value INTEGER)',
+        'CREATE TABLE tx_in (id INTEGER PRIMARY KEY, tx_in_id INTEGER, tx_out_id INTEGER, tx_out_index INTEGER)',
+        'CREATE TABLE ma_tx_out (id INTEGER PRIMARY KEY, quantity INTEGER, tx_out_id INTEGER, ident INTEGER)',
+        'CREATE TABLE multi_asset (id INTEGER PRIMARY KEY, policy BLOB, name BLOB, fingerprint TEXT)',
+        'INSERT INTO block (id, block_no) VALUES (1, 1), (2, 2), (3, 3)',
+        'INSERT INTO tx (id, block_id) VALUES (1, 1), (2, 2), (3, 3)',
+        "INSERT INTO tx_out (id, tx_id, \"index\", address, stake_address_id, value) VALUES "
+        "(1, 1, 0, 'A', 9, 100), (2, 1, 1, 'A', 9, 50), (3, 2, 0, 'B', NULL, 100), (4, 3, 0, 'A', 9, 50)",
+        'INSERT INTO tx_in (id, tx_in_id, tx_out_id, tx_out_index) VALUES (1, 2, 1, 0), (2, 3, 1, 1)',
+        "INSERT INTO multi_asset (id, policy, name, fingerprint) VALUES (1, x'01', x'02', 'asset1')",
+        'INSERT INTO ma_tx_out (id, quantity, tx_out_id, ident) VALUES (1, 5, 1, 1), (2, 7, 2, 1), (3, 5, 3, 1)',
+    )
+
+
+def test_outputs_spent_later_are_unspent_as_of_earlier_blocks(tmp_path):
+    repository = SqliteUtxoRepository(f'sqlite:///{tmp_path}/chain.db')
+
+    try:
+        create_chain(repository)
+
+        assert repository.find_unspent('address', ['A'], block_no=1)['id'].tolist() == [1, 2]
+        assert repository.find_unspent('address', ['A'], block_no=2)['id'].tolist() == [2]
+        assert repository.find_unspent('address', ['A', 'B'], block_no=3)['id'].tolist() == [3, 4]
+        assert repository.find_unspent('stake_address_id', [9], block_no=2)['id'].tolist() == [2]
+    finally:
+        db_dispose()
+
+
+def test_balances_as_of_a_block(tmp_path):
+    repository = SqliteUtxoRepository(f'sqlite:///{tmp_path}/chain.db')
+
+    try:
+        create_chain(repository)
+
+        lovelace, assets = repository.find_balances('address', ['A', 'B'], block_no=1)
+
+        assert lovelace[['address', 'value', 'utxo_count']].values.tolist() == [['A', 150, 2]]
+        assert assets[['address', 'ident', 'quantity']].values.tolist() == [['A', 1, 12]]
+
+        lovelace, assets = repository.find_balances('address', ['A', 'B'], block_no=2)
+
+        assert sorted(lovelace[['address', 'value', 'utxo_count']].values.tolist()) == [['A', 50, 1], ['B', 100, 1]]
+        assert sorted(assets[['address', 'quantity']].values.tolist()) == [['A', 7], ['B', 5]]
+    finally:
+        db_dispose()